@@ -3,8 +3,16 @@
 from app.clients.supabase import get_client as get_supabase_client
 from app.clients.claude import get_claude_client, ClaudeClient
 from app.clients.deepgram import get_deepgram_transcriber, DeepgramTranscriber
-from app.clients.telegram import get_telegram_client, TelegramClient
+from app.clients.telegram import (
+    close_telegram_http,
+    get_telegram_http,
+    get_telegram_client,
+    get_telegram_batch_sender,
+    TelegramClient,
+    TelegramBatchSender,
+)
 from app.clients.resend import get_resend_client, ResendClient
+from app.clients.redis import get_redis_client
 
 __all__ = [
     "get_supabase_client",
@@ -12,8 +20,13 @@ __all__ = [
     "ClaudeClient",
     "get_deepgram_transcriber",
     "DeepgramTranscriber",
+    "get_telegram_http",
+    "close_telegram_http",
     "get_telegram_client",
     "TelegramClient",
+    "get_telegram_batch_sender",
+    "TelegramBatchSender",
     "get_resend_client",
     "ResendClient",
+    "get_redis_client",
 ]
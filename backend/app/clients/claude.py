@@ -147,9 +147,8 @@ Respond with only the JSON object, no other text."""
                     json_str = json_str[4:]
             json_str = json_str.strip()
 
-            data = json.loads(json_str)
-            return schema.model_validate(data)
-        except (json.JSONDecodeError, ValueError) as e:
+            return schema.model_validate_json(json_str)
+        except ValueError as e:
             logger.error(
                 "Failed to parse extraction response",
                 response=response[:200],
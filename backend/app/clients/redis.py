@@ -0,0 +1,26 @@
+"""Redis client for shared caching and rate limiting.
+
+Redis is optional: when REDIS_URL is not configured, get_redis_client()
+returns None and callers fall back to hitting the database directly.
+"""
+
+from redis.asyncio import Redis
+
+from app.config import settings
+
+# Singleton client for reuse
+_client: Redis | None = None
+
+
+def get_redis_client() -> Redis | None:
+    """Get or create the singleton Redis client.
+
+    Returns:
+        Redis client, or None if Redis is not configured.
+    """
+    global _client
+    if not settings.redis_url:
+        return None
+    if _client is None:
+        _client = Redis.from_url(settings.redis_url, decode_responses=True)
+    return _client
@@ -1,9 +1,42 @@
 """Supabase client for backend admin operations."""
 
-from supabase import create_client, Client
+import asyncio
+from typing import Any, AsyncIterator, Callable, Protocol, TypeVar
+
+import httpx
+from supabase import create_client, Client, ClientOptions
 
 from app.config import settings
 
+T = TypeVar("T", covariant=True)
+
+# Bounded keep-alive pool shared by every request made through the client.
+# Connections are reused across requests instead of re-handshaking TLS.
+# Sized to the worker thread pool so concurrent execute_async calls don't
+# queue for a connection; HTTP/2 multiplexes them further.
+HTTP_POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=settings.thread_pool_workers,
+    keepalive_expiry=60,
+)
+HTTP_TIMEOUT_SECONDS = 30.0
+
+# Rows per page for iter_pages; matches PostgREST's default max-rows, past
+# which an unranged select is silently truncated
+PAGE_SIZE = 1000
+
+
+class ExecutableQuery(Protocol[T]):
+    """Any supabase-py builder exposing a blocking execute()."""
+
+    def execute(self) -> T: ...
+
+
+class RangeableQuery(Protocol):
+    """A supabase-py select builder that can be limited to a row range."""
+
+    def range(self, start: int, end: int) -> ExecutableQuery[Any]: ...
+
 
 def get_supabase_client() -> Client:
     """Create and return a Supabase client with service role key.
@@ -16,7 +49,14 @@ def get_supabase_client() -> Client:
 
     return create_client(
         settings.supabase_url,
-        settings.supabase_service_key
+        settings.supabase_service_key,
+        options=ClientOptions(
+            httpx_client=httpx.Client(
+                timeout=HTTP_TIMEOUT_SECONDS,
+                limits=HTTP_POOL_LIMITS,
+                http2=True,
+            ),
+        ),
     )
 
 
@@ -30,3 +70,55 @@ def get_client() -> Client:
     if _client is None:
         _client = get_supabase_client()
     return _client
+
+
+async def execute_async(query: ExecutableQuery[T]) -> T:
+    """Execute a Supabase query without blocking the event loop.
+
+    supabase-py is synchronous, so awaiting execute() directly inside an
+    async handler stalls every other request for the full round-trip.
+    This runs it in the default thread pool instead.
+
+    Args:
+        query: A built query (table/rpc builder) ready to execute.
+
+    Returns:
+        The query response.
+    """
+    return await asyncio.to_thread(query.execute)
+
+
+async def iter_pages(
+    build_query: Callable[[], RangeableQuery],
+    page_size: int = PAGE_SIZE,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield every row of a select, one page at a time.
+
+    Builders accumulate filters in place, so build_query is called for
+    each page to get a fresh one. It should apply a stable order (e.g.
+    .order("id")) so pages don't overlap or skip rows.
+
+    Usage:
+        async for page in iter_pages(
+            lambda: client.table("profiles").select("id").order("id")
+        ):
+            ...
+
+    Args:
+        build_query: Callable returning a new select builder.
+        page_size: Rows per request.
+
+    Yields:
+        Lists of row dicts; the last page may be shorter.
+    """
+    offset = 0
+    while True:
+        result = await execute_async(
+            build_query().range(offset, offset + page_size - 1)
+        )
+        page = result.data or []
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        offset += page_size
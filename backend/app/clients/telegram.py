@@ -1,14 +1,29 @@
 """Telegram Bot API client."""
 
+import asyncio
 from typing import Any
 
 import httpx
 import structlog
 
 from app.config import settings
+from app.utils.batching import MicroBatcher
 
 logger = structlog.get_logger()
 
+# Shared connection pool for Bot API calls (HTTP/2 multiplexes requests
+# over a single TLS connection to api.telegram.org)
+HTTP_POOL_LIMITS = httpx.Limits(
+    max_connections=50,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+)
+HTTP_TIMEOUT_SECONDS = 30.0
+
+# Max messages dispatched concurrently per batch. Keeps bursts under
+# Telegram's ~30 messages/second bot limit.
+MAX_SEND_BATCH = 30
+
 
 class TelegramClient:
     """Client wrapper for Telegram Bot API."""
@@ -25,18 +40,13 @@ class TelegramClient:
 
         self.base_url = f"https://api.telegram.org/bot{self.token}"
         self.file_url = f"https://api.telegram.org/file/bot{self.token}"
-        self._http: httpx.AsyncClient | None = None
 
     async def _get_http(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._http is None or self._http.is_closed:
-            self._http = httpx.AsyncClient(timeout=30.0)
-        return self._http
+        """Get the shared HTTP client."""
+        return get_telegram_http()
 
     async def close(self) -> None:
-        """Close the HTTP client."""
-        if self._http and not self._http.is_closed:
-            await self._http.aclose()
+        """No-op: the shared HTTP client is closed at app shutdown."""
 
     async def send_message(
         self,
@@ -171,7 +181,100 @@ class TelegramClient:
             return False
 
 
+class TelegramBatchSender:
+    """Coalesces outbound messages into concurrent batches.
+
+    Callers await send_message() as usual; messages enqueued within the
+    same event loop tick are dispatched together with asyncio.gather over
+    the client's shared connection pool, bounded to MAX_SEND_BATCH at a time.
+    """
+
+    def __init__(self, client: TelegramClient, max_batch: int = MAX_SEND_BATCH):
+        """Initialize batch sender.
+
+        Args:
+            client: Telegram client used for delivery.
+            max_batch: Maximum messages dispatched concurrently.
+        """
+        self._client = client
+        # Window 0: yield once so messages enqueued in the same tick join
+        self._batcher: MicroBatcher[tuple[str | int, str, str], bool] = MicroBatcher(
+            self._send_many, window=0, max_batch=max_batch
+        )
+
+    async def send_message(
+        self,
+        chat_id: str | int,
+        text: str,
+        parse_mode: str = "Markdown",
+    ) -> bool:
+        """Queue a message and wait for it to be sent.
+
+        Args:
+            chat_id: Telegram chat ID.
+            text: Message text.
+            parse_mode: Message formatting (Markdown, HTML, or empty).
+
+        Returns:
+            True if message was sent successfully.
+        """
+        return await self._batcher.submit((chat_id, text, parse_mode))
+
+    async def _send_many(self, batch: list[tuple[str | int, str, str]]) -> list[bool]:
+        """Send a batch of messages concurrently."""
+        results = await asyncio.gather(
+            *(
+                self._client.send_message(chat_id, text, parse_mode)
+                for chat_id, text, parse_mode in batch
+            ),
+            return_exceptions=True,
+        )
+        return [result is True for result in results]
+
+
+# Singleton clients for reuse (keeps the HTTP connection pool warm)
+_http: httpx.AsyncClient | None = None
+_client: TelegramClient | None = None
+_batch_sender: TelegramBatchSender | None = None
+
+
+def get_telegram_http() -> httpx.AsyncClient:
+    """Get the shared HTTP/2 client for api.telegram.org.
+
+    Used by both the Bot API client and bot setup so every call shares
+    one pooled TLS connection. Creation has no await point, so concurrent
+    callers on the event loop can't race into building two clients.
+    """
+    global _http
+    if _http is None:
+        _http = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT_SECONDS,
+            http2=True,
+            limits=HTTP_POOL_LIMITS,
+        )
+    return _http
+
+
+async def close_telegram_http() -> None:
+    """Close the shared HTTP client (call on app shutdown)."""
+    global _http
+    if _http is not None and not _http.is_closed:
+        await _http.aclose()
+    _http = None
+
+
 # Factory function for dependency injection
 def get_telegram_client() -> TelegramClient:
-    """Get a configured Telegram client instance."""
-    return TelegramClient()
+    """Get the shared Telegram client instance."""
+    global _client
+    if _client is None:
+        _client = TelegramClient()
+    return _client
+
+
+def get_telegram_batch_sender() -> TelegramBatchSender:
+    """Get the shared batching sender for outbound messages."""
+    global _batch_sender
+    if _batch_sender is None:
+        _batch_sender = TelegramBatchSender(get_telegram_client())
+    return _batch_sender
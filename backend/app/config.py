@@ -32,6 +32,12 @@ class Settings(BaseSettings):
     resend_api_key: str = ""
     resend_from_email: str = "noreply@example.com"
 
+    # Worker threads for blocking client calls (supabase-py is synchronous)
+    thread_pool_workers: int = 32
+
+    # Redis (optional shared cache; in-process fallbacks are used if unset)
+    redis_url: str = ""
+
     # CORS
     allowed_origins: str = "http://localhost:3000"
 
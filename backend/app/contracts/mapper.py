@@ -2,6 +2,11 @@
 
 This module provides mapping functions to convert existing response structures
 (RouterResponse, OrchestrationResult, etc.) to the new AgentOutputContract format.
+
+Sub-objects built only from already-validated inputs and enum constants
+(taxonomy, magnitude, state, state updates, UI blocks) use model_construct()
+to skip re-validation; captures, insights and the contract itself are still
+validated since they carry model-produced values.
 """
 
 import time
@@ -53,15 +58,29 @@ from app.models.database import ActionComplexity
 
 logger = structlog.get_logger()
 
+# Lookup tables built once at import rather than on every mapping call
+_SCOPE_BY_COMPLEXITY = {
+    ActionComplexity.ATOMIC: Scope.ATOMIC,
+    ActionComplexity.COMPOSITE: Scope.COMPOSITE,
+    ActionComplexity.PROJECT: Scope.PROJECT,
+}
+
+_COMPLEXITY_SCORE = {
+    ActionComplexity.ATOMIC: 1,
+    ActionComplexity.COMPOSITE: 3,
+    ActionComplexity.PROJECT: 5,
+}
+
+_INTENT_TYPE_BY_INTENT = {
+    Intent.CAPTURE: IntentType.CAPTURE,
+    Intent.COACHING: IntentType.COACHING,
+    Intent.COMMAND: IntentType.COMMAND,
+}
+
 
 def map_complexity_to_scope(complexity: ActionComplexity) -> Scope:
     """Map ActionComplexity enum to Scope enum."""
-    mapping = {
-        ActionComplexity.ATOMIC: Scope.ATOMIC,
-        ActionComplexity.COMPOSITE: Scope.COMPOSITE,
-        ActionComplexity.PROJECT: Scope.PROJECT,
-    }
-    return mapping.get(complexity, Scope.ATOMIC)
+    return _SCOPE_BY_COMPLEXITY.get(complexity, Scope.ATOMIC)
 
 
 def map_cognitive_load(load: str) -> CognitiveLoadLevel:
@@ -73,13 +92,7 @@ def map_cognitive_load(load: str) -> CognitiveLoadLevel:
 
 def map_intent_to_type(intent: Intent) -> IntentType:
     """Map Intent enum to IntentType enum."""
-    mapping = {
-        Intent.CAPTURE: IntentType.CAPTURE,
-        Intent.COACHING: IntentType.COACHING,
-        Intent.COMMAND: IntentType.COMMAND,
-        Intent.CLARIFY: IntentType.CLARIFY,
-    }
-    return mapping.get(intent, IntentType.CAPTURE)
+    return _INTENT_TYPE_BY_INTENT.get(intent, IntentType.CAPTURE)
 
 
 def infer_taxonomy_from_action(action: EnrichedAction) -> TaxonomyLayer:
@@ -101,7 +114,7 @@ def infer_taxonomy_from_action(action: EnrichedAction) -> TaxonomyLayer:
     else:
         psych_source = PsychSource.INTRINSIC
 
-    return TaxonomyLayer(
+    return TaxonomyLayer.model_construct(
         intent_layer=IntentLayer.EXECUTE,
         survival_function=SurvivalFunction.UNKNOWN,  # Would need more context
         cognitive_load=cognitive_load,
@@ -115,13 +128,9 @@ def infer_taxonomy_from_action(action: EnrichedAction) -> TaxonomyLayer:
 def infer_magnitude_from_action(action: EnrichedAction) -> MagnitudeInference:
     """Infer magnitude from an enriched action."""
     # Map complexity to a 1-5 scale
-    complexity_score = {
-        ActionComplexity.ATOMIC: 1,
-        ActionComplexity.COMPOSITE: 3,
-        ActionComplexity.PROJECT: 5,
-    }.get(action.complexity, 2)
+    complexity_score = _COMPLEXITY_SCORE.get(action.complexity, 2)
 
-    return MagnitudeInference(
+    return MagnitudeInference.model_construct(
         scope=map_complexity_to_scope(action.complexity),
         complexity=complexity_score,
         dependencies=0,  # Not tracked in current system
@@ -146,7 +155,7 @@ def infer_state_from_action(action: EnrichedAction) -> StateInference:
     elif action.avoidance_weight >= 4:
         bottleneck = "Emotional resistance detected"
 
-    return StateInference(
+    return StateInference.model_construct(
         stage=Stage.NOT_STARTED,
         bottleneck=bottleneck,
         energy_required=energy,
@@ -188,7 +197,7 @@ def map_insight_to_contract(insight: PsychologicalInsight) -> ContractInsight:
 
 def create_state_update_for_capture(capture: Capture) -> StateUpdate:
     """Create a state update for a new capture."""
-    return StateUpdate(
+    return StateUpdate.model_construct(
         entity_type=EntityType.ACTION,
         entity_id=None,  # Will be set on persistence
         temp_id=capture.id,
@@ -213,7 +222,7 @@ def create_ui_blocks_for_captures(
 
     # Main capture list
     high_friction = [c.id for c in captures if c.avoidance_weight >= 4]
-    blocks.append(UIBlock(
+    blocks.append(UIBlock.model_construct(
         type=UIBlockType.CAPTURE_LIST,
         data={
             "captures": [c.id for c in captures],
@@ -224,7 +233,7 @@ def create_ui_blocks_for_captures(
 
     # Scaffolding question if needed
     if needs_scaffolding and scaffolding_question:
-        blocks.append(UIBlock(
+        blocks.append(UIBlock.model_construct(
             type=UIBlockType.QUESTION_PROMPT,
             data={
                 "scaffolding_question": scaffolding_question,
@@ -239,7 +248,7 @@ def create_ui_blocks_for_captures(
 def create_ui_blocks_for_coaching(coaching_message: str) -> list[UIBlock]:
     """Create UI blocks for coaching response."""
     return [
-        UIBlock(
+        UIBlock.model_construct(
             type=UIBlockType.COACHING_MESSAGE,
             data={
                 "message": coaching_message,
@@ -253,7 +262,7 @@ def create_ui_blocks_for_coaching(coaching_message: str) -> list[UIBlock]:
 def create_ui_blocks_for_command(command_result: CommandResponse) -> list[UIBlock]:
     """Create UI blocks for command response."""
     return [
-        UIBlock(
+        UIBlock.model_construct(
             type=UIBlockType.COMMAND_RESULT,
             data={
                 "command": command_result.command,
@@ -388,7 +397,7 @@ def map_router_response_to_contract(
     if response.intent == Intent.CAPTURE or response.intent == Intent.CLARIFY:
         ui_blocks = create_ui_blocks_for_captures(captures, needs_scaffolding, scaffolding_question)
         if insights:
-            ui_blocks.append(UIBlock(
+            ui_blocks.append(UIBlock.model_construct(
                 type=UIBlockType.INSIGHT_CARD,
                 data={"insights": [i.pattern_name for i in insights]},
                 priority=len(ui_blocks),
@@ -1,14 +1,47 @@
-"""Structured logging configuration using structlog."""
+"""Structured logging configuration using structlog.
 
+Log records are enqueued on the calling thread and rendered/written by a
+background QueueListener thread, so request handlers only pay for the
+enqueue, not for JSON/console rendering and stdout I/O.
+"""
+
+import atexit
 import logging
+import queue
 import sys
-from typing import Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, cast
 
 import structlog
 from structlog.types import Processor
 
 from app.config import settings
 
+# Minimum level emitted. Calls below it are dropped by the bound logger
+# before any processor runs, so debug logging costs ~nothing in prod.
+LOG_LEVEL = logging.INFO
+
+# Bound on queued records; beyond this, records are dropped rather than
+# blocking the request path.
+LOG_QUEUE_MAX_SIZE = 10_000
+
+_listener: QueueListener | None = None
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that defers all formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # structlog records carry their event dict in record.msg; leave it
+        # intact for the ProcessorFormatter on the listener side.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
 
 def configure_logging() -> None:
     """Configure structured logging for the application.
@@ -16,7 +49,10 @@ def configure_logging() -> None:
     In development: Human-readable colored output
     In production: JSON output for log aggregation
     """
-    # Common processors for all environments
+    global _listener
+
+    # Common processors for all environments. These run on the calling
+    # thread, so exceptions and stacks are captured before enqueueing.
     shared_processors: list[Processor] = [
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
@@ -24,38 +60,68 @@ def configure_logging() -> None:
         structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
+        structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
     ]
 
+    renderer: Processor
     if settings.is_development:
         # Development: colored, human-readable output
-        processors: list[Processor] = shared_processors + [
-            structlog.dev.ConsoleRenderer(colors=True),
-        ]
+        renderer = structlog.dev.ConsoleRenderer(colors=True)
     else:
         # Production: JSON output
-        processors = shared_processors + [
-            structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer(),
-        ]
+        renderer = structlog.processors.JSONRenderer()
 
     structlog.configure(
-        processors=processors,
-        wrapper_class=structlog.stdlib.BoundLogger,
+        processors=shared_processors + [
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(LOG_LEVEL),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
+    # Rendering and stdout writes happen on the listener thread
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(
+        structlog.stdlib.ProcessorFormatter(
+            processors=[
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                renderer,
+            ],
+            foreign_pre_chain=shared_processors,
+        )
+    )
+
+    if _listener is not None:
+        _listener.stop()
+
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=LOG_QUEUE_MAX_SIZE)
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
     # Configure standard library logging to work with structlog
     logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=logging.INFO,
+        handlers=[_NonBlockingQueueHandler(log_queue)],
+        level=LOG_LEVEL,
+        force=True,
     )
 
 
-def get_logger(name: str | None = None) -> structlog.stdlib.BoundLogger:
+@atexit.register
+def shutdown_logging() -> None:
+    """Flush queued log records and stop the listener thread.
+
+    Registered with atexit so short-lived jobs don't lose trailing logs.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logger(name: str | None = None) -> structlog.typing.FilteringBoundLogger:
     """Get a configured logger instance.
 
     Args:
@@ -68,7 +134,7 @@ def get_logger(name: str | None = None) -> structlog.stdlib.BoundLogger:
         >>> logger = get_logger(__name__)
         >>> logger.info("User action", user_id="123", action="login")
     """
-    return structlog.get_logger(name)
+    return cast(structlog.typing.FilteringBoundLogger, structlog.get_logger(name))
 
 
 def bind_request_context(**kwargs: Any) -> None:
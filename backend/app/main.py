@@ -1,12 +1,15 @@
 """Nuance Backend - Executive Function Prosthetic API."""
 
+import asyncio
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, Callable, Awaitable
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.clients.telegram import close_telegram_http
 from app.config import settings
 from app.logging_config import (
     bind_request_context,
@@ -15,6 +18,7 @@ from app.logging_config import (
     get_logger,
 )
 from app.middleware import setup_exception_handlers
+from app.utils.cache import begin_request_cache, end_request_cache
 from app.routers import ai_router, transcription_router, telegram_router, knowledge_router
 
 
@@ -23,16 +27,58 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Application lifespan handler for startup/shutdown."""
     # Startup
     configure_logging()
+
+    # Size the default executor used by asyncio.to_thread for blocking
+    # Supabase calls so concurrent webhooks don't queue behind each other
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.thread_pool_workers)
+    )
+
     logger = get_logger(__name__)
     logger.info(
         "Application starting",
         environment=settings.environment,
         version="0.1.0",
     )
+
+    # Open the Telegram Bot API connection and build the capture services
+    # before the first webhook arrives (in the background so startup
+    # isn't blocked on the network)
+    warm_up_task: asyncio.Task[None] | None = None
+    if settings.telegram_bot_token:
+        warm_up_task = asyncio.create_task(_warm_up_telegram())
+
     yield
     # Shutdown
     logger.info("Application shutting down")
 
+    # Let background Telegram updates finish before the loop closes
+    from app.services.notifications.telegram import drain_telegram_handler
+
+    await drain_telegram_handler()
+
+    # Persist token usage still waiting in the background batcher
+    from app.services.token_budget import flush_token_usage
+
+    await flush_token_usage()
+
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    await close_telegram_http()
+
+
+async def _warm_up_telegram() -> None:
+    """Prime the Telegram bot's connections and capture services."""
+    from app.services.notifications.telegram import get_bot_setup, get_telegram_handler
+
+    try:
+        await asyncio.gather(
+            get_bot_setup().warm_up(),
+            get_telegram_handler().warm_up(),
+        )
+    except Exception as e:
+        get_logger(__name__).warning("Telegram warm-up failed", error=str(e))
+
 
 app = FastAPI(
     title="Nuance API",
@@ -60,18 +106,20 @@ async def request_context_middleware(
     request: Request,
     call_next: Callable[[Request], Awaitable[Response]]
 ) -> Response:
-    """Middleware to add request ID to logging context."""
+    """Middleware to add request ID to logging context and a request cache."""
     request_id = str(uuid.uuid4())
     request.state.request_id = request_id
 
     # Bind request context for all logs within this request
     bind_request_context(request_id=request_id)
+    cache_token = begin_request_cache()
 
     try:
         response = await call_next(request)
         response.headers["X-Request-ID"] = request_id
         return response
     finally:
+        end_request_cache(cache_token)
         clear_request_context()
 
 
@@ -4,6 +4,7 @@ Main router for all AI-related endpoints including chat, extraction, and process
 All endpoints require authentication via Supabase JWT.
 """
 
+import asyncio
 import json
 import time
 from collections.abc import AsyncIterator
@@ -135,7 +136,7 @@ async def check_rate_limit(
     limiter: RateLimiter = Depends(get_rate_limiter),
 ) -> RateLimitResult:
     """Dependency to check rate limits. Raises 429 if exceeded."""
-    result = limiter.check(user.id)
+    result = await limiter.check_shared(user.id)
 
     if not result.allowed:
         raise RateLimitError(
@@ -202,28 +203,29 @@ async def chat(
         system=request.system,
     )
 
-    # Record token usage (async, non-blocking on failure)
-    await budget_service.record_usage(
-        user_id=user.id,
-        usage=TokenUsage(
+    # Record token usage and log the intent concurrently (both are
+    # independent writes and non-blocking on failure)
+    processing_time_ms = int((time.time() - start_time) * 1000)
+    await asyncio.gather(
+        budget_service.record_usage(
+            user_id=user.id,
+            usage=TokenUsage(
+                input_tokens=response.input_tokens,
+                output_tokens=response.output_tokens,
+                endpoint="/api/ai/chat",
+            ),
+        ),
+        log_intent(
+            user_id=user.id,
+            raw_input=request.messages[-1].content if request.messages else "",
+            classified_intent="chat",
+            ai_response=response.content,
             input_tokens=response.input_tokens,
             output_tokens=response.output_tokens,
-            endpoint="/api/ai/chat",
+            processing_time_ms=processing_time_ms,
         ),
     )
 
-    # Log the intent (async, non-blocking on failure)
-    processing_time_ms = int((time.time() - start_time) * 1000)
-    await log_intent(
-        user_id=user.id,
-        raw_input=request.messages[-1].content if request.messages else "",
-        classified_intent="chat",
-        ai_response=response.content,
-        input_tokens=response.input_tokens,
-        output_tokens=response.output_tokens,
-        processing_time_ms=processing_time_ms,
-    )
-
     return ChatResponse(
         content=response.content,
         input_tokens=response.input_tokens,
@@ -321,7 +323,7 @@ async def status(
 
     Returns current status of AI services for the authenticated user.
     """
-    rate_status = limiter.get_status(user.id)
+    rate_status = await limiter.get_shared_status(user.id)
 
     return {
         "user_id": user.id,
@@ -6,12 +6,14 @@ Handles incoming Telegram updates via webhook and user account linking.
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Header, Request
+import orjson
 from pydantic import BaseModel
 import structlog
 
 from app.auth import CurrentUser
-from app.clients.supabase import get_client
+from app.clients.supabase import execute_async, get_client
 from app.config import settings
+from app.services.notifications.router import get_channel_router
 from app.services.telegram_connection import get_telegram_connection_service
 
 logger = structlog.get_logger()
@@ -76,9 +78,12 @@ async def connect_telegram(
     # Update user's profile with the Telegram chat ID
     client = get_client()
     try:
-        client.table("profiles").update({
-            "telegram_chat_id": chat_id
-        }).eq("id", user.id).execute()
+        await execute_async(
+            client.table("profiles")
+            .update({"telegram_chat_id": chat_id})
+            .eq("id", user.id)
+        )
+        get_channel_router().invalidate(user.id)
 
         logger.info(
             "Telegram account connected",
@@ -119,10 +124,25 @@ async def disconnect_telegram(user: CurrentUser) -> ConnectResponse:
     client = get_client()
 
     try:
+        # Remember the linked chat so its cached user lookup can be dropped
+        current = await execute_async(
+            client.table("profiles").select("telegram_chat_id").eq("id", user.id)
+        )
+        previous_chat_id = (
+            current.data[0].get("telegram_chat_id") if current.data else None
+        )
+
         # Clear the telegram_chat_id from profile
-        client.table("profiles").update({
-            "telegram_chat_id": None
-        }).eq("id", user.id).execute()
+        await execute_async(
+            client.table("profiles")
+            .update({"telegram_chat_id": None})
+            .eq("id", user.id)
+        )
+        get_channel_router().invalidate(user.id)
+        if previous_chat_id:
+            await get_telegram_connection_service().invalidate_user_cache(
+                str(previous_chat_id)
+            )
 
         logger.info(
             "Telegram account disconnected",
@@ -159,9 +179,9 @@ async def get_telegram_status(user: CurrentUser) -> ConnectionStatus:
     client = get_client()
 
     try:
-        result = client.table("profiles").select(
-            "telegram_chat_id"
-        ).eq("id", user.id).execute()
+        result = await execute_async(
+            client.table("profiles").select("telegram_chat_id").eq("id", user.id)
+        )
 
         if result.data:
             row = result.data[0]
@@ -212,11 +232,12 @@ async def telegram_webhook(
             raise HTTPException(status_code=401, detail="Invalid secret token")
 
     try:
-        update: dict[str, Any] = await request.json()
+        # orjson decodes the raw body considerably faster than json.loads
+        update: dict[str, Any] = orjson.loads(await request.body())
         logger.debug("Received Telegram update", update_id=update.get("update_id"))
 
-        # Process the update (handler will be implemented in NTF-005)
-        await process_telegram_update(update)
+        # Schedule processing and acknowledge immediately
+        process_telegram_update(update)
 
         return {"ok": True}
 
@@ -229,10 +250,11 @@ async def telegram_webhook(
         return {"ok": True}
 
 
-async def process_telegram_update(update: dict[str, Any]) -> None:
-    """Process incoming Telegram update.
+def process_telegram_update(update: dict[str, Any]) -> None:
+    """Schedule an incoming Telegram update for background processing.
 
-    Routes the update to the appropriate handler for processing.
+    Only parsing runs inline; the handler processes the update in a
+    background task so the webhook can return right away.
 
     Args:
         update: Raw Telegram update payload.
@@ -241,7 +263,7 @@ async def process_telegram_update(update: dict[str, Any]) -> None:
         from app.services.notifications.telegram import get_telegram_handler
 
         handler = get_telegram_handler()
-        await handler.process_update(update)
+        handler.ack_and_schedule(update)
 
     except Exception as e:
         logger.error(
@@ -263,7 +285,6 @@ async def webhook_info() -> dict[str, Any]:
 
         setup = get_bot_setup()
         info = await setup.get_webhook_info()
-        await setup.close()
 
         if info:
             return {
@@ -299,12 +320,10 @@ async def setup_webhook() -> dict[str, Any]:
         # Verify bot first
         bot_info = await setup.verify_bot()
         if not bot_info:
-            await setup.close()
             return {"success": False, "error": "Bot verification failed"}
 
         # Set up webhook
         success = await setup.setup_webhook()
-        await setup.close()
 
         if success:
             return {
@@ -336,7 +355,6 @@ async def delete_webhook(drop_pending: bool = False) -> dict[str, Any]:
 
         setup = get_bot_setup()
         success = await setup.delete_webhook(drop_pending_updates=drop_pending)
-        await setup.close()
 
         return {"success": success}
 
@@ -357,7 +375,6 @@ async def verify_bot() -> dict[str, Any]:
 
         setup = get_bot_setup()
         bot_info = await setup.verify_bot()
-        await setup.close()
 
         if bot_info:
             return {
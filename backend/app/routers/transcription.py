@@ -1,10 +1,13 @@
 """Transcription API endpoints."""
 
+import math
+
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from pydantic import BaseModel
 import structlog
 
 from app.services.transcription import TranscriptionService, get_transcription_service
+from app.utils.circuit_breaker import CircuitOpenError
 
 logger = structlog.get_logger()
 
@@ -66,6 +69,10 @@ async def transcribe_audio(
     try:
         text = await service.transcribe_bytes(audio_bytes, mimetype)
         return TranscriptionResponse(text=text)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CircuitOpenError as e:
+        raise _unavailable(e)
     except Exception as e:
         logger.error("Transcription failed", error=str(e))
         raise HTTPException(status_code=500, detail="Transcription failed")
@@ -94,6 +101,17 @@ async def transcribe_telegram_voice(
         return TranscriptionResponse(text=text)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except CircuitOpenError as e:
+        raise _unavailable(e)
     except Exception as e:
         logger.error("Telegram transcription failed", error=str(e))
         raise HTTPException(status_code=500, detail="Transcription failed")
+
+
+def _unavailable(error: CircuitOpenError) -> HTTPException:
+    """503 telling the client when transcription may be retried."""
+    return HTTPException(
+        status_code=503,
+        detail="Transcription temporarily unavailable",
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))},
+    )
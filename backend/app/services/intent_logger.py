@@ -4,12 +4,14 @@ Records all user intents and AI responses to the intent_log table
 for analytics and prompt improvement over time.
 """
 
+import uuid
 from datetime import datetime, UTC
 from typing import Any
 
 import structlog
+from postgrest.types import ReturnMethod
 
-from app.clients.supabase import get_client
+from app.clients.supabase import execute_async, get_client
 
 logger = structlog.get_logger()
 
@@ -44,7 +46,11 @@ async def log_intent(
     try:
         client = get_client()
 
+        # ID generated client-side so the insert needn't echo the row
+        # (including the full AI response) back
+        log_id = str(uuid.uuid4())
         data = {
+            "id": log_id,
             "user_id": user_id,
             "raw_input": raw_input,
             "classified_intent": classified_intent,
@@ -57,19 +63,17 @@ async def log_intent(
             "created_at": datetime.now(UTC).isoformat(),
         }
 
-        result = client.table("intent_log").insert(data).execute()
-
-        if result.data:
-            log_id: str | None = result.data[0].get("id")
-            logger.debug(
-                "Intent logged",
-                log_id=log_id,
-                intent=classified_intent,
-                tokens=input_tokens and output_tokens and input_tokens + output_tokens,
-            )
-            return log_id
-
-        return None
+        await execute_async(
+            client.table("intent_log").insert(data, returning=ReturnMethod.minimal)
+        )
+
+        logger.debug(
+            "Intent logged",
+            log_id=log_id,
+            intent=classified_intent,
+            tokens=input_tokens and output_tokens and input_tokens + output_tokens,
+        )
+        return log_id
     except Exception as e:
         # Don't let logging failures break the main flow
         logger.error("Failed to log intent", error=str(e))
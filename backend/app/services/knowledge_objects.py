@@ -5,6 +5,7 @@ Stores taxonomy labels, breakdowns, insights, checkpoints, goals/plans/habits
 as JSONB objects linked to existing entities.
 """
 
+import asyncio
 from datetime import datetime, UTC
 from enum import Enum
 from typing import Any
@@ -14,10 +15,19 @@ import hashlib
 from pydantic import BaseModel, Field
 import structlog
 
-from app.clients.supabase import get_client
+from app.clients.supabase import execute_async, get_client
+from app.utils.batching import MicroBatcher
 
 logger = structlog.get_logger()
 
+# Upserts from concurrent writebacks within this window share one bulk
+# request of up to UPSERT_BATCH_SIZE rows
+UPSERT_WINDOW_SECONDS = 0.01
+UPSERT_BATCH_SIZE = 500
+
+# Columns of the (user_id, type, natural_key) unique constraint
+_UPSERT_CONFLICT = "user_id,type,natural_key"
+
 
 # =============================================================================
 # Enums
@@ -188,6 +198,64 @@ class HabitPayload(BaseModel):
 # =============================================================================
 
 
+def _row_key(row: dict[str, Any]) -> tuple[str, str, str]:
+    """Unique-constraint key of a knowledge object row."""
+    return (row["user_id"], row["type"], row["natural_key"])
+
+
+class KnowledgeUpsertBatcher:
+    """Coalesces knowledge object upserts from concurrent writebacks.
+
+    Rows submitted within UPSERT_WINDOW_SECONDS of each other are written
+    with a single bulk upsert. Rows for the same (user_id, type,
+    natural_key) collapse to the latest one, since one upsert cannot
+    touch a row twice; every caller of that key gets the written row. If
+    the bulk request fails, every caller in that batch gets the error.
+    """
+
+    def __init__(
+        self,
+        service: "KnowledgeObjectService",
+        window: float = UPSERT_WINDOW_SECONDS,
+        max_batch: int = UPSERT_BATCH_SIZE,
+    ):
+        """Initialize upsert batcher.
+
+        Args:
+            service: Service whose client performs the writes.
+            window: Seconds to wait for more rows before writing.
+            max_batch: Maximum rows per upsert.
+        """
+        self._service = service
+        self._batcher: MicroBatcher[dict[str, Any], dict[str, Any] | None] = MicroBatcher(
+            self._upsert_many, window=window, max_batch=max_batch
+        )
+
+    async def upsert(self, row: dict[str, Any]) -> dict[str, Any] | None:
+        """Queue a row and wait for the batched write.
+
+        Args:
+            row: Database row, including user_id, type and natural_key.
+
+        Returns:
+            The written row, or None if the database returned none for it.
+        """
+        return await self._batcher.submit(row, key=_row_key(row))
+
+    async def _upsert_many(
+        self, rows: list[dict[str, Any]]
+    ) -> list[dict[str, Any] | None]:
+        """Write a batch of rows with one bulk upsert."""
+        result = await execute_async(
+            self._service.client.table("knowledge_objects").upsert(
+                rows, on_conflict=_UPSERT_CONFLICT
+            )
+        )
+
+        written = {_row_key(row): row for row in result.data or []}
+        return [written.get(_row_key(row)) for row in rows]
+
+
 class KnowledgeObjectService:
     """Service for persisting and querying knowledge objects.
 
@@ -198,6 +266,7 @@ class KnowledgeObjectService:
     def __init__(self) -> None:
         """Initialize the service."""
         self._client = None
+        self._upsert_batcher = KnowledgeUpsertBatcher(self)
 
     @property
     def client(self):
@@ -238,6 +307,36 @@ class KnowledgeObjectService:
         key_string = "|".join(parts)
         return hashlib.sha256(key_string.encode()).hexdigest()[:32]
 
+    def _build_row(self, user_id: str, obj: KnowledgeObjectCreate) -> dict[str, Any]:
+        """Build the database row for an object, generating a natural key if not provided."""
+        natural_key = obj.natural_key
+        if not natural_key:
+            payload_key = obj.payload.get("capture_id") or obj.payload.get("conversation_id")
+            natural_key = self._generate_natural_key(
+                obj.type,
+                user_id,
+                obj.source_message_id,
+                obj.source_action_id,
+                payload_key,
+            )
+
+        return {
+            "user_id": user_id,
+            "type": obj.type.value,
+            "payload": obj.payload,
+            "confidence": obj.confidence,
+            "importance": obj.importance,
+            "source_message_id": obj.source_message_id,
+            "source_conversation_id": obj.source_conversation_id,
+            "source_action_id": obj.source_action_id,
+            "natural_key": natural_key,
+            "valid_from": (obj.valid_from or datetime.now(UTC)).isoformat(),
+            "valid_to": obj.valid_to.isoformat() if obj.valid_to else None,
+            "model_id": obj.model_id,
+            "prompt_version": obj.prompt_version,
+            "request_id": obj.request_id,
+        }
+
     async def create(
         self,
         user_id: str,
@@ -253,36 +352,11 @@ class KnowledgeObjectService:
             Created knowledge object or None if failed.
         """
         try:
-            # Generate natural key if not provided
-            natural_key = obj.natural_key
-            if not natural_key:
-                payload_key = obj.payload.get("capture_id") or obj.payload.get("conversation_id")
-                natural_key = self._generate_natural_key(
-                    obj.type,
-                    user_id,
-                    obj.source_message_id,
-                    obj.source_action_id,
-                    payload_key,
-                )
+            data = self._build_row(user_id, obj)
 
-            data = {
-                "user_id": user_id,
-                "type": obj.type.value,
-                "payload": obj.payload,
-                "confidence": obj.confidence,
-                "importance": obj.importance,
-                "source_message_id": obj.source_message_id,
-                "source_conversation_id": obj.source_conversation_id,
-                "source_action_id": obj.source_action_id,
-                "natural_key": natural_key,
-                "valid_from": (obj.valid_from or datetime.now(UTC)).isoformat(),
-                "valid_to": obj.valid_to.isoformat() if obj.valid_to else None,
-                "model_id": obj.model_id,
-                "prompt_version": obj.prompt_version,
-                "request_id": obj.request_id,
-            }
-
-            result = self.client.table("knowledge_objects").insert(data).execute()
+            result = await execute_async(
+                self.client.table("knowledge_objects").insert(data)
+            )
 
             if result.data:
                 logger.debug(
@@ -316,39 +390,11 @@ class KnowledgeObjectService:
             Upserted knowledge object or None if failed.
         """
         try:
-            # Generate natural key if not provided
-            natural_key = obj.natural_key
-            if not natural_key:
-                payload_key = obj.payload.get("capture_id") or obj.payload.get("conversation_id")
-                natural_key = self._generate_natural_key(
-                    obj.type,
-                    user_id,
-                    obj.source_message_id,
-                    obj.source_action_id,
-                    payload_key,
-                )
+            data = self._build_row(user_id, obj)
 
-            data = {
-                "user_id": user_id,
-                "type": obj.type.value,
-                "payload": obj.payload,
-                "confidence": obj.confidence,
-                "importance": obj.importance,
-                "source_message_id": obj.source_message_id,
-                "source_conversation_id": obj.source_conversation_id,
-                "source_action_id": obj.source_action_id,
-                "natural_key": natural_key,
-                "valid_from": (obj.valid_from or datetime.now(UTC)).isoformat(),
-                "valid_to": obj.valid_to.isoformat() if obj.valid_to else None,
-                "model_id": obj.model_id,
-                "prompt_version": obj.prompt_version,
-                "request_id": obj.request_id,
-            }
-
-            result = (
+            result = await execute_async(
                 self.client.table("knowledge_objects")
-                .upsert(data, on_conflict="user_id,type,natural_key")
-                .execute()
+                .upsert(data, on_conflict=_UPSERT_CONFLICT)
             )
 
             if result.data:
@@ -371,7 +417,13 @@ class KnowledgeObjectService:
         user_id: str,
         objects: list[KnowledgeObjectCreate],
     ) -> list[KnowledgeObject]:
-        """Upsert multiple knowledge objects.
+        """Upsert multiple knowledge objects in bulk.
+
+        Rows are queued on the shared upsert batcher, so one turn's objects,
+        and those of writebacks running at the same time, go out in one
+        bulk request instead of one request per object. Objects sharing a
+        natural key are collapsed to the last one. A failed batch is
+        logged and its objects skipped.
 
         Args:
             user_id: The user's ID.
@@ -380,11 +432,37 @@ class KnowledgeObjectService:
         Returns:
             List of successfully upserted objects.
         """
-        results = []
+        rows_by_key: dict[tuple[str, str], dict[str, Any]] = {}
         for obj in objects:
-            result = await self.upsert(user_id, obj)
-            if result:
-                results.append(result)
+            row = self._build_row(user_id, obj)
+            rows_by_key[(row["type"], row["natural_key"])] = row
+
+        written = await asyncio.gather(
+            *(self._upsert_batcher.upsert(row) for row in rows_by_key.values()),
+            return_exceptions=True,
+        )
+
+        results: list[KnowledgeObject] = []
+        errors: list[BaseException] = []
+        for written_row in written:
+            if isinstance(written_row, BaseException):
+                errors.append(written_row)
+            elif written_row:
+                results.append(self._parse_row(written_row))
+
+        if errors:
+            logger.error(
+                "Failed to upsert knowledge objects",
+                error=str(errors[0]),
+                count=len(errors),
+                user_id=user_id,
+            )
+
+        logger.debug(
+            "Knowledge objects upserted",
+            count=len(results),
+            user_id=user_id,
+        )
         return results
 
     async def get_by_id(self, user_id: str, obj_id: str) -> KnowledgeObject | None:
@@ -398,12 +476,11 @@ class KnowledgeObjectService:
             Knowledge object or None.
         """
         try:
-            result = (
+            result = await execute_async(
                 self.client.table("knowledge_objects")
                 .select("*")
                 .eq("id", obj_id)
                 .eq("user_id", user_id)
-                .execute()
             )
 
             if result.data:
@@ -468,7 +545,7 @@ class KnowledgeObjectService:
                 query.offset, query.offset + query.limit - 1
             )
 
-            result = q.execute()
+            result = await execute_async(q)
 
             objects = [self._parse_row(row) for row in result.data] if result.data else []
             total = result.count or len(objects)
@@ -589,7 +666,7 @@ class KnowledgeObjectService:
 
             q = q.order("created_at", desc=True).limit(limit)
 
-            result = q.execute()
+            result = await execute_async(q)
 
             return [self._parse_row(row) for row in result.data] if result.data else []
 
@@ -612,12 +689,11 @@ class KnowledgeObjectService:
             True if successful.
         """
         try:
-            result = (
+            result = await execute_async(
                 self.client.table("knowledge_objects")
                 .update({"valid_to": datetime.now(UTC).isoformat()})
                 .eq("id", obj_id)
                 .eq("user_id", user_id)
-                .execute()
             )
 
             return bool(result.data)
@@ -641,12 +717,11 @@ class KnowledgeObjectService:
             True if successful.
         """
         try:
-            result = (
+            result = await execute_async(
                 self.client.table("knowledge_objects")
                 .delete()
                 .eq("id", obj_id)
                 .eq("user_id", user_id)
-                .execute()
             )
 
             return bool(result.data)
@@ -656,26 +731,12 @@ class KnowledgeObjectService:
             return False
 
     def _parse_row(self, row: dict[str, Any]) -> KnowledgeObject:
-        """Parse a database row into a KnowledgeObject."""
-        return KnowledgeObject(
-            id=row["id"],
-            user_id=row["user_id"],
-            type=KnowledgeObjectType(row["type"]),
-            payload=row["payload"],
-            confidence=float(row["confidence"]),
-            importance=row["importance"],
-            source_message_id=row.get("source_message_id"),
-            source_conversation_id=row.get("source_conversation_id"),
-            source_action_id=row.get("source_action_id"),
-            natural_key=row.get("natural_key"),
-            valid_from=datetime.fromisoformat(row["valid_from"].replace("Z", "+00:00")),
-            valid_to=datetime.fromisoformat(row["valid_to"].replace("Z", "+00:00")) if row.get("valid_to") else None,
-            model_id=row.get("model_id"),
-            prompt_version=row.get("prompt_version"),
-            request_id=row.get("request_id"),
-            created_at=datetime.fromisoformat(row["created_at"].replace("Z", "+00:00")),
-            updated_at=datetime.fromisoformat(row["updated_at"].replace("Z", "+00:00")),
-        )
+        """Parse a database row into a KnowledgeObject.
+
+        Validation parses the ISO timestamps and type enum directly from
+        the row, in one pass.
+        """
+        return KnowledgeObject.model_validate(row)
 
 
 # =============================================================================
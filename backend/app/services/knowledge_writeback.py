@@ -4,6 +4,7 @@ Extracts and persists knowledge objects from AgentOutputContract after each agen
 This is the bridge between the agent output pipeline and the knowledge object store.
 """
 
+from dataclasses import dataclass, field
 from datetime import datetime, UTC
 from typing import Any
 
@@ -83,32 +84,29 @@ class KnowledgeWritebackService:
             if prompt_versions:
                 provenance["prompt_version"] = prompt_versions[0]
 
+        # Collect every object first so they're written in one bulk upsert
+        objects: list[KnowledgeObjectCreate] = []
+
         # Process captures and their taxonomy labels
         for capture in contract.output.captures:
             try:
                 # Write taxonomy label
                 if capture.labels:
-                    label_obj = self._create_taxonomy_label(
+                    objects.append(self._create_taxonomy_label(
                         capture=capture,
                         source_message_id=source_message_id,
                         source_conversation_id=source_conversation_id,
                         provenance=provenance,
-                    )
-                    ko = await self.knowledge.upsert(user_id, label_obj)
-                    if ko:
-                        result.taxonomy_labels_written += 1
+                    ))
 
                 # Write magnitude/state as state_snapshot if significant
                 if capture.magnitude or capture.state:
-                    snapshot_obj = self._create_state_snapshot(
+                    objects.append(self._create_state_snapshot(
                         capture=capture,
                         source_message_id=source_message_id,
                         source_conversation_id=source_conversation_id,
                         provenance=provenance,
-                    )
-                    ko = await self.knowledge.upsert(user_id, snapshot_obj)
-                    if ko:
-                        result.state_snapshots_written += 1
+                    ))
 
             except Exception as e:
                 logger.error(
@@ -121,15 +119,12 @@ class KnowledgeWritebackService:
         # Process atomic tasks (breakdowns)
         if contract.output.atomic_tasks:
             try:
-                breakdown_obj = self._create_breakdown(
+                objects.append(self._create_breakdown(
                     tasks=contract.output.atomic_tasks,
                     source_message_id=source_message_id,
                     source_conversation_id=source_conversation_id,
                     provenance=provenance,
-                )
-                ko = await self.knowledge.upsert(user_id, breakdown_obj)
-                if ko:
-                    result.breakdowns_written += 1
+                ))
             except Exception as e:
                 logger.error("Failed to write breakdown", error=str(e))
                 result.errors.append(f"breakdown:{str(e)}")
@@ -137,15 +132,12 @@ class KnowledgeWritebackService:
         # Process insights
         for insight in contract.output.insights:
             try:
-                insight_obj = self._create_insight(
+                objects.append(self._create_insight(
                     insight=insight,
                     source_message_id=source_message_id,
                     source_conversation_id=source_conversation_id,
                     provenance=provenance,
-                )
-                ko = await self.knowledge.upsert(user_id, insight_obj)
-                if ko:
-                    result.insights_written += 1
+                ))
             except Exception as e:
                 logger.error(
                     "Failed to write insight",
@@ -157,20 +149,30 @@ class KnowledgeWritebackService:
         # Log coaching notes if coaching was involved
         if contract.output.coaching_message:
             try:
-                coaching_obj = self._create_coaching_note(
+                objects.append(self._create_coaching_note(
                     message=contract.output.coaching_message,
                     cognitive_load=contract.output.cognitive_load,
                     source_message_id=source_message_id,
                     source_conversation_id=source_conversation_id,
                     provenance=provenance,
-                )
-                ko = await self.knowledge.upsert(user_id, coaching_obj)
-                if ko:
-                    result.coaching_notes_written += 1
+                ))
             except Exception as e:
                 logger.error("Failed to write coaching note", error=str(e))
                 result.errors.append(f"coaching:{str(e)}")
 
+        if objects:
+            try:
+                written = await self.knowledge.upsert_many(user_id, objects)
+                for ko in written:
+                    result.record_written(ko.type)
+            except Exception as e:
+                logger.error(
+                    "Failed to write knowledge objects",
+                    count=len(objects),
+                    error=str(e),
+                )
+                result.errors.append(f"upsert:{str(e)}")
+
         logger.info(
             "Knowledge writeback complete",
             user_id=user_id,
@@ -408,17 +410,32 @@ class KnowledgeWritebackService:
         return min(100, base + avoidance_boost + confidence_boost + breakdown_boost)
 
 
+# WritebackResult counter for each type the writeback produces
+_COUNTER_BY_TYPE: dict[KnowledgeObjectType, str] = {
+    KnowledgeObjectType.TAXONOMY_LABEL: "taxonomy_labels_written",
+    KnowledgeObjectType.BREAKDOWN: "breakdowns_written",
+    KnowledgeObjectType.INSIGHT: "insights_written",
+    KnowledgeObjectType.STATE_SNAPSHOT: "state_snapshots_written",
+    KnowledgeObjectType.COACHING_NOTE: "coaching_notes_written",
+}
+
+
+@dataclass(slots=True)
 class WritebackResult:
     """Result from a writeback operation."""
 
-    def __init__(self) -> None:
-        """Initialize result counters."""
-        self.taxonomy_labels_written: int = 0
-        self.breakdowns_written: int = 0
-        self.insights_written: int = 0
-        self.state_snapshots_written: int = 0
-        self.coaching_notes_written: int = 0
-        self.errors: list[str] = []
+    taxonomy_labels_written: int = 0
+    breakdowns_written: int = 0
+    insights_written: int = 0
+    state_snapshots_written: int = 0
+    coaching_notes_written: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def record_written(self, ko_type: KnowledgeObjectType) -> None:
+        """Count one written object of the given type."""
+        counter = _COUNTER_BY_TYPE.get(ko_type)
+        if counter:
+            setattr(self, counter, getattr(self, counter) + 1)
 
     @property
     def total_written(self) -> int:
@@ -434,7 +451,7 @@ class WritebackResult:
     @property
     def success(self) -> bool:
         """Whether the writeback was successful (no errors)."""
-        return len(self.errors) == 0
+        return not self.errors
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for logging/response."""
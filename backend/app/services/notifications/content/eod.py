@@ -8,7 +8,7 @@ from dataclasses import dataclass, field
 from datetime import date
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CompletedTask:
     """A completed task in the summary.
 
@@ -21,7 +21,7 @@ class CompletedTask:
     avoidance_weight: int = 1
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EODSummaryData:
     """Data for end-of-day summary notification.
 
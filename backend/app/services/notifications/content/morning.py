@@ -8,7 +8,7 @@ from dataclasses import dataclass
 from datetime import date
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PlanTask:
     """A task in the morning plan.
 
@@ -23,7 +23,7 @@ class PlanTask:
     avoidance_weight: int = 1
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MorningPlanData:
     """Data for morning plan notification.
 
@@ -9,7 +9,7 @@ from datetime import datetime, UTC
 import structlog
 
 from app.clients.resend import ResendClient, get_resend_client
-from app.clients.supabase import get_supabase_client
+from app.clients.supabase import get_client
 from app.services.notifications.base import (
     NotificationChannel,
     NotificationPayload,
@@ -45,7 +45,7 @@ class EmailProvider(NotificationProvider):
             resend_client: Resend client instance. Defaults to factory.
         """
         self._resend = resend_client or get_resend_client()
-        self._supabase = get_supabase_client()
+        self._supabase = get_client()
 
     @property
     def channel(self) -> NotificationChannel:
@@ -5,8 +5,12 @@ Implements NotificationProvider for sending Telegram notifications.
 
 import structlog
 
-from app.clients.telegram import TelegramClient, get_telegram_client
-from app.clients.supabase import get_supabase_client
+from app.clients.telegram import (
+    TelegramBatchSender,
+    TelegramClient,
+    get_telegram_batch_sender,
+)
+from app.clients.supabase import execute_async, get_client
 from app.services.notifications.base import (
     NotificationChannel,
     NotificationPayload,
@@ -22,7 +26,7 @@ class TelegramNotificationProvider(NotificationProvider):
     """Telegram notification provider using Bot API.
 
     Features:
-    - Wraps TelegramClient for message delivery
+    - Wraps TelegramClient for message delivery (batched by default)
     - Markdown message formatting
     - Type-specific message templates
     """
@@ -34,10 +38,13 @@ class TelegramNotificationProvider(NotificationProvider):
         """Initialize Telegram provider.
 
         Args:
-            telegram_client: Telegram client instance. Defaults to factory.
+            telegram_client: Telegram client instance. Defaults to the
+                shared batching sender.
         """
-        self._telegram = telegram_client or get_telegram_client()
-        self._supabase = get_supabase_client()
+        self._telegram: TelegramClient | TelegramBatchSender = (
+            telegram_client or get_telegram_batch_sender()
+        )
+        self._supabase = get_client()
 
     @property
     def channel(self) -> NotificationChannel:
@@ -145,12 +152,11 @@ class TelegramNotificationProvider(NotificationProvider):
             Telegram chat ID or None if not connected.
         """
         try:
-            response = (
+            response = await execute_async(
                 self._supabase.table("profiles")
                 .select("telegram_chat_id")
                 .eq("id", user_id)
                 .single()
-                .execute()
             )
 
             if response.data and isinstance(response.data, dict):
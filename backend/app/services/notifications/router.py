@@ -4,20 +4,43 @@ Routes notifications to the user's preferred channel based on
 their preferences and channel availability.
 """
 
+import asyncio
 from dataclasses import dataclass
 
 import structlog
 
-from app.clients.supabase import get_supabase_client
+from app.clients.supabase import execute_async, get_client
 from app.services.notifications.base import (
     NotificationChannel,
     NotificationType,
 )
+from app.utils.cache import TTLCache, clear_request_cache, request_cached
 
 logger = structlog.get_logger()
 
+# Preferences and channel config change on the order of days, not per
+# notification, so cache them per user for a short TTL.
+CHANNEL_CACHE_TTL_SECONDS = 120
+CHANNEL_CACHE_MAX_USERS = 10_000
 
-@dataclass
+# Channel availability bits: a channel is usable when the user has it
+# configured AND it is enabled in their preferences.
+_HAS_EMAIL = 1 << 0
+_HAS_TELEGRAM = 1 << 1
+_EMAIL_ENABLED = 1 << 2
+_TELEGRAM_ENABLED = 1 << 3
+
+EMAIL_OK = _HAS_EMAIL | _EMAIL_ENABLED
+TELEGRAM_OK = _HAS_TELEGRAM | _TELEGRAM_ENABLED
+
+# Required bits per channel, in default preference order (email first)
+_CHANNEL_MASKS: dict[NotificationChannel, int] = {
+    NotificationChannel.EMAIL: EMAIL_OK,
+    NotificationChannel.TELEGRAM: TELEGRAM_OK,
+}
+
+
+@dataclass(slots=True, frozen=True)
 class NotificationPreferences:
     """User's notification channel preferences.
 
@@ -32,7 +55,7 @@ class NotificationPreferences:
     telegram_enabled: bool
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UserChannelConfig:
     """User's channel configuration (what's available).
 
@@ -45,6 +68,43 @@ class UserChannelConfig:
     telegram_chat_id: str | None
 
 
+def _availability_mask(
+    config: UserChannelConfig | None,
+    prefs: NotificationPreferences | None,
+) -> int:
+    """Pack channel configuration and preferences into availability bits.
+
+    Missing preferences count as every channel being enabled.
+
+    Args:
+        config: User's channel configuration.
+        prefs: User's preferences.
+
+    Returns:
+        Bitmask of _HAS_* and *_ENABLED flags.
+    """
+    mask = 0
+    if config:
+        mask |= _HAS_EMAIL if config.email else 0
+        mask |= _HAS_TELEGRAM if config.telegram_chat_id else 0
+    if prefs is None:
+        mask |= _EMAIL_ENABLED | _TELEGRAM_ENABLED
+    else:
+        mask |= _EMAIL_ENABLED if prefs.email_enabled else 0
+        mask |= _TELEGRAM_ENABLED if prefs.telegram_enabled else 0
+    return mask
+
+
+_preferences_cache: TTLCache[str, NotificationPreferences] = TTLCache(
+    maxsize=CHANNEL_CACHE_MAX_USERS,
+    ttl=CHANNEL_CACHE_TTL_SECONDS,
+)
+_channel_config_cache: TTLCache[str, UserChannelConfig] = TTLCache(
+    maxsize=CHANNEL_CACHE_MAX_USERS,
+    ttl=CHANNEL_CACHE_TTL_SECONDS,
+)
+
+
 class ChannelRouter:
     """Routes notifications to the appropriate channel.
 
@@ -58,7 +118,7 @@ class ChannelRouter:
 
     def __init__(self) -> None:
         """Initialize channel router."""
-        self._supabase = get_supabase_client()
+        self._supabase = get_client()
 
     async def get_channel(
         self,
@@ -81,15 +141,17 @@ class ChannelRouter:
         if not prefs or not config:
             return self._get_default_channel(config)
 
+        mask = _availability_mask(config, prefs)
+
         # Get preferred channel for this notification type
         preferred = self._get_preferred_channel(prefs, notification_type)
 
         # Check if preferred channel is available
-        if self._is_channel_available(preferred, config, prefs):
+        if self._is_channel_available(preferred, mask):
             return preferred
 
         # Fall back to other available channel
-        return self._get_fallback_channel(preferred, config, prefs)
+        return self._get_fallback_channel(preferred, mask)
 
     async def get_available_channels(
         self,
@@ -106,18 +168,43 @@ class ChannelRouter:
         prefs = await self._get_preferences(user_id)
         config = await self._get_channel_config(user_id)
 
-        available = []
+        mask = _availability_mask(config, prefs)
+
+        return [
+            channel
+            for channel, required in _CHANNEL_MASKS.items()
+            if mask & required == required
+        ]
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop cached preferences and channel config for a user.
 
-        if config:
-            if config.email and (not prefs or prefs.email_enabled):
-                available.append(NotificationChannel.EMAIL)
-            if config.telegram_chat_id and (not prefs or prefs.telegram_enabled):
-                available.append(NotificationChannel.TELEGRAM)
+        Call after any change to the user's profile notification settings
+        or Telegram connection so the next send sees fresh data.
 
-        return available
+        Args:
+            user_id: User whose cached entries should be dropped.
+        """
+        _preferences_cache.invalidate(user_id)
+        _channel_config_cache.invalidate(user_id)
+        clear_request_cache()
 
+    @request_cached
     async def _get_preferences(self, user_id: str) -> NotificationPreferences | None:
-        """Get user's notification preferences.
+        """Get user's notification preferences (cached per user and request).
+
+        Args:
+            user_id: User ID.
+
+        Returns:
+            Preferences or None if not found.
+        """
+        return await _preferences_cache.get_or_load(
+            user_id, lambda: self._load_preferences(user_id)
+        )
+
+    async def _load_preferences(self, user_id: str) -> NotificationPreferences | None:
+        """Load user's notification preferences from the database.
 
         Args:
             user_id: User ID.
@@ -126,12 +213,11 @@ class ChannelRouter:
             Preferences or None if not found.
         """
         try:
-            response = (
+            response = await execute_async(
                 self._supabase.table("profiles")
                 .select("notification_channel, notification_enabled")
                 .eq("id", user_id)
                 .single()
-                .execute()
             )
 
             if response.data and isinstance(response.data, dict):
@@ -165,8 +251,22 @@ class ChannelRouter:
             logger.error("Failed to get preferences", user_id=user_id, error=str(e))
             return None
 
+    @request_cached
     async def _get_channel_config(self, user_id: str) -> UserChannelConfig | None:
-        """Get user's channel configuration.
+        """Get user's channel configuration (cached per user and request).
+
+        Args:
+            user_id: User ID.
+
+        Returns:
+            Channel config or None if not found.
+        """
+        return await _channel_config_cache.get_or_load(
+            user_id, lambda: self._load_channel_config(user_id)
+        )
+
+    async def _load_channel_config(self, user_id: str) -> UserChannelConfig | None:
+        """Load user's channel configuration from the database.
 
         Args:
             user_id: User ID.
@@ -176,12 +276,11 @@ class ChannelRouter:
         """
         try:
             # Get Telegram chat ID from profile
-            profile_response = (
+            profile_response = await execute_async(
                 self._supabase.table("profiles")
                 .select("telegram_chat_id")
                 .eq("id", user_id)
                 .single()
-                .execute()
             )
 
             telegram_chat_id = None
@@ -191,7 +290,9 @@ class ChannelRouter:
             # Get email from auth.users
             email = None
             try:
-                user_response = self._supabase.auth.admin.get_user_by_id(user_id)
+                user_response = await asyncio.to_thread(
+                    self._supabase.auth.admin.get_user_by_id, user_id
+                )
                 if user_response and user_response.user:
                     email = user_response.user.email
             except Exception as e:
@@ -230,51 +331,44 @@ class ChannelRouter:
     def _is_channel_available(
         self,
         channel: NotificationChannel,
-        config: UserChannelConfig,
-        prefs: NotificationPreferences,
+        mask: int,
     ) -> bool:
         """Check if a channel is available and enabled.
 
         Args:
             channel: Channel to check.
-            config: User's channel configuration.
-            prefs: User's preferences.
+            mask: Availability mask from _availability_mask.
 
         Returns:
             True if channel can be used.
         """
-        if channel == NotificationChannel.EMAIL:
-            return bool(config.email) and prefs.email_enabled
-        elif channel == NotificationChannel.TELEGRAM:
-            return bool(config.telegram_chat_id) and prefs.telegram_enabled
-        return False
+        required = _CHANNEL_MASKS.get(channel)
+        return required is not None and mask & required == required
 
     def _get_fallback_channel(
         self,
         preferred: NotificationChannel,
-        config: UserChannelConfig,
-        prefs: NotificationPreferences,
+        mask: int,
     ) -> NotificationChannel | None:
         """Get fallback channel if preferred is unavailable.
 
         Args:
             preferred: The preferred channel that's unavailable.
-            config: User's channel configuration.
-            prefs: User's preferences.
+            mask: Availability mask from _availability_mask.
 
         Returns:
             Fallback channel or None if none available.
         """
         # Try the other channel
         if preferred == NotificationChannel.TELEGRAM:
-            if self._is_channel_available(NotificationChannel.EMAIL, config, prefs):
+            if self._is_channel_available(NotificationChannel.EMAIL, mask):
                 logger.info(
                     "Falling back to email",
                     preferred="telegram",
                 )
                 return NotificationChannel.EMAIL
         else:
-            if self._is_channel_available(NotificationChannel.TELEGRAM, config, prefs):
+            if self._is_channel_available(NotificationChannel.TELEGRAM, mask):
                 logger.info(
                     "Falling back to Telegram",
                     preferred="email",
@@ -297,22 +391,26 @@ class ChannelRouter:
         Returns:
             Default channel or None if none available.
         """
-        if not config:
-            return None
+        mask = _availability_mask(config, None)
 
         # Default preference order: email first
-        if config.email:
-            return NotificationChannel.EMAIL
-        elif config.telegram_chat_id:
-            return NotificationChannel.TELEGRAM
+        for channel, required in _CHANNEL_MASKS.items():
+            if mask & required == required:
+                return channel
 
         return None
 
 
+_router: ChannelRouter | None = None
+
+
 def get_channel_router() -> ChannelRouter:
     """Factory function for dependency injection.
 
     Returns:
-        Configured ChannelRouter instance.
+        Shared ChannelRouter instance.
     """
-    return ChannelRouter()
+    global _router
+    if _router is None:
+        _router = ChannelRouter()
+    return _router
@@ -15,6 +15,7 @@ from app.services.notifications.telegram.handler import (
     TelegramHandler,
     TelegramUpdate,
     ProcessResult,
+    drain_telegram_handler,
     get_telegram_handler,
 )
 from app.services.notifications.telegram.commands import (
@@ -31,6 +32,7 @@ __all__ = [
     "TelegramHandler",
     "TelegramUpdate",
     "ProcessResult",
+    "drain_telegram_handler",
     "get_telegram_handler",
     # Commands
     "TelegramCommandHandler",
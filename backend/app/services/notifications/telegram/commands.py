@@ -6,23 +6,79 @@ Handles bot commands like /start, /help, /today, /status.
 from __future__ import annotations
 
 from datetime import date
-from typing import TYPE_CHECKING, Any, Callable, Awaitable
+from typing import TYPE_CHECKING, Any, Callable, Awaitable, cast
 
 import structlog
 
-from app.clients.supabase import get_supabase_client
+from app.clients.redis import get_redis_client
+from app.clients.supabase import execute_async, get_client
 from app.config import settings
 from app.services.notifications.providers.telegram import (
     TelegramNotificationProvider,
     get_telegram_provider,
 )
 from app.services.telegram_connection import get_telegram_connection_service
+from app.utils.rate_limiter import RateLimiter
 
 if TYPE_CHECKING:
     from app.services.notifications.telegram.handler import TelegramUpdate, TelegramHandler
 
 logger = structlog.get_logger()
 
+# Unknown-command flood guard: reply to at most this many unknown
+# commands per chat per window, then acknowledge silently.
+UNKNOWN_COMMAND_LIMIT = 5
+UNKNOWN_COMMAND_WINDOW_SECONDS = 60
+
+# In-process fallback when Redis is not configured or unreachable
+_unknown_command_limiter = RateLimiter(
+    requests_per_minute=UNKNOWN_COMMAND_LIMIT,
+    requests_per_day=UNKNOWN_COMMAND_LIMIT * 24 * 60,
+)
+
+
+# Static replies
+_WELCOME_CONNECTED = (
+    "Welcome back! You're connected.\n\n"
+    "Just send me what's on your mind and I'll capture it as a task."
+)
+
+_WELCOME_NEW_FMT = (
+    "*Welcome to Nuance!*\n\n"
+    "I'm your Executive Function Prosthetic. "
+    "I help you capture tasks, break them down, and stay on track.\n\n"
+    "To get started, connect your account:\n{link}\n\n"
+    "Or if you already have an account, go to Settings > Telegram in the app."
+)
+
+_WELCOME_NO_TOKEN = (
+    "*Welcome to Nuance!*\n\n"
+    "To get started, please open the Nuance app and go to "
+    "Settings > Telegram to connect your account."
+)
+
+_HELP_TEXT = """*Available Commands*
+
+/start - Connect or check your account
+/today - See today's plan
+/status - See your current progress
+/help - Show this message
+
+*Quick Capture*
+Just send me a message to capture it as a task!
+
+Examples:
+• "Call mom about birthday party"
+• "Review quarterly report by Friday"
+• "Pick up groceries - milk, eggs, bread"
+
+I'll extract the action and add it to your inbox."""
+
+
+# /today row templates
+_DONE_FMT = "✓ ~{title}~"
+_TODO_FMT = "○ {title} (~{est}min)"
+
 
 class TelegramCommandHandler:
     """Handles Telegram bot commands.
@@ -32,6 +88,11 @@ class TelegramCommandHandler:
     - /help - Show available commands
     - /today - Show today's plan
     - /status - Show current progress
+
+    Commands receive no pre-resolved user; each one resolves the chat's
+    account only if it needs it. /help never does, /today resolves it
+    inside its joined RPC, and /start and /status use the cached
+    _get_user_by_telegram lookup.
     """
 
     def __init__(
@@ -47,10 +108,10 @@ class TelegramCommandHandler:
         """
         self._telegram = telegram_provider or get_telegram_provider()
         self._handler = handler
-        self._supabase = get_supabase_client()
+        self._supabase = get_client()
 
         # Command registry
-        self._commands: dict[str, Callable[["TelegramUpdate"], Awaitable[None]]] = {
+        self._commands: dict[str, Callable[["TelegramUpdate", str], Awaitable[None]]] = {
             "/start": self.cmd_start,
             "/help": self.cmd_help,
             "/today": self.cmd_today,
@@ -69,32 +130,62 @@ class TelegramCommandHandler:
         if not update.text or not update.text.startswith("/"):
             return False
 
-        # Extract command (first word, lowercase)
-        command = update.text.split()[0].lower()
-
-        # Handle @botname suffix
-        if "@" in command:
-            command = command.split("@")[0]
+        # Extract command (first word, lowercase, without @botname suffix)
+        command = update.text.split(maxsplit=1)[0].partition("@")[0].lower()
 
         handler = self._commands.get(command)
         if handler:
-            await handler(update)
+            await handler(update, date.today().isoformat())
             return True
 
         # Unknown command
+        if not await self._allow_unknown_reply(update.chat_id):
+            return True
+
         await self._telegram.send_message(
             update.chat_id,
             f"Unknown command: {command}\n\nUse /help to see available commands.",
         )
         return True
 
-    async def cmd_start(self, update: "TelegramUpdate") -> None:
+    async def _allow_unknown_reply(self, chat_id: str) -> bool:
+        """Check the per-chat unknown-command rate limit.
+
+        Uses a fixed Redis window (INCR + EXPIRE) so the limit holds
+        across workers, falling back to an in-process limiter.
+
+        Args:
+            chat_id: Telegram chat ID.
+
+        Returns:
+            True if an "unknown command" reply may be sent.
+        """
+        redis = get_redis_client()
+        if redis is None:
+            return _unknown_command_limiter.check(chat_id).allowed
+
+        key = f"tg:unk:{chat_id}"
+        try:
+            count = await redis.incr(key)
+            if count == 1:
+                await redis.expire(key, UNKNOWN_COMMAND_WINDOW_SECONDS)
+        except Exception as e:
+            logger.warning("Unknown-command rate limit check failed", chat_id=chat_id, error=str(e))
+            return _unknown_command_limiter.check(chat_id).allowed
+
+        if count > UNKNOWN_COMMAND_LIMIT:
+            logger.debug("Dropping unknown command reply", chat_id=chat_id, count=count)
+            return False
+        return True
+
+    async def cmd_start(self, update: "TelegramUpdate", today: str) -> None:
         """Handle /start command.
 
         Welcome message and connection link for new users.
 
         Args:
             update: The update.
+            today: Today's date (ISO), resolved once per update.
         """
         user = await self._get_user_by_telegram(update.chat_id)
 
@@ -102,8 +193,7 @@ class TelegramCommandHandler:
             # Already connected
             await self._telegram.send_message(
                 update.chat_id,
-                f"Welcome back! You're connected.\n\n"
-                "Just send me what's on your mind and I'll capture it as a task.",
+                _WELCOME_CONNECTED,
             )
         else:
             # Generate connection token
@@ -115,77 +205,54 @@ class TelegramCommandHandler:
 
                 await self._telegram.send_message(
                     update.chat_id,
-                    "*Welcome to Nuance!*\n\n"
-                    "I'm your Executive Function Prosthetic. "
-                    "I help you capture tasks, break them down, and stay on track.\n\n"
-                    f"To get started, connect your account:\n{link}\n\n"
-                    "Or if you already have an account, go to Settings > Telegram in the app.",
+                    _WELCOME_NEW_FMT.format(link=link),
                 )
             else:
                 await self._telegram.send_message(
                     update.chat_id,
-                    "*Welcome to Nuance!*\n\n"
-                    "To get started, please open the Nuance app and go to "
-                    "Settings > Telegram to connect your account.",
+                    _WELCOME_NO_TOKEN,
                 )
 
-    async def cmd_help(self, update: "TelegramUpdate") -> None:
+    async def cmd_help(self, update: "TelegramUpdate", today: str) -> None:
         """Handle /help command.
 
         Show available commands.
 
         Args:
             update: The update.
+            today: Today's date (ISO), resolved once per update.
         """
-        help_text = """*Available Commands*
+        await self._telegram.send_message(update.chat_id, _HELP_TEXT)
 
-/start - Connect or check your account
-/today - See today's plan
-/status - See your current progress
-/help - Show this message
-
-*Quick Capture*
-Just send me a message to capture it as a task!
-
-Examples:
-• "Call mom about birthday party"
-• "Review quarterly report by Friday"
-• "Pick up groceries - milk, eggs, bread"
-
-I'll extract the action and add it to your inbox."""
-
-        await self._telegram.send_message(update.chat_id, help_text)
-
-    async def cmd_today(self, update: "TelegramUpdate") -> None:
+    async def cmd_today(self, update: "TelegramUpdate", today: str) -> None:
         """Handle /today command.
 
         Show today's plan.
 
         Args:
             update: The update.
+            today: Today's date (ISO), resolved once per update.
         """
-        user = await self._get_user_by_telegram(update.chat_id)
-
-        if not user:
-            await self._telegram.send_message(
-                update.chat_id,
-                "Please connect your account first with /start",
-            )
-            return
-
-        # Get today's actions
-        today = date.today().isoformat()
+        # Resolve the user and fetch today's actions in one round trip
         try:
-            response = (
-                self._supabase.table("actions")
-                .select("id, title, status, estimated_minutes, avoidance_weight")
-                .eq("user_id", user["id"])
-                .eq("planned_date", today)
-                .order("position")
-                .execute()
+            response = await execute_async(
+                self._supabase.rpc(
+                    "get_todays_actions_by_chat_id",
+                    {"p_chat_id": str(update.chat_id), "p_date": today},
+                )
             )
+            rows = cast(list[dict[str, Any]], response.data or [])
+
+            # No rows: chat isn't linked to an account
+            if not rows:
+                await self._telegram.send_message(
+                    update.chat_id,
+                    "Please connect your account first with /start",
+                )
+                return
 
-            actions = response.data if response.data else []
+            # Linked users with nothing planned get a single NULL row
+            actions = [a for a in rows if a.get("id")]
 
             if not actions:
                 await self._telegram.send_message(
@@ -196,21 +263,16 @@ I'll extract the action and add it to your inbox."""
                 return
 
             # Format task list
-            task_lines = []
-            done_count = 0
-            for action in actions:
-                if isinstance(action, dict):
-                    status = action.get("status", "")
-                    title = action.get("title", "Untitled")
-                    est = action.get("estimated_minutes", 0)
-
-                    if status == "done":
-                        task_lines.append(f"✓ ~{title}~")
-                        done_count += 1
-                    else:
-                        task_lines.append(f"○ {title} (~{est}min)")
-
-            tasks_str = "\n".join(task_lines)
+            done_count = sum(a.get("status") == "done" for a in actions)
+            tasks_str = "\n".join(
+                _DONE_FMT.format(title=a.get("title", "Untitled"))
+                if a.get("status") == "done"
+                else _TODO_FMT.format(
+                    title=a.get("title", "Untitled"),
+                    est=a.get("estimated_minutes", 0),
+                )
+                for a in actions
+            )
             total = len(actions)
 
             await self._telegram.send_message(
@@ -225,13 +287,14 @@ I'll extract the action and add it to your inbox."""
                 "Sorry, I couldn't load your plan. Please try again.",
             )
 
-    async def cmd_status(self, update: "TelegramUpdate") -> None:
+    async def cmd_status(self, update: "TelegramUpdate", today: str) -> None:
         """Handle /status command.
 
         Show progress status.
 
         Args:
             update: The update.
+            today: Today's date (ISO), resolved once per update.
         """
         user = await self._get_user_by_telegram(update.chat_id)
 
@@ -242,38 +305,21 @@ I'll extract the action and add it to your inbox."""
             )
             return
 
-        # Get today's stats
-        today = date.today().isoformat()
+        # Get today's stats (aggregated server-side)
         try:
-            response = (
-                self._supabase.table("actions")
-                .select("status, actual_minutes")
-                .eq("user_id", user["id"])
-                .eq("planned_date", today)
-                .execute()
+            response = await execute_async(
+                self._supabase.rpc(
+                    "get_user_daily_status",
+                    {"p_user": user["id"], "p_date": today},
+                )
             )
 
-            actions = response.data if response.data else []
-
-            total = len(actions)
-            completed = 0
-            minutes_spent = 0
-
-            for action in actions:
-                if isinstance(action, dict):
-                    if action.get("status") == "done":
-                        completed += 1
-                        minutes_spent += action.get("actual_minutes") or 0
-
-            # Also count inbox items
-            inbox_response = (
-                self._supabase.table("actions")
-                .select("id")
-                .eq("user_id", user["id"])
-                .eq("status", "inbox")
-                .execute()
-            )
-            inbox_count = len(inbox_response.data) if inbox_response.data else 0
+            rows = cast(list[dict[str, Any]], response.data or [])
+            stats = rows[0] if rows else {}
+            total = stats.get("planned") or 0
+            completed = stats.get("completed") or 0
+            minutes_spent = stats.get("minutes_spent") or 0
+            inbox_count = stats.get("inbox_count") or 0
 
             # Format time
             hours = minutes_spent // 60
@@ -298,7 +344,7 @@ Inbox: {inbox_count} item{"s" if inbox_count != 1 else ""} waiting"""
             )
 
     async def _get_user_by_telegram(self, chat_id: str) -> dict[str, Any] | None:
-        """Look up user by Telegram chat ID.
+        """Look up user by Telegram chat ID (cached).
 
         Args:
             chat_id: Telegram chat ID.
@@ -306,22 +352,8 @@ Inbox: {inbox_count} item{"s" if inbox_count != 1 else ""} waiting"""
         Returns:
             User data or None if not found.
         """
-        try:
-            response = (
-                self._supabase.table("profiles")
-                .select("id")
-                .eq("telegram_chat_id", chat_id)
-                .single()
-                .execute()
-            )
-
-            if response.data and isinstance(response.data, dict):
-                return response.data
-            return None
-
-        except Exception as e:
-            logger.error("Failed to look up user", chat_id=chat_id, error=str(e))
-            return None
+        user_id = await get_telegram_connection_service().get_user_id(chat_id)
+        return {"id": user_id} if user_id else None
 
     async def _generate_connection_token(self, chat_id: str) -> str | None:
         """Generate a token for connecting Telegram account.
@@ -353,10 +385,16 @@ Inbox: {inbox_count} item{"s" if inbox_count != 1 else ""} waiting"""
             return None
 
 
+_command_handler: TelegramCommandHandler | None = None
+
+
 def get_command_handler() -> TelegramCommandHandler:
     """Factory function for dependency injection.
 
     Returns:
-        Configured TelegramCommandHandler instance.
+        Shared TelegramCommandHandler instance.
     """
-    return TelegramCommandHandler()
+    global _command_handler
+    if _command_handler is None:
+        _command_handler = TelegramCommandHandler()
+    return _command_handler
@@ -3,21 +3,55 @@
 Processes incoming Telegram updates and routes them appropriately.
 """
 
-from dataclasses import dataclass
+import asyncio
+import uuid
+from dataclasses import dataclass, field
 from typing import Any
 
 import structlog
-
-from app.clients.supabase import get_supabase_client
+from postgrest.types import ReturnMethod
+from supabase import Client
+
+from app.clients.redis import get_redis_client
+from app.clients.supabase import execute_async, get_client
+from app.services.extraction_orchestrator import (
+    ExtractionOrchestrator,
+    get_extraction_orchestrator,
+)
 from app.services.notifications.providers.telegram import (
     TelegramNotificationProvider,
     get_telegram_provider,
 )
+from app.services.telegram_connection import get_telegram_connection_service
+from app.services.transcription import TranscriptionService
+from app.utils.batching import MicroBatcher
+from app.utils.cache import TTLCache
 
 logger = structlog.get_logger()
 
+# Cap on updates processed concurrently in the background (each may run
+# transcription + LLM extraction)
+MAX_CONCURRENT_UPDATES = 64
 
-@dataclass
+# Capture inserts arriving within this window share one INSERT
+INSERT_BATCH_WINDOW_SECONDS = 0.05
+MAX_INSERT_BATCH = 100
+
+# Shared read-only default for missing sub-objects in updates
+_EMPTY: dict[str, Any] = {}
+
+# Telegram retries undelivered updates; remember recent update_ids so
+# a retry doesn't re-run extraction and insert duplicate actions
+SEEN_UPDATE_TTL_SECONDS = 300
+SEEN_UPDATE_MAX = 10_000
+
+_seen_updates: TTLCache[int, bool] = TTLCache(
+    maxsize=SEEN_UPDATE_MAX,
+    ttl=SEEN_UPDATE_TTL_SECONDS,
+)
+
+
+@dataclass(slots=True, frozen=True)
 class TelegramUpdate:
     """Parsed Telegram update.
 
@@ -44,17 +78,77 @@ class ProcessResult:
 
     Attributes:
         success: Whether processing succeeded.
-        action_id: ID of created action (if any).
-        action_title: Title of created action (if any).
+        action_id: ID of the first created action (if any).
+        action_title: Title of the first created action (if any).
+        action_ids: IDs of all created actions.
         error: Error message (if failed).
     """
 
     success: bool
     action_id: str | None = None
     action_title: str | None = None
+    action_ids: list[str] = field(default_factory=list)
     error: str | None = None
 
 
+class ActionInsertBatcher:
+    """Coalesces action inserts from concurrent captures.
+
+    Rows queued within INSERT_BATCH_WINDOW_SECONDS of each other are
+    written with a single INSERT. IDs are generated client-side so each
+    caller knows its rows' IDs without matching the response. If the
+    batch insert fails, every caller in that batch gets the error.
+    """
+
+    def __init__(
+        self,
+        supabase: Client,
+        window: float = INSERT_BATCH_WINDOW_SECONDS,
+        max_batch: int = MAX_INSERT_BATCH,
+    ):
+        """Initialize insert batcher.
+
+        Args:
+            supabase: Supabase client used for inserts.
+            window: Seconds to wait for more rows before flushing.
+            max_batch: Maximum rows per INSERT.
+        """
+        self._supabase = supabase
+        self._batcher: MicroBatcher[list[dict[str, Any]], None] = MicroBatcher(
+            self._insert_many, window=window, max_batch=max_batch, size=len
+        )
+
+    async def insert(self, rows: list[dict[str, Any]]) -> list[str]:
+        """Queue action rows and wait for them to be written.
+
+        Args:
+            rows: Action rows to insert.
+
+        Returns:
+            IDs of the inserted actions, in order.
+        """
+        ids = [str(uuid.uuid4()) for _ in rows]
+        await self._batcher.submit(
+            [{**row, "id": action_id} for row, action_id in zip(rows, ids)]
+        )
+        return ids
+
+    async def _insert_many(self, batch: list[list[dict[str, Any]]]) -> list[None]:
+        """Write the rows of a batch of captures with a single INSERT."""
+        rows = [row for capture_rows in batch for row in capture_rows]
+        try:
+            await execute_async(
+                self._supabase.table("actions").insert(
+                    rows, returning=ReturnMethod.minimal
+                )
+            )
+        except Exception as e:
+            logger.error("Batch action insert failed", rows=len(rows), error=str(e))
+            raise
+
+        return [None] * len(batch)
+
+
 class TelegramHandler:
     """Handles incoming Telegram messages.
 
@@ -74,9 +168,18 @@ class TelegramHandler:
             telegram_provider: Provider for sending responses.
         """
         self._telegram = telegram_provider or get_telegram_provider()
-        self._supabase = get_supabase_client()
+        self._supabase = get_client()
+        self._insert_batcher = ActionInsertBatcher(self._supabase)
         self._command_handler: "TelegramCommandHandler | None" = None
 
+        # Created on first use (construction needs API keys) and reused
+        self._transcription: TranscriptionService | None = None
+        self._orchestrator: ExtractionOrchestrator | None = None
+
+        # Background processing: strong refs keep tasks from being GC'd
+        self._pending: set[asyncio.Task[None]] = set()
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPDATES)
+
     def set_command_handler(self, handler: "TelegramCommandHandler") -> None:
         """Set the command handler.
 
@@ -85,8 +188,63 @@ class TelegramHandler:
         """
         self._command_handler = handler
 
+    async def warm_up(self) -> None:
+        """Create the transcription and extraction services ahead of time.
+
+        Moves client construction (SDK setup, SSL contexts) out of the
+        first voice/text capture. Failures are logged and retried lazily
+        on first use.
+        """
+        try:
+            if self._transcription is None:
+                self._transcription = TranscriptionService()
+        except Exception as e:
+            logger.warning("Transcription warm-up failed", error=str(e))
+
+        try:
+            if self._orchestrator is None:
+                self._orchestrator = get_extraction_orchestrator()
+        except Exception as e:
+            logger.warning("Extraction warm-up failed", error=str(e))
+
+    def ack_and_schedule(self, raw_update: dict[str, Any]) -> bool:
+        """Parse an update and schedule its processing in the background.
+
+        Lets the webhook respond to Telegram immediately instead of
+        holding the request open through lookups, transcription and
+        extraction.
+
+        Args:
+            raw_update: Raw update from Telegram webhook.
+
+        Returns:
+            True if the update was scheduled.
+        """
+        update = self._parse_update(raw_update)
+        if not update:
+            logger.debug("Could not parse update", raw=raw_update)
+            return False
+
+        task = asyncio.create_task(self._process_update_async(update))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return True
+
+    async def drain(self, timeout: float = 10.0) -> None:
+        """Wait for in-flight background updates to finish.
+
+        Args:
+            timeout: Maximum seconds to wait.
+        """
+        if not self._pending:
+            return
+
+        _, still_pending = await asyncio.wait(set(self._pending), timeout=timeout)
+        if still_pending:
+            logger.warning("Telegram updates still pending at shutdown", count=len(still_pending))
+
     async def process_update(self, raw_update: dict[str, Any]) -> None:
-        """Process incoming Telegram update.
+        """Process incoming Telegram update inline.
 
         Args:
             raw_update: Raw update from Telegram webhook.
@@ -96,7 +254,67 @@ class TelegramHandler:
             logger.debug("Could not parse update", raw=raw_update)
             return
 
-        # Check for commands first
+        await self._process_update_async(update)
+
+    async def _process_update_async(self, update: TelegramUpdate) -> None:
+        """Process a parsed update, bounded by the concurrency semaphore.
+
+        Args:
+            update: Parsed update.
+        """
+        # Bound once so every log line for this update carries its IDs;
+        # each task runs in its own context copy
+        with structlog.contextvars.bound_contextvars(
+            update_id=update.update_id, chat_id=update.chat_id
+        ):
+            if await self._is_duplicate(update.update_id):
+                logger.debug("Skipping duplicate update")
+                return
+
+            async with self._semaphore:
+                try:
+                    await self._handle_update(update)
+                except Exception as e:
+                    logger.error("Failed to process Telegram update", error=str(e))
+
+    async def _is_duplicate(self, update_id: int) -> bool:
+        """Record an update_id and report whether it was already seen.
+
+        Checked in-process first, then with Redis SET NX so retries
+        landing on another worker are caught too.
+
+        Args:
+            update_id: Telegram update ID.
+
+        Returns:
+            True if the update was already processed recently.
+        """
+        if _seen_updates.get(update_id):
+            return True
+        _seen_updates.set(update_id, True)
+
+        redis = get_redis_client()
+        if redis is None:
+            return False
+
+        try:
+            first = await redis.set(
+                f"tg:upd:{update_id}", 1, nx=True, ex=SEEN_UPDATE_TTL_SECONDS
+            )
+        except Exception as e:
+            logger.warning("Update dedupe check failed", error=str(e))
+            return False
+
+        return not first
+
+    async def _handle_update(self, update: TelegramUpdate) -> None:
+        """Route a parsed update to commands or the capture pipeline.
+
+        Args:
+            update: Parsed update.
+        """
+        # Check for commands first; they resolve the user on demand, so
+        # no profile lookup happens here for them
         if update.text and update.text.startswith("/"):
             if self._command_handler:
                 await self._command_handler.handle(update)
@@ -129,13 +347,19 @@ class TelegramHandler:
                 return
 
         if not text:
-            logger.debug("No text to process", update_id=update.update_id)
+            logger.debug("No text to process")
             return
 
         # Process as capture input
         result = await self._process_capture(user["id"], text, update.chat_id)
 
-        if result.success and result.action_title:
+        if result.success and len(result.action_ids) > 1:
+            await self._telegram.send_message(
+                update.chat_id,
+                f"Got it! Added {len(result.action_ids)} items, "
+                f"starting with *{result.action_title}*",
+            )
+        elif result.success and result.action_title:
             await self._telegram.send_message(
                 update.chat_id,
                 f"Got it! Added: *{result.action_title}*",
@@ -155,31 +379,33 @@ class TelegramHandler:
         Returns:
             Parsed update or None if invalid.
         """
-        message = raw.get("message", {})
+        message = raw.get("message")
         if not message:
             # Could be callback_query or other update type
             return None
 
-        chat = message.get("chat", {})
-        chat_id = chat.get("id")
+        chat_id = (message.get("chat") or _EMPTY).get("id")
         if not chat_id:
             return None
 
-        # Check for voice message
-        voice = message.get("voice", {})
-        voice_file_id = voice.get("file_id") if voice else None
+        # Text messages are the common case; only look for voice otherwise
+        text = message.get("text")
+        voice_file_id = None
+        if text is None:
+            voice = message.get("voice")
+            voice_file_id = voice.get("file_id") if voice else None
 
         return TelegramUpdate(
             update_id=raw.get("update_id", 0),
             message_id=message.get("message_id"),
             chat_id=str(chat_id),
-            text=message.get("text"),
+            text=text,
             voice_file_id=voice_file_id,
             from_user=message.get("from"),
         )
 
     async def _get_user_by_telegram(self, chat_id: str) -> dict[str, Any] | None:
-        """Look up user by Telegram chat ID.
+        """Look up user by Telegram chat ID (cached).
 
         Args:
             chat_id: Telegram chat ID.
@@ -187,22 +413,8 @@ class TelegramHandler:
         Returns:
             User data or None if not found.
         """
-        try:
-            response = (
-                self._supabase.table("profiles")
-                .select("id")
-                .eq("telegram_chat_id", chat_id)
-                .single()
-                .execute()
-            )
-
-            if response.data and isinstance(response.data, dict):
-                return response.data
-            return None
-
-        except Exception as e:
-            logger.error("Failed to look up user", chat_id=chat_id, error=str(e))
-            return None
+        user_id = await get_telegram_connection_service().get_user_id(chat_id)
+        return {"id": user_id} if user_id else None
 
     async def _transcribe_voice(self, file_id: str) -> str | None:
         """Transcribe voice message.
@@ -214,10 +426,10 @@ class TelegramHandler:
             Transcribed text or None on failure.
         """
         try:
-            from app.services.transcription import TranscriptionService
+            if self._transcription is None:
+                self._transcription = TranscriptionService()
 
-            service = TranscriptionService()
-            result = await service.transcribe_telegram_voice(file_id)
+            result = await self._transcription.transcribe_telegram_voice(file_id)
             return result
 
         except Exception as e:
@@ -232,7 +444,7 @@ class TelegramHandler:
     ) -> ProcessResult:
         """Process text as capture input.
 
-        Routes to extraction pipeline and saves resulting action.
+        Routes to extraction pipeline and saves all resulting actions.
 
         Args:
             user_id: User ID.
@@ -244,40 +456,34 @@ class TelegramHandler:
         """
         try:
             # Use the extraction orchestrator
-            from app.services.extraction_orchestrator import get_extraction_orchestrator
-
-            orchestrator = get_extraction_orchestrator()
-            result = await orchestrator.extract(text)
-
-            if result.actions and len(result.actions) > 0:
-                # Save the first action to database
-                action = result.actions[0]
-                action_data = {
-                    "user_id": user_id,
-                    "title": action.title,
-                    "raw_input": text,
-                    "status": "inbox",
-                    "complexity": action.complexity.value if action.complexity else "atomic",
-                    "avoidance_weight": action.avoidance_weight or 1,
-                    "estimated_minutes": action.estimated_minutes or 15,
-                }
-
-                insert_response = (
-                    self._supabase.table("actions")
-                    .insert(action_data)
-                    .execute()
+            if self._orchestrator is None:
+                self._orchestrator = get_extraction_orchestrator()
+
+            result = await self._orchestrator.extract(text)
+
+            if result.actions:
+                # Save all extracted actions (batched with concurrent captures)
+                action_rows = [
+                    {
+                        "user_id": user_id,
+                        "title": action.title,
+                        "raw_input": text,
+                        "status": "inbox",
+                        "complexity": action.complexity.value if action.complexity else "atomic",
+                        "avoidance_weight": action.avoidance_weight or 1,
+                        "estimated_minutes": action.estimated_minutes or 15,
+                    }
+                    for action in result.actions
+                ]
+
+                action_ids = await self._insert_batcher.insert(action_rows)
+                return ProcessResult(
+                    success=True,
+                    action_id=action_ids[0],
+                    action_title=result.actions[0].title,
+                    action_ids=action_ids,
                 )
 
-                if insert_response.data and isinstance(insert_response.data, list):
-                    first_item = insert_response.data[0]
-                    if isinstance(first_item, dict):
-                        action_id = first_item.get("id")
-                        return ProcessResult(
-                            success=True,
-                            action_id=str(action_id) if action_id else None,
-                            action_title=action.title,
-                        )
-
             return ProcessResult(
                 success=False,
                 error="No actions extracted",
@@ -306,13 +512,27 @@ class TelegramHandler:
 from app.services.notifications.telegram.commands import TelegramCommandHandler
 
 
+_handler: TelegramHandler | None = None
+
+
 def get_telegram_handler() -> TelegramHandler:
     """Factory function for dependency injection.
 
+    The instance is shared so background tasks it schedules are tracked
+    across webhook requests.
+
     Returns:
         Configured TelegramHandler with command handler attached.
     """
-    handler = TelegramHandler()
-    command_handler = TelegramCommandHandler(handler=handler)
-    handler.set_command_handler(command_handler)
-    return handler
+    global _handler
+    if _handler is None:
+        _handler = TelegramHandler()
+        command_handler = TelegramCommandHandler(handler=_handler)
+        _handler.set_command_handler(command_handler)
+    return _handler
+
+
+async def drain_telegram_handler() -> None:
+    """Wait for the shared handler's background updates, if it exists."""
+    if _handler is not None:
+        await _handler.drain()
@@ -3,16 +3,23 @@
 Handles bot initialization, webhook registration, and health checks.
 """
 
+import time
 from dataclasses import dataclass
 from typing import Any
 
-import httpx
 import structlog
 
+from app.clients.telegram import get_telegram_http
 from app.config import settings
+from app.utils.cache import TTLCache
 
 logger = structlog.get_logger()
 
+# Health probes within this window reuse the last result
+HEALTH_CACHE_TTL_SECONDS = 60
+
+_health_cache: TTLCache[str, bool] = TTLCache(maxsize=1, ttl=HEALTH_CACHE_TTL_SECONDS)
+
 
 @dataclass
 class TelegramBotConfig:
@@ -34,7 +41,7 @@ class TelegramBotConfig:
         return f"https://api.telegram.org/bot{self.bot_token}"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BotInfo:
     """Information about the bot.
 
@@ -55,7 +62,7 @@ class BotInfo:
     supports_inline_queries: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WebhookInfo:
     """Information about the current webhook.
 
@@ -94,18 +101,17 @@ class TelegramBotSetup:
             config: Bot configuration.
         """
         self.config = config
-        self._client: httpx.AsyncClient | None = None
-
-    async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=30.0)
-        return self._client
 
     async def close(self) -> None:
-        """Close HTTP client."""
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
+        """No-op: the shared HTTP client is closed at app shutdown."""
+
+    async def warm_up(self) -> None:
+        """Open the pooled TLS + HTTP/2 connection to the Bot API.
+
+        Verifies the bot (getMe) once per process, which also means the
+        first webhook reply doesn't pay for the handshake.
+        """
+        await self.verify_bot()
 
     async def verify_bot(self) -> BotInfo | None:
         """Verify bot token is valid.
@@ -113,7 +119,7 @@ class TelegramBotSetup:
         Returns:
             BotInfo if valid, None otherwise.
         """
-        client = await self._get_client()
+        client = get_telegram_http()
 
         try:
             response = await client.get(f"{self.config.api_base}/getMe")
@@ -157,7 +163,7 @@ class TelegramBotSetup:
         Returns:
             True if webhook was set successfully.
         """
-        client = await self._get_client()
+        client = get_telegram_http()
 
         if allowed_updates is None:
             allowed_updates = ["message", "callback_query"]
@@ -198,7 +204,7 @@ class TelegramBotSetup:
         Returns:
             WebhookInfo if available, None on error.
         """
-        client = await self._get_client()
+        client = get_telegram_http()
 
         try:
             response = await client.get(f"{self.config.api_base}/getWebhookInfo")
@@ -230,7 +236,7 @@ class TelegramBotSetup:
         Returns:
             True if webhook was deleted successfully.
         """
-        client = await self._get_client()
+        client = get_telegram_http()
 
         try:
             response = await client.post(
@@ -251,23 +257,31 @@ class TelegramBotSetup:
     async def is_healthy(self) -> bool:
         """Check if bot is healthy and webhook is configured.
 
+        A successful getWebhookInfo already proves the token is valid, so
+        no separate getMe is made. Healthy results are cached briefly so
+        frequent liveness probes don't each hit the Bot API; failures are
+        not cached, so recovery is seen on the next probe.
+
         Returns:
-            True if bot is verified and webhook has no recent errors.
+            True if the webhook info could be fetched.
         """
-        # Verify bot token
-        bot_info = await self.verify_bot()
-        if not bot_info:
-            return False
+        return bool(
+            await _health_cache.get_or_load(self.config.bot_token, self._check_health)
+        )
+
+    async def _check_health(self) -> bool | None:
+        """Fetch webhook info and report health.
 
-        # Check webhook status
+        Returns:
+            True if webhook info is available, None if it could not be
+            fetched (so the failure isn't cached).
+        """
         webhook_info = await self.get_webhook_info()
         if not webhook_info:
-            return False
+            return None
 
         # Check for webhook errors (within last hour)
         if webhook_info.last_error_date:
-            import time
-
             one_hour_ago = int(time.time()) - 3600
             if webhook_info.last_error_date > one_hour_ago:
                 logger.warning(
@@ -302,11 +316,16 @@ def get_bot_config() -> TelegramBotConfig:
     )
 
 
+_setup: TelegramBotSetup | None = None
+
+
 def get_bot_setup() -> TelegramBotSetup:
     """Factory function for dependency injection.
 
     Returns:
-        Configured TelegramBotSetup instance.
+        Shared TelegramBotSetup instance.
     """
-    config = get_bot_config()
-    return TelegramBotSetup(config)
+    global _setup
+    if _setup is None:
+        _setup = TelegramBotSetup(get_bot_config())
+    return _setup
@@ -7,16 +7,41 @@ on successful account linking.
 
 import secrets
 from datetime import datetime, timedelta, UTC
+from typing import Any, cast
 
 import structlog
+from postgrest.types import CountMethod, ReturnMethod
 
-from app.clients.supabase import get_client
+from app.clients.redis import get_redis_client
+from app.clients.supabase import execute_async, get_client
+from app.utils.cache import TTLCache
 
 logger = structlog.get_logger()
 
 # Token expiration time in minutes
 TOKEN_EXPIRY_MINUTES = 15
 
+# chat_id -> user_id lookup cache (Redis). Unknown chat IDs are cached
+# briefly with a sentinel so bot spam doesn't hammer Supabase.
+USER_CACHE_TTL_SECONDS = 3600
+USER_CACHE_NEGATIVE_TTL_SECONDS = 30
+_NO_USER = "-"
+
+# In-process layer in front of Redis. Kept shorter than the Redis TTL
+# since invalidation only reaches the local worker.
+USER_LOCAL_CACHE_TTL_SECONDS = 300
+USER_LOCAL_CACHE_MAX_CHATS = 10_000
+
+_local_user_cache: TTLCache[str, str | None] = TTLCache(
+    maxsize=USER_LOCAL_CACHE_MAX_CHATS,
+    ttl=USER_LOCAL_CACHE_TTL_SECONDS,
+)
+
+
+def _user_cache_key(chat_id: str) -> str:
+    """Redis key for a chat_id -> user_id mapping."""
+    return f"tg:uid:{chat_id}"
+
 
 class TelegramConnectionService:
     """Service for managing Telegram account connection tokens."""
@@ -40,17 +65,17 @@ class TelegramConnectionService:
         token = secrets.token_urlsafe(32)
         expires_at = datetime.now(UTC) + timedelta(minutes=TOKEN_EXPIRY_MINUTES)
 
-        # Delete any existing tokens for this chat_id first
-        self._client.table("pending_telegram_connections").delete().eq(
-            "telegram_chat_id", chat_id
-        ).execute()
-
-        # Insert new token
-        self._client.table("pending_telegram_connections").insert({
-            "token": token,
-            "telegram_chat_id": chat_id,
-            "expires_at": expires_at.isoformat(),
-        }).execute()
+        # Replace any existing token for this chat_id in one round trip
+        await execute_async(
+            self._client.table("pending_telegram_connections").upsert(
+                {
+                    "token": token,
+                    "telegram_chat_id": chat_id,
+                    "expires_at": expires_at.isoformat(),
+                },
+                on_conflict="telegram_chat_id",
+            )
+        )
 
         logger.debug(
             "Created Telegram connection token",
@@ -63,7 +88,8 @@ class TelegramConnectionService:
     async def validate_token(self, token: str) -> str | None:
         """Validate a connection token and return the associated chat ID.
 
-        Checks if the token exists and has not expired.
+        Checks if the token exists and has not expired, without consuming
+        it (use consume_token when linking).
 
         Args:
             token: The connection token to validate.
@@ -71,28 +97,28 @@ class TelegramConnectionService:
         Returns:
             The Telegram chat ID if valid, None otherwise.
         """
-        result = self._client.table("pending_telegram_connections").select(
-            "telegram_chat_id", "expires_at"
-        ).eq("token", token).execute()
-
-        if not result.data:
-            logger.debug("Token not found", token=token[:8] + "...")
-            return None
+        now = datetime.now(UTC).isoformat()
 
-        row = result.data[0]
-        expires_at = datetime.fromisoformat(row["expires_at"].replace("Z", "+00:00"))
+        # Expiry is filtered server-side; only valid tokens come back
+        result = await execute_async(
+            self._client.table("pending_telegram_connections")
+            .select("telegram_chat_id")
+            .eq("token", token)
+            .gt("expires_at", now)
+        )
 
-        if expires_at < datetime.now(UTC):
-            logger.debug("Token expired", token=token[:8] + "...")
+        if not result.data:
+            logger.debug("Token missing or expired", token=token[:8] + "...")
             return None
 
-        return row["telegram_chat_id"]
+        rows = cast(list[dict[str, Any]], result.data)
+        return cast(str, rows[0]["telegram_chat_id"])
 
     async def consume_token(self, token: str) -> str | None:
         """Validate and consume a connection token.
 
-        If the token is valid, deletes it and returns the chat ID.
-        This ensures tokens can only be used once.
+        If the token is valid, deletes it and returns the chat ID in a
+        single atomic statement, so tokens can only be used once.
 
         Args:
             token: The connection token to consume.
@@ -100,15 +126,17 @@ class TelegramConnectionService:
         Returns:
             The Telegram chat ID if valid, None otherwise.
         """
-        # First validate the token
-        chat_id = await self.validate_token(token)
+        result = await execute_async(
+            self._client.rpc("consume_telegram_token", {"p_token": token})
+        )
+
+        chat_id = result.data if isinstance(result.data, str) else None
         if chat_id is None:
+            logger.debug("Token missing or expired", token=token[:8] + "...")
             return None
 
-        # Delete the token (consume it)
-        self._client.table("pending_telegram_connections").delete().eq(
-            "token", token
-        ).execute()
+        # The chat is about to be linked; drop any cached "not connected"
+        await self.invalidate_user_cache(chat_id)
 
         logger.info(
             "Consumed Telegram connection token",
@@ -118,6 +146,126 @@ class TelegramConnectionService:
 
         return chat_id
 
+    async def get_user_id(self, chat_id: str) -> str | None:
+        """Resolve the user linked to a Telegram chat.
+
+        Checks the in-process cache, then Redis, then Supabase. Concurrent
+        misses for the same chat share one lookup, and unknown chats are
+        cached briefly.
+
+        Args:
+            chat_id: Telegram chat ID.
+
+        Returns:
+            The linked user ID, or None if the chat is not connected.
+        """
+        try:
+            return await _local_user_cache.get_or_load(
+                chat_id,
+                lambda: self._load_user_id(chat_id),
+                none_ttl=USER_CACHE_NEGATIVE_TTL_SECONDS,
+            )
+        except Exception as e:
+            # Not cached, so the next message retries the lookup
+            logger.error("Failed to look up user", chat_id=chat_id, error=str(e))
+            return None
+
+    async def _load_user_id(self, chat_id: str) -> str | None:
+        """Load the linked user ID from Redis, falling back to Supabase.
+
+        Args:
+            chat_id: Telegram chat ID.
+
+        Returns:
+            The linked user ID, or None if the chat is not connected.
+
+        Raises:
+            Exception: If the Supabase lookup fails, so the failure isn't
+                cached as "not connected".
+        """
+        hit, cached_user_id = await self.get_cached_user_id(chat_id)
+        if hit:
+            return cached_user_id
+
+        # maybe_single() yields None (not an error) for unknown chats
+        response = await execute_async(
+            self._client.table("profiles")
+            .select("id")
+            .eq("telegram_chat_id", chat_id)
+            .maybe_single()
+        )
+
+        user_id: str | None = None
+        if response is not None:
+            user_id = cast(dict[str, Any], response.data)["id"]
+        await self.cache_user_id(chat_id, user_id)
+        return user_id
+
+    async def get_cached_user_id(self, chat_id: str) -> tuple[bool, str | None]:
+        """Look up a cached chat_id -> user_id mapping.
+
+        Args:
+            chat_id: Telegram chat ID.
+
+        Returns:
+            Tuple of (hit, user_id). On a hit, user_id is None for a cached
+            "not connected" result. hit is False if nothing is cached (or
+            Redis is unavailable).
+        """
+        redis = get_redis_client()
+        if redis is None:
+            return False, None
+
+        try:
+            cached = await redis.get(_user_cache_key(chat_id))
+        except Exception as e:
+            logger.warning("Telegram user cache read failed", error=str(e))
+            return False, None
+
+        if cached is None:
+            return False, None
+        if isinstance(cached, bytes):
+            cached = cached.decode()
+        return True, (None if cached == _NO_USER else cached)
+
+    async def cache_user_id(self, chat_id: str, user_id: str | None) -> None:
+        """Cache a chat_id -> user_id mapping (None caches a miss briefly).
+
+        Args:
+            chat_id: Telegram chat ID.
+            user_id: Linked user ID, or None if the chat is not connected.
+        """
+        redis = get_redis_client()
+        if redis is None:
+            return
+
+        try:
+            if user_id:
+                await redis.setex(_user_cache_key(chat_id), USER_CACHE_TTL_SECONDS, user_id)
+            else:
+                await redis.setex(
+                    _user_cache_key(chat_id), USER_CACHE_NEGATIVE_TTL_SECONDS, _NO_USER
+                )
+        except Exception as e:
+            logger.warning("Telegram user cache write failed", error=str(e))
+
+    async def invalidate_user_cache(self, chat_id: str) -> None:
+        """Drop the cached mapping for a chat after connect/disconnect.
+
+        Args:
+            chat_id: Telegram chat ID.
+        """
+        _local_user_cache.invalidate(chat_id)
+
+        redis = get_redis_client()
+        if redis is None:
+            return
+
+        try:
+            await redis.delete(_user_cache_key(chat_id))
+        except Exception as e:
+            logger.warning("Telegram user cache invalidation failed", error=str(e))
+
     async def cleanup_expired(self) -> int:
         """Delete all expired connection tokens.
 
@@ -126,19 +274,16 @@ class TelegramConnectionService:
         """
         now = datetime.now(UTC).isoformat()
 
-        # Get count of expired tokens first
-        result = self._client.table("pending_telegram_connections").select(
-            "id", count="exact"
-        ).lt("expires_at", now).execute()
-
-        count = len(result.data) if result.data else 0
+        # Single DELETE; PostgREST reports the row count without
+        # returning the deleted rows
+        result = await execute_async(
+            self._client.table("pending_telegram_connections")
+            .delete(count=CountMethod.exact, returning=ReturnMethod.minimal)
+            .lt("expires_at", now)
+        )
 
+        count = result.count or 0
         if count > 0:
-            # Delete expired tokens
-            self._client.table("pending_telegram_connections").delete().lt(
-                "expires_at", now
-            ).execute()
-
             logger.info("Cleaned up expired Telegram tokens", count=count)
 
         return count
@@ -6,16 +6,45 @@ and provides warnings/blocking when limits are approached/exceeded.
 
 from dataclasses import dataclass
 from datetime import datetime, timedelta, UTC
-from typing import Any
+from typing import Any, cast
 
 import structlog
+from postgrest.types import ReturnMethod
 
-from app.clients.supabase import get_client
+from app.clients.supabase import execute_async, get_client
+from app.utils.batching import MicroBatcher
+from app.utils.cache import TTLCache
 
 logger = structlog.get_logger()
 
-
-@dataclass
+# Today's usage per user is reused for a few seconds between budget
+# checks; local record_usage calls update the cached total in place.
+# Users far below their limit (under FAR_USAGE_RATIO) are rechecked less
+# often, and drop back to exact mode once local usage passes
+# EXACT_USAGE_RATIO. Usage recorded by other workers is picked up within
+# the longer TTL, while a far user still has half their budget left.
+USAGE_CACHE_TTL_SECONDS = 10
+FAR_USAGE_CACHE_TTL_SECONDS = 60
+FAR_USAGE_RATIO = 0.5
+EXACT_USAGE_RATIO = 0.7
+USAGE_CACHE_MAX_USERS = 10_000
+
+_usage_cache: TTLCache[str, int] = TTLCache(
+    maxsize=USAGE_CACHE_MAX_USERS,
+    ttl=USAGE_CACHE_TTL_SECONDS,
+)
+
+# Concurrent budget checks within this window share one aggregate query
+USAGE_LOAD_WINDOW_SECONDS = 0.005
+MAX_USAGE_LOAD_BATCH = 50
+
+# Usage rows are written in the background, coalesced into one INSERT
+# per window so recording never adds a round trip to an AI call
+USAGE_FLUSH_WINDOW_SECONDS = 0.5
+MAX_USAGE_BATCH = 100
+
+
+@dataclass(slots=True, frozen=True)
 class TokenUsage:
     """Token usage for a single AI call."""
 
@@ -29,7 +58,7 @@ class TokenUsage:
         return self.input_tokens + self.output_tokens
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BudgetStatus:
     """Current budget status for a user."""
 
@@ -41,6 +70,53 @@ class BudgetStatus:
     tokens_remaining: int
 
 
+class TodayUsageLoader:
+    """Coalesces today's-usage lookups from concurrent budget checks.
+
+    Users requested within USAGE_LOAD_WINDOW_SECONDS of each other are
+    loaded with a single RPC call; repeated requests for a user already
+    pending share its result. If the batch query fails, every caller in
+    that batch gets the error.
+    """
+
+    def __init__(
+        self,
+        window: float = USAGE_LOAD_WINDOW_SECONDS,
+        max_batch: int = MAX_USAGE_LOAD_BATCH,
+    ):
+        """Initialize usage loader.
+
+        Args:
+            window: Seconds to wait for more lookups before querying.
+            max_batch: Maximum users per query.
+        """
+        self._batcher: MicroBatcher[str, int] = MicroBatcher(
+            self._load_many, window=window, max_batch=max_batch
+        )
+
+    async def load(self, user_id: str) -> int:
+        """Queue a lookup and wait for the batched result.
+
+        Args:
+            user_id: The user's ID.
+
+        Returns:
+            Total tokens used today (input + output).
+        """
+        return await self._batcher.submit(user_id, key=user_id)
+
+    async def _load_many(self, user_ids: list[str]) -> list[int]:
+        """Load today's totals for a batch of users with one RPC call."""
+        client = get_client()
+        result = await execute_async(
+            client.rpc("token_usage_today_many", {"p_users": user_ids})
+        )
+
+        rows = cast(list[dict[str, Any]], result.data or [])
+        totals: dict[str, int] = {row["user_id"]: row["total_tokens"] for row in rows}
+        return [totals.get(user_id, 0) for user_id in user_ids]
+
+
 class TokenBudgetService:
     """Service for tracking and enforcing token budgets.
 
@@ -58,6 +134,12 @@ class TokenBudgetService:
             daily_limit: Override default daily token limit.
         """
         self.daily_limit = daily_limit or self.DEFAULT_DAILY_LIMIT
+        self._usage_loader = TodayUsageLoader()
+        self._usage_writer: MicroBatcher[dict[str, Any], None] = MicroBatcher(
+            self._insert_usage_rows,
+            window=USAGE_FLUSH_WINDOW_SECONDS,
+            max_batch=MAX_USAGE_BATCH,
+        )
 
     async def check_budget(self, user_id: str) -> BudgetStatus:
         """Check if user has remaining token budget.
@@ -89,36 +171,89 @@ class TokenBudgetService:
     ) -> None:
         """Record token usage for a user.
 
+        The row is queued and written by a background flusher, so this
+        returns without waiting on the database.
+
         Args:
             user_id: The user's ID.
             usage: Token usage details.
         """
-        try:
-            client = get_client()
+        await self.record_usage_many(user_id, [usage])
+
+    async def record_usage_many(
+        self,
+        user_id: str,
+        usages: list[TokenUsage],
+    ) -> None:
+        """Record several token usages for a user, e.g. one per pipeline step.
+
+        The rows are queued together, so they're written by the same
+        multi-row INSERT (batches hold up to MAX_USAGE_BATCH rows).
 
-            data = {
+        Args:
+            user_id: The user's ID.
+            usages: Token usage details, one row each.
+        """
+        if not usages:
+            return
+
+        created_at = datetime.now(UTC).isoformat()
+        for usage in usages:
+            # Not awaited: the row is written in the background
+            self._usage_writer.submit({
                 "user_id": user_id,
                 "input_tokens": usage.input_tokens,
                 "output_tokens": usage.output_tokens,
                 "endpoint": usage.endpoint,
-                "created_at": datetime.now(UTC).isoformat(),
-            }
-
-            client.table("token_usage").insert(data).execute()
+                "created_at": created_at,
+            })
+
+        total_tokens = sum(usage.total for usage in usages)
+
+        # Reflect the new usage locally without another round trip
+        cached = _usage_cache.get(user_id)
+        if cached is not None:
+            total = cached + total_tokens
+            if total >= self.daily_limit * EXACT_USAGE_RATIO:
+                # Nearing the limit: next check goes to the database
+                _usage_cache.invalidate(user_id)
+            else:
+                _usage_cache.replace(user_id, total)
+
+        logger.debug(
+            "Token usage queued",
+            user_id=user_id,
+            rows=len(usages),
+            total=total_tokens,
+        )
 
-            logger.debug(
-                "Token usage recorded",
-                user_id=user_id,
-                input_tokens=usage.input_tokens,
-                output_tokens=usage.output_tokens,
-                total=usage.total,
+    async def _insert_usage_rows(self, rows: list[dict[str, Any]]) -> list[None]:
+        """Write one batch of queued usage rows with a single INSERT."""
+        try:
+            client = get_client()
+            await execute_async(
+                client.table("token_usage").insert(
+                    rows, returning=ReturnMethod.minimal
+                )
             )
         except Exception as e:
             # Don't let recording failures break the main flow
-            logger.error("Failed to record token usage", error=str(e))
+            logger.error("Failed to record token usage", rows=len(rows), error=str(e))
+        return [None] * len(rows)
+
+    async def flush(self, timeout: float = 5.0) -> None:
+        """Wait for queued usage rows to be written.
+
+        Args:
+            timeout: Maximum seconds to wait.
+        """
+        if not await self._usage_writer.wait_idle(timeout):
+            logger.warning(
+                "Token usage still queued at shutdown", count=len(self._usage_writer)
+            )
 
     async def _get_today_usage(self, user_id: str) -> int:
-        """Get total tokens used today by user.
+        """Get total tokens used today by user (cached briefly).
 
         Args:
             user_id: The user's ID.
@@ -126,31 +261,36 @@ class TokenBudgetService:
         Returns:
             Total tokens used today (input + output).
         """
-        try:
-            client = get_client()
+        usage = await _usage_cache.get_or_load(
+            user_id,
+            lambda: self._load_today_usage(user_id),
+            ttl_for=self._usage_cache_ttl,
+        )
+        return usage or 0
 
-            # Get start of today in UTC
-            today_start = datetime.now(UTC).replace(
-                hour=0, minute=0, second=0, microsecond=0
-            )
+    def _usage_cache_ttl(self, used_today: int) -> float:
+        """Cache far-from-limit totals longer than ones near the limit."""
+        if used_today < self.daily_limit * FAR_USAGE_RATIO:
+            return FAR_USAGE_CACHE_TTL_SECONDS
+        return USAGE_CACHE_TTL_SECONDS
 
-            result = client.table("token_usage").select(
-                "input_tokens, output_tokens"
-            ).eq("user_id", user_id).gte(
-                "created_at", today_start.isoformat()
-            ).execute()
+    async def _load_today_usage(self, user_id: str) -> int | None:
+        """Load total tokens used today by user from the database.
 
-            if not result.data:
-                return 0
+        Args:
+            user_id: The user's ID.
 
-            total: int = sum(
-                int(row.get("input_tokens", 0)) + int(row.get("output_tokens", 0))
-                for row in result.data
-            )
-            return total
+        Returns:
+            Total tokens used today (input + output), or None if the
+            lookup failed so the failure isn't cached as a real total.
+        """
+        try:
+            # Summed server-side since UTC midnight, batched with other
+            # users' concurrent checks
+            return await self._usage_loader.load(user_id)
         except Exception as e:
             logger.error("Failed to get token usage", error=str(e))
-            return 0
+            return None
 
     async def get_usage_stats(
         self,
@@ -171,11 +311,14 @@ class TokenBudgetService:
 
             start_date = datetime.now(UTC) - timedelta(days=days)
 
-            result = client.table("token_usage").select(
-                "input_tokens, output_tokens, endpoint, created_at"
-            ).eq("user_id", user_id).gte(
-                "created_at", start_date.isoformat()
-            ).execute()
+            # Grouped by endpoint server-side from the daily rollup plus
+            # rows newer than its last refresh
+            result = await execute_async(
+                client.rpc(
+                    "token_usage_by_endpoint",
+                    {"p_user": user_id, "p_since": start_date.isoformat()},
+                )
+            )
 
             if not result.data:
                 return {
@@ -185,21 +328,19 @@ class TokenBudgetService:
                     "daily_average": 0,
                 }
 
-            total_tokens = sum(
-                row.get("input_tokens", 0) + row.get("output_tokens", 0)
-                for row in result.data
-            )
-
-            # Group by endpoint
+            # One row per endpoint; fold totals in a single pass
             by_endpoint: dict[str, int] = {}
-            for row in result.data:
-                endpoint = row.get("endpoint") or "unknown"
-                tokens = row.get("input_tokens", 0) + row.get("output_tokens", 0)
-                by_endpoint[endpoint] = by_endpoint.get(endpoint, 0) + tokens
+            total_tokens = 0
+            total_requests = 0
+            for row in cast(list[dict[str, Any]], result.data):
+                tokens: int = row["total_tokens"]
+                by_endpoint[row["endpoint"]] = tokens
+                total_tokens += tokens
+                total_requests += row["requests"]
 
             return {
                 "total_tokens": total_tokens,
-                "total_requests": len(result.data),
+                "total_requests": total_requests,
                 "by_endpoint": by_endpoint,
                 "daily_average": total_tokens // days if days > 0 else 0,
             }
@@ -223,3 +364,9 @@ def get_token_budget_service() -> TokenBudgetService:
     if _token_budget_service is None:
         _token_budget_service = TokenBudgetService()
     return _token_budget_service
+
+
+async def flush_token_usage() -> None:
+    """Write any queued token usage rows (called on shutdown)."""
+    if _token_budget_service is not None:
+        await _token_budget_service.flush()
@@ -7,9 +7,24 @@ import structlog
 
 from app.clients.deepgram import DeepgramTranscriber, get_deepgram_transcriber
 from app.clients.telegram import TelegramClient, get_telegram_client
+from app.utils.circuit_breaker import deepgram_circuit
 
 logger = structlog.get_logger()
 
+# Audio containers accepted for transcription; anything else is rejected
+# before spending a Deepgram round trip on it
+SUPPORTED_MIMETYPES = frozenset({
+    "audio/webm",
+    "audio/ogg",
+    "audio/mpeg",
+    "audio/mp3",
+    "audio/mp4",
+    "audio/m4a",
+    "audio/x-m4a",
+    "audio/wav",
+    "audio/x-wav",
+})
+
 
 class TranscriptionService:
     """Unified voice transcription service.
@@ -48,19 +63,26 @@ class TranscriptionService:
             Transcribed text.
 
         Raises:
-            ValueError: If audio is empty.
+            ValueError: If audio is empty or the mimetype is unsupported.
+            CircuitOpenError: If Deepgram is failing and calls are paused.
             Exception: If transcription fails.
         """
         if not audio:
             raise ValueError("Audio data cannot be empty")
 
+        # Browsers send parameters, e.g. "audio/webm;codecs=opus"
+        if mimetype.partition(";")[0].strip().lower() not in SUPPORTED_MIMETYPES:
+            raise ValueError(f"Unsupported audio type: {mimetype}")
+
         logger.info(
             "Transcribing audio bytes",
             size=len(audio),
             mimetype=mimetype
         )
 
-        return await self.deepgram.transcribe(audio, mimetype)
+        return await deepgram_circuit.call(
+            lambda: self.deepgram.transcribe(audio, mimetype)
+        )
 
     async def transcribe_telegram_voice(self, file_id: str) -> str:
         """Download and transcribe a Telegram voice note.
@@ -84,7 +106,9 @@ class TranscriptionService:
         audio_bytes = await self.telegram.get_file(file_id)
 
         # Telegram voice notes are typically OGG/OPUS format
-        return await self.deepgram.transcribe(audio_bytes, mimetype="audio/ogg")
+        return await deepgram_circuit.call(
+            lambda: self.deepgram.transcribe(audio_bytes, mimetype="audio/ogg")
+        )
 
 
 # Factory function for dependency injection
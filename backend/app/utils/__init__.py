@@ -4,8 +4,10 @@ from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitS
 from app.utils.timezone import (
     get_user_local_time,
     get_user_local_hour,
+    get_timezones_at_local_hour,
     get_user_local_date,
     is_users_local_hour,
+    filter_users_at_local_hour,
     utc_to_user_local,
     user_local_to_utc,
     get_user_today_start,
@@ -24,8 +26,10 @@ __all__ = [
     # Timezone
     "get_user_local_time",
     "get_user_local_hour",
+    "get_timezones_at_local_hour",
     "get_user_local_date",
     "is_users_local_hour",
+    "filter_users_at_local_hour",
     "utc_to_user_local",
     "user_local_to_utc",
     "get_user_today_start",
@@ -0,0 +1,130 @@
+"""In-process micro-batching utility.
+
+Coalesces work submitted by concurrent callers (Supabase writes and
+lookups, outbound messages) into one batched call per short window, so a
+burst costs one round trip instead of one per caller.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Runs submitted items through a batch callback in short windows.
+
+    The first submission starts a worker that waits `window` seconds for
+    the rest of a burst, then passes up to `max_batch` pending items to
+    `flush`, repeating until nothing is pending. `flush` returns one
+    result per item, in order. If it raises, every caller in that batch
+    gets the exception.
+
+    Items submitted with the same key while one is still pending collapse
+    to the latest item, and all of that key's callers share its result.
+
+    Usage:
+        loader: MicroBatcher[str, int] = MicroBatcher(load_totals, window=0.005, max_batch=50)
+
+        total = await loader.submit(user_id, key=user_id)
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[T]], Awaitable[list[R]]],
+        window: float,
+        max_batch: int,
+        size: Callable[[T], int] | None = None,
+    ):
+        """Initialize batcher.
+
+        Args:
+            flush: Async callable handling one batch of items, returning
+                a result per item in the same order.
+            window: Seconds to wait for more items before each flush.
+            max_batch: Maximum total size of one batch.
+            size: Optional size of an item toward max_batch (default 1),
+                e.g. its row count. A batch never exceeds max_batch unless
+                a single item does; that item is flushed on its own.
+        """
+        self._flush = flush
+        self._window = window
+        self._max_batch = max_batch
+        self._size = size
+        self._pending: dict[Hashable, tuple[T, list[asyncio.Future[R]]]] = {}
+        self._worker: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, item: T, key: Hashable | None = None) -> asyncio.Future[R]:
+        """Queue an item for the next batch.
+
+        Callers that don't need the result may leave the future unawaited;
+        flush should then handle its own errors.
+
+        Args:
+            item: Item to pass to flush.
+            key: Optional identity; a pending item with the same key is
+                replaced by this one and shares its result.
+
+        Returns:
+            Future resolved with the item's result.
+        """
+        future: asyncio.Future[R] = asyncio.get_running_loop().create_future()
+        if key is None:
+            key = object()
+
+        pending = self._pending.get(key)
+        futures = [future] if pending is None else pending[1] + [future]
+        self._pending[key] = (item, futures)
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+
+        return future
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """Wait for pending items to be flushed, e.g. at shutdown.
+
+        Args:
+            timeout: Maximum seconds to wait.
+
+        Returns:
+            True if nothing is left pending.
+        """
+        if self._worker is not None and not self._worker.done():
+            await asyncio.wait({self._worker}, timeout=timeout)
+        return not self._pending
+
+    async def _drain(self) -> None:
+        """Flush pending items in batches until none are left."""
+        while self._pending:
+            # Give the rest of a burst a moment to join the batch
+            await asyncio.sleep(self._window)
+
+            batch: list[tuple[T, list[asyncio.Future[R]]]] = []
+            total = 0
+            for key, (item, _) in list(self._pending.items()):
+                # Stop before an item that would push the batch past
+                # max_batch, unless the batch is still empty
+                item_size = self._size(item) if self._size else 1
+                if batch and total + item_size > self._max_batch:
+                    break
+                batch.append(self._pending.pop(key))
+                total += item_size
+
+            try:
+                results = await self._flush([item for item, _ in batch])
+            except Exception as e:
+                for _, futures in batch:
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
+                continue
+
+            for (_, futures), result in zip(batch, results):
+                for future in futures:
+                    if not future.done():
+                        future.set_result(result)
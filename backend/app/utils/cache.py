@@ -0,0 +1,224 @@
+"""In-process TTL cache utilities.
+
+Provides a small bounded cache with per-entry expiry and LRU eviction,
+used to avoid repeated Supabase round-trips for data that changes rarely
+(notification preferences, channel configuration, etc.), plus a
+request-scoped memo for lookups repeated within a single HTTP request.
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU cache whose entries expire after a fixed TTL.
+
+    Expiry uses the monotonic clock so wall-clock adjustments don't
+    extend or shorten entry lifetimes. Concurrent misses for the same
+    key are coalesced via a per-key lock (single-flight), so a cold
+    entry only triggers one load.
+
+    Usage:
+        prefs_cache: TTLCache[str, Preferences] = TTLCache(maxsize=10_000, ttl=120)
+
+        prefs = await prefs_cache.get_or_load(user_id, lambda: load_prefs(user_id))
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 120.0):
+        """Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries before LRU eviction.
+            ttl: Default time-to-live in seconds for each entry.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._locks: dict[K, asyncio.Lock] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _lookup(self, key: K) -> V | object:
+        """Return cached value or _MISSING, evicting expired entries."""
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return _MISSING
+
+        self._data.move_to_end(key)
+        return value
+
+    def get(self, key: K) -> V | None:
+        """Get a cached value.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Cached value, or None if missing or expired.
+        """
+        value = self._lookup(key)
+        return None if value is _MISSING else value  # type: ignore[return-value]
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store a value.
+
+        Args:
+            key: Cache key.
+            value: Value to cache.
+            ttl: Optional TTL override in seconds.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def replace(self, key: K, value: V) -> bool:
+        """Replace a live entry's value without extending its expiry.
+
+        Args:
+            key: Cache key.
+            value: New value.
+
+        Returns:
+            True if an unexpired entry was updated, False otherwise.
+        """
+        if self._lookup(key) is _MISSING:
+            return False
+
+        expires_at, _ = self._data[key]
+        self._data[key] = (expires_at, value)
+        return True
+
+    def invalidate(self, key: K) -> None:
+        """Remove a single entry if present."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+    async def get_or_load(
+        self,
+        key: K,
+        loader: Callable[[], Awaitable[V | None]],
+        none_ttl: float | None = None,
+        ttl_for: Callable[[V], float] | None = None,
+    ) -> V | None:
+        """Get a cached value, loading it on miss.
+
+        None results are not cached unless none_ttl is given, so
+        transient failures are retried on the next call.
+
+        Args:
+            key: Cache key.
+            loader: Async callable producing the value on miss.
+            none_ttl: If set, cache None results for this many seconds
+                (negative caching).
+            ttl_for: Optional function choosing the TTL from the loaded
+                value, overriding the cache default.
+
+        Returns:
+            Cached or freshly loaded value.
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value  # type: ignore[return-value]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                # Another waiter may have populated the entry meanwhile
+                value = self._lookup(key)
+                if value is not _MISSING:
+                    return value  # type: ignore[return-value]
+
+                loaded = await loader()
+                if loaded is not None:
+                    self.set(key, loaded, ttl=ttl_for(loaded) if ttl_for else None)
+                elif none_ttl is not None:
+                    self.set(key, None, ttl=none_ttl)  # type: ignore[arg-type]
+                return loaded
+        finally:
+            if self._locks.get(key) is lock and not lock.locked():
+                del self._locks[key]
+
+
+# Request-scoped memo. None outside a request (background jobs, bot
+# polling), in which case request_cached is a pass-through.
+_request_cache: ContextVar[dict[Hashable, Any] | None] = ContextVar(
+    "nuance_request_cache", default=None
+)
+
+
+def begin_request_cache() -> Token[dict[Hashable, Any] | None]:
+    """Start an empty request-scoped cache for the current context.
+
+    Returns:
+        Token to pass to end_request_cache.
+    """
+    return _request_cache.set({})
+
+
+def end_request_cache(token: Token[dict[Hashable, Any] | None]) -> None:
+    """Discard the request-scoped cache started by begin_request_cache.
+
+    Args:
+        token: Token returned by begin_request_cache.
+    """
+    _request_cache.reset(token)
+
+
+def clear_request_cache() -> None:
+    """Drop all request-scoped entries, e.g. after a write in the request."""
+    store = _request_cache.get()
+    if store is not None:
+        store.clear()
+
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+def request_cached(func: F) -> F:
+    """Memoize an async method for the duration of the current request.
+
+    The cache key is the method's qualified name plus its positional
+    arguments (excluding self), so arguments must be hashable.
+
+    Usage:
+        @request_cached
+        async def _get_preferences(self, user_id: str) -> Preferences | None:
+            ...
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self: Any, *args: Hashable) -> Any:
+        store = _request_cache.get()
+        if store is None:
+            return await func(self, *args)
+
+        key = (func.__qualname__, *args)
+        if key in store:
+            return store[key]
+
+        result = await func(self, *args)
+        store[key] = result
+        return result
+
+    return wrapper  # type: ignore[return-value]
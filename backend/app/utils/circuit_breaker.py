@@ -5,7 +5,8 @@ Implements the circuit breaker pattern to fail fast when external services
 failures and provides quick feedback to users instead of hanging requests.
 """
 
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, UTC
 from enum import Enum
 from typing import Awaitable, Callable, TypeVar
 
@@ -67,23 +68,27 @@ class CircuitBreaker:
         """
         self.name = name
         self.failure_threshold = failure_threshold
-        self.cooldown = timedelta(seconds=cooldown_seconds)
+        self.cooldown_seconds = float(cooldown_seconds)
 
         self._state = CircuitState.CLOSED
         self._failures = 0
-        self._last_failure_time: datetime | None = None
-        self._last_success_time: datetime | None = None
+        # time.monotonic() deadline after which an open circuit half-opens
+        self._open_until = 0.0
+        # Set while the single half-open test request is running
+        self._probe_in_flight = False
+        # Wall-clock timestamps (time.time()) for status reporting only
+        self._last_failure_time: float | None = None
+        self._last_success_time: float | None = None
 
     @property
     def state(self) -> CircuitState:
         """Get current circuit state, checking for cooldown expiry."""
-        if self._state == CircuitState.OPEN and self._last_failure_time:
-            if datetime.now() - self._last_failure_time > self.cooldown:
-                logger.info(
-                    "Circuit cooldown expired, entering half-open state",
-                    circuit=self.name,
-                )
-                self._state = CircuitState.HALF_OPEN
+        if self._state is CircuitState.OPEN and time.monotonic() >= self._open_until:
+            logger.info(
+                "Circuit cooldown expired, entering half-open state",
+                circuit=self.name,
+            )
+            self._state = CircuitState.HALF_OPEN
         return self._state
 
     @property
@@ -113,11 +118,14 @@ class CircuitBreaker:
         Raises:
             CircuitOpenError: If circuit is open
             Exception: Original exception if function fails
+
+        State checks and transitions never await, so on the event loop they
+        run atomically without a lock; the CLOSED path only reads state.
         """
         current_state = self.state
 
         # Check if circuit is open
-        if current_state == CircuitState.OPEN:
+        if current_state is CircuitState.OPEN:
             retry_after = self._get_retry_after()
             logger.warning(
                 "Circuit open, rejecting request",
@@ -126,6 +134,14 @@ class CircuitBreaker:
             )
             raise CircuitOpenError(self.name, retry_after)
 
+        # Half-open admits exactly one test request; the rest fail fast
+        # until it settles instead of all hitting a recovering service
+        is_probe = current_state is CircuitState.HALF_OPEN
+        if is_probe:
+            if self._probe_in_flight:
+                raise CircuitOpenError(self.name, 0.0)
+            self._probe_in_flight = True
+
         try:
             result = await func()
             self._on_success()
@@ -133,10 +149,13 @@ class CircuitBreaker:
         except Exception as e:
             self._on_failure(e)
             raise
+        finally:
+            if is_probe:
+                self._probe_in_flight = False
 
     def _on_success(self) -> None:
         """Handle successful call - reset failures and close circuit."""
-        if self._state == CircuitState.HALF_OPEN:
+        if self._state is CircuitState.HALF_OPEN:
             logger.info(
                 "Circuit test succeeded, closing circuit",
                 circuit=self.name,
@@ -144,12 +163,12 @@ class CircuitBreaker:
 
         self._failures = 0
         self._state = CircuitState.CLOSED
-        self._last_success_time = datetime.now()
+        self._last_success_time = time.time()
 
     def _on_failure(self, error: Exception) -> None:
         """Handle failed call - increment failures and potentially open circuit."""
         self._failures += 1
-        self._last_failure_time = datetime.now()
+        self._last_failure_time = time.time()
 
         logger.warning(
             "Circuit breaker recorded failure",
@@ -161,35 +180,37 @@ class CircuitBreaker:
         )
 
         if self._failures >= self.failure_threshold:
-            self._state = CircuitState.OPEN
+            self._open(time.monotonic())
             logger.error(
                 "Circuit opened due to consecutive failures",
                 circuit=self.name,
                 failure_count=self._failures,
-                cooldown_seconds=self.cooldown.total_seconds(),
+                cooldown_seconds=self.cooldown_seconds,
             )
-        elif self._state == CircuitState.HALF_OPEN:
+        elif self._state is CircuitState.HALF_OPEN:
             # Test request failed, reopen circuit
-            self._state = CircuitState.OPEN
+            self._open(time.monotonic())
             logger.warning(
                 "Circuit test failed, reopening circuit",
                 circuit=self.name,
             )
 
+    def _open(self, now: float) -> None:
+        """Open the circuit until the cooldown has elapsed from now."""
+        self._state = CircuitState.OPEN
+        self._open_until = now + self.cooldown_seconds
+
     def _get_retry_after(self) -> float:
         """Calculate seconds until circuit might close."""
-        if self._last_failure_time is None:
-            return 0.0
-
-        elapsed = datetime.now() - self._last_failure_time
-        remaining = self.cooldown - elapsed
-        return max(0.0, remaining.total_seconds())
+        return max(0.0, self._open_until - time.monotonic())
 
     def reset(self) -> None:
         """Manually reset the circuit to closed state."""
         logger.info("Circuit manually reset", circuit=self.name)
         self._state = CircuitState.CLOSED
         self._failures = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
         self._last_failure_time = None
 
     def get_status(self) -> dict[str, str | int | float | None]:
@@ -199,13 +220,20 @@ class CircuitBreaker:
             "state": self.state.value,
             "failures": self._failures,
             "failure_threshold": self.failure_threshold,
-            "cooldown_seconds": self.cooldown.total_seconds(),
+            "cooldown_seconds": self.cooldown_seconds,
             "retry_after": self._get_retry_after() if self.is_open else None,
-            "last_failure": self._last_failure_time.isoformat() if self._last_failure_time else None,
-            "last_success": self._last_success_time.isoformat() if self._last_success_time else None,
+            "last_failure": _isoformat(self._last_failure_time),
+            "last_success": _isoformat(self._last_success_time),
         }
 
 
+def _isoformat(timestamp: float | None) -> str | None:
+    """Format an epoch timestamp as ISO 8601 (UTC), or None."""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, UTC).isoformat()
+
+
 # Pre-configured circuit breakers for external services
 claude_circuit = CircuitBreaker("claude", failure_threshold=3, cooldown_seconds=60)
 deepgram_circuit = CircuitBreaker("deepgram", failure_threshold=3, cooldown_seconds=60)
@@ -1,17 +1,60 @@
 """Rate limiting utilities for AI endpoints.
 
 Implements per-user rate limiting with configurable limits for
-requests per minute and per day.
+requests per minute and per day. When Redis is configured the limits
+are shared across workers; otherwise state is kept in-process.
 """
 
+import math
+import time
 from collections import defaultdict
-from datetime import datetime, timedelta, UTC
 from typing import NamedTuple
 
 import structlog
+from redis.commands.core import AsyncScript
+
+from app.clients.redis import get_redis_client
 
 logger = structlog.get_logger()
 
+SECONDS_PER_DAY = 86_400
+
+# Idle minute buckets are full again after 60s, so they can expire
+MINUTE_BUCKET_TTL_SECONDS = 120
+
+# Atomically refill/consume the minute token bucket and count the day.
+# KEYS: minute bucket hash, day counter.
+# ARGV: rpm, rpd, midnight (epoch seconds), minute bucket TTL.
+# Returns {allowed, limit_type, tokens (string), day_count}.
+_CHECK_SCRIPT = """
+local rpm = tonumber(ARGV[1])
+local rpd = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or rpm
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(rpm, tokens + (now - ts) * rpm / 60)
+
+local day = tonumber(redis.call('GET', KEYS[2]) or '0')
+if tokens < 1 then
+    return {0, 'minute', tostring(tokens), day}
+end
+if day >= rpd then
+    return {0, 'day', tostring(tokens), day}
+end
+
+tokens = tokens - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+day = redis.call('INCR', KEYS[2])
+if day == 1 then
+    redis.call('EXPIREAT', KEYS[2], tonumber(ARGV[3]))
+end
+return {1, '', tostring(tokens), day}
+"""
+
 
 class RateLimitResult(NamedTuple):
     """Result of a rate limit check."""
@@ -25,8 +68,13 @@ class RateLimitResult(NamedTuple):
 class RateLimiter:
     """In-memory rate limiter with per-minute and per-day limits.
 
-    For production, consider using Redis for distributed rate limiting
-    across multiple server instances.
+    The minute limit is a token bucket (constant memory per user, bursts
+    of up to rpm); the day limit is a counter reset at UTC midnight.
+
+    check() and get_status() use in-process state only. The async
+    check_shared() and get_shared_status() keep the same limits in Redis
+    (one script call per check, keys expire on their own) so they hold
+    across workers, falling back to in-process state without Redis.
     """
 
     def __init__(
@@ -43,36 +91,85 @@ class RateLimiter:
         self.rpm = requests_per_minute
         self.rpd = requests_per_day
 
-        # Track request timestamps per user for minute window
-        self.minute_requests: dict[str, list[datetime]] = defaultdict(list)
+        # Per-minute token bucket per user: (tokens, last refill as
+        # time.monotonic()). Refills continuously at rpm tokens per minute.
+        self.minute_buckets: dict[str, tuple[float, float]] = {}
 
-        # Track daily counts per user
+        # Track daily counts per user, keyed to the UTC day number
+        # (epoch seconds // 86400) they were counted in
         self.day_counts: dict[str, int] = defaultdict(int)
-        self.day_reset: dict[str, datetime] = {}
+        self.day_reset: dict[str, int] = {}
+
+        # Shared-limit script, registered on first use (EVALSHA after that)
+        self._check_script: AsyncScript | None = None
+
+    def _refill_minute_tokens(self, user_id: str, tick: float) -> float:
+        """Refill the user's minute bucket for the time elapsed since last use.
+
+        Args:
+            user_id: The user's unique identifier.
+            tick: Current time.monotonic() value.
 
-    def _clean_minute_window(self, user_id: str, now: datetime) -> None:
-        """Remove requests older than 1 minute."""
-        minute_ago = now - timedelta(minutes=1)
-        self.minute_requests[user_id] = [
-            t for t in self.minute_requests[user_id] if t > minute_ago
-        ]
+        Returns:
+            Tokens currently available (0 to rpm).
+        """
+        bucket = self.minute_buckets.get(user_id)
+        if bucket is None:
+            return float(self.rpm)
 
-    def _check_day_reset(self, user_id: str, now: datetime) -> None:
+        tokens, last_refill = bucket
+        return min(float(self.rpm), tokens + (tick - last_refill) * self.rpm / 60)
+
+    def _check_day_reset(self, user_id: str, day: int) -> None:
         """Reset daily count if it's a new day."""
-        if user_id in self.day_reset:
-            last_reset = self.day_reset[user_id]
-            if now.date() > last_reset.date():
-                self.day_counts[user_id] = 0
-                self.day_reset[user_id] = now
-        else:
-            self.day_reset[user_id] = now
-
-    def _seconds_until_midnight(self, now: datetime) -> int:
-        """Calculate seconds until midnight UTC."""
-        tomorrow = (now + timedelta(days=1)).replace(
-            hour=0, minute=0, second=0, microsecond=0
+        last_reset = self.day_reset.get(user_id)
+        if last_reset is None:
+            self.day_reset[user_id] = day
+        elif day > last_reset:
+            self.day_counts[user_id] = 0
+            self.day_reset[user_id] = day
+
+    def _seconds_until_midnight(self, now: float) -> int:
+        """Calculate seconds until midnight UTC from an epoch timestamp."""
+        return int(SECONDS_PER_DAY - now % SECONDS_PER_DAY)
+
+    def _minute_exceeded(self, user_id: str, tokens: float) -> RateLimitResult:
+        """Build the rejection for an empty minute bucket."""
+        # Time until the bucket refills to one whole token
+        retry_after = math.ceil((1 - tokens) * 60 / self.rpm)
+        retry_after = max(1, retry_after)  # At least 1 second
+
+        logger.warning(
+            "Rate limit exceeded (minute)",
+            user_id=user_id,
+            tokens=round(tokens, 3),
+            limit=self.rpm,
+        )
+
+        return RateLimitResult(
+            allowed=False,
+            retry_after_seconds=retry_after,
+            requests_remaining=0,
+            limit_type="minute",
+        )
+
+    def _day_exceeded(
+        self, user_id: str, day_count: int, now: float
+    ) -> RateLimitResult:
+        """Build the rejection for an exhausted daily limit."""
+        logger.warning(
+            "Rate limit exceeded (day)",
+            user_id=user_id,
+            count=day_count,
+            limit=self.rpd,
+        )
+
+        return RateLimitResult(
+            allowed=False,
+            retry_after_seconds=self._seconds_until_midnight(now),
+            requests_remaining=0,
+            limit_type="day",
         )
-        return int((tomorrow - now).total_seconds())
 
     def check(self, user_id: str) -> RateLimitResult:
         """Check if a request is allowed for the given user.
@@ -83,60 +180,31 @@ class RateLimiter:
         Returns:
             RateLimitResult with allowed status and retry info.
         """
-        now = datetime.now(UTC)
+        now = time.time()
+        tick = time.monotonic()
 
-        # Clean old minute window entries
-        self._clean_minute_window(user_id, now)
+        # Refill the minute bucket
+        tokens = self._refill_minute_tokens(user_id, tick)
 
         # Check day reset
-        self._check_day_reset(user_id, now)
+        self._check_day_reset(user_id, int(now // SECONDS_PER_DAY))
 
         # Check minute limit
-        minute_count = len(self.minute_requests[user_id])
-        if minute_count >= self.rpm:
-            oldest = min(self.minute_requests[user_id])
-            retry_after = 60 - int((now - oldest).total_seconds())
-            retry_after = max(1, retry_after)  # At least 1 second
-
-            logger.warning(
-                "Rate limit exceeded (minute)",
-                user_id=user_id,
-                count=minute_count,
-                limit=self.rpm,
-            )
-
-            return RateLimitResult(
-                allowed=False,
-                retry_after_seconds=retry_after,
-                requests_remaining=0,
-                limit_type="minute",
-            )
+        if tokens < 1:
+            return self._minute_exceeded(user_id, tokens)
 
         # Check daily limit
         day_count = self.day_counts[user_id]
         if day_count >= self.rpd:
-            retry_after = self._seconds_until_midnight(now)
-
-            logger.warning(
-                "Rate limit exceeded (day)",
-                user_id=user_id,
-                count=day_count,
-                limit=self.rpd,
-            )
-
-            return RateLimitResult(
-                allowed=False,
-                retry_after_seconds=retry_after,
-                requests_remaining=0,
-                limit_type="day",
-            )
+            return self._day_exceeded(user_id, day_count, now)
 
         # Request allowed - record it
-        self.minute_requests[user_id].append(now)
+        tokens -= 1
+        self.minute_buckets[user_id] = (tokens, tick)
         self.day_counts[user_id] += 1
 
         # Calculate remaining requests (use the more restrictive limit)
-        minute_remaining = self.rpm - len(self.minute_requests[user_id])
+        minute_remaining = int(tokens)
         day_remaining = self.rpd - self.day_counts[user_id]
         remaining = min(minute_remaining, day_remaining)
 
@@ -155,19 +223,103 @@ class RateLimiter:
         Returns:
             Dict with current usage counts.
         """
-        now = datetime.now(UTC)
-        self._clean_minute_window(user_id, now)
-        self._check_day_reset(user_id, now)
+        minute_remaining = int(self._refill_minute_tokens(user_id, time.monotonic()))
+        self._check_day_reset(user_id, int(time.time() // SECONDS_PER_DAY))
 
         return {
-            "minute_count": len(self.minute_requests[user_id]),
+            "minute_count": self.rpm - minute_remaining,
             "minute_limit": self.rpm,
-            "minute_remaining": self.rpm - len(self.minute_requests[user_id]),
+            "minute_remaining": minute_remaining,
             "day_count": self.day_counts[user_id],
             "day_limit": self.rpd,
             "day_remaining": self.rpd - self.day_counts[user_id],
         }
 
+    @staticmethod
+    def _redis_keys(user_id: str, day: int) -> list[str]:
+        """Redis keys for a user's minute bucket and a UTC day's counter."""
+        return [f"rl:min:{user_id}", f"rl:day:{user_id}:{day}"]
+
+    async def check_shared(self, user_id: str) -> RateLimitResult:
+        """Check a request against limits shared across workers.
+
+        Args:
+            user_id: The user's unique identifier.
+
+        Returns:
+            RateLimitResult with allowed status and retry info.
+        """
+        redis = get_redis_client()
+        if redis is None:
+            return self.check(user_id)
+
+        now = time.time()
+        day = int(now // SECONDS_PER_DAY)
+        midnight = (day + 1) * SECONDS_PER_DAY
+        try:
+            if self._check_script is None:
+                self._check_script = redis.register_script(_CHECK_SCRIPT)
+            allowed, limit_type, tokens_str, day_count = await self._check_script(
+                keys=self._redis_keys(user_id, day),
+                args=[self.rpm, self.rpd, midnight, MINUTE_BUCKET_TTL_SECONDS],
+            )
+        except Exception as e:
+            logger.warning("Shared rate limit check failed", user_id=user_id, error=str(e))
+            return self.check(user_id)
+
+        tokens = float(tokens_str)
+        if not allowed:
+            if limit_type == "minute":
+                return self._minute_exceeded(user_id, tokens)
+            return self._day_exceeded(user_id, int(day_count), now)
+
+        return RateLimitResult(
+            allowed=True,
+            retry_after_seconds=None,
+            requests_remaining=min(int(tokens), self.rpd - int(day_count)),
+        )
+
+    async def get_shared_status(self, user_id: str) -> dict[str, int]:
+        """Get rate limit status from the shared (Redis) state.
+
+        Args:
+            user_id: The user's unique identifier.
+
+        Returns:
+            Dict with current usage counts.
+        """
+        redis = get_redis_client()
+        if redis is None:
+            return self.get_status(user_id)
+
+        day = int(time.time() // SECONDS_PER_DAY)
+        minute_key, day_key = self._redis_keys(user_id, day)
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hmget(minute_key, "tokens", "ts")
+                pipe.get(day_key)
+                pipe.time()
+                (tokens_str, ts_str), day_str, (secs, micros) = await pipe.execute()
+        except Exception as e:
+            logger.warning("Shared rate limit status failed", user_id=user_id, error=str(e))
+            return self.get_status(user_id)
+
+        tokens = float(self.rpm)
+        if tokens_str is not None and ts_str is not None:
+            elapsed = secs + micros / 1_000_000 - float(ts_str)
+            tokens = min(tokens, float(tokens_str) + elapsed * self.rpm / 60)
+        minute_remaining = int(tokens)
+        day_count = int(day_str or 0)
+
+        return {
+            "minute_count": self.rpm - minute_remaining,
+            "minute_limit": self.rpm,
+            "minute_remaining": minute_remaining,
+            "day_count": day_count,
+            "day_limit": self.rpd,
+            "day_remaining": max(0, self.rpd - day_count),
+        }
+
 
 # Global rate limiter instance
 _rate_limiter: RateLimiter | None = None
@@ -6,33 +6,78 @@ Provides timezone-aware date/time operations for:
 - Converting between UTC and user's local time
 """
 
-from datetime import datetime, date, timedelta
-from typing import Optional
-from zoneinfo import ZoneInfo
+from datetime import datetime, date, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Optional
+from zoneinfo import ZoneInfo, available_timezones
 
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+_UTC = ZoneInfo("UTC")
 
-def get_user_local_time(user_timezone: str) -> datetime:
-    """Get the current time in user's timezone.
+# tzinfo objects that already mean UTC (DB timestamps parse to the latter)
+_UTC_TZINFOS = (_UTC, timezone.utc)
 
-    Args:
-        user_timezone: IANA timezone string (e.g., 'America/New_York')
 
-    Returns:
-        Current datetime in user's timezone
+@lru_cache(maxsize=None)
+def _get_zoneinfo(name: str) -> ZoneInfo:
+    """Return the shared ZoneInfo for an IANA name.
+
+    Invalid names raise ZoneInfoNotFoundError (a KeyError) and are not
+    cached, so callers' existing fallbacks still apply.
     """
+    return ZoneInfo(name)
+
+
+def _get_zoneinfo_or_utc(user_timezone: str) -> ZoneInfo:
+    """Return the user's ZoneInfo, falling back to UTC for invalid names."""
     try:
-        tz = ZoneInfo(user_timezone)
-        return datetime.now(tz)
+        return _get_zoneinfo(user_timezone)
     except KeyError:
         logger.warning(
             "Invalid timezone, falling back to UTC",
             timezone=user_timezone
         )
-        return datetime.now(ZoneInfo("UTC"))
+        return _UTC
+
+
+def get_user_local_time(user_timezone: str) -> datetime:
+    """Get the current time in user's timezone.
+
+    Args:
+        user_timezone: IANA timezone string (e.g., 'America/New_York')
+
+    Returns:
+        Current datetime in user's timezone
+    """
+    return datetime.now(_get_zoneinfo_or_utc(user_timezone))
+
+
+@lru_cache(maxsize=1)
+def _all_timezones() -> tuple[str, ...]:
+    """All IANA timezone names known to the system (read once)."""
+    return tuple(sorted(available_timezones()))
+
+
+def get_timezones_at_local_hour(target_hour: int) -> list[str]:
+    """Get every IANA timezone whose current local hour is target_hour.
+
+    Lets scheduled jobs filter profiles by timezone in the database
+    instead of checking each profile's local hour in Python.
+
+    Args:
+        target_hour: Hour to match (0-23)
+
+    Returns:
+        Matching IANA timezone names
+    """
+    now = datetime.now(_UTC)
+    return [
+        name for name in _all_timezones()
+        if now.astimezone(_get_zoneinfo(name)).hour == target_hour
+    ]
 
 
 def get_user_local_hour(user_timezone: str) -> int:
@@ -74,6 +119,39 @@ def is_users_local_hour(user_timezone: str, target_hour: int) -> bool:
     return get_user_local_hour(user_timezone) == target_hour
 
 
+def filter_users_at_local_hour(
+    users: list[dict[str, Any]],
+    target_hour: int,
+    at_hour: Optional[dict[str, bool]] = None,
+) -> list[dict[str, Any]]:
+    """Filter profiles to those whose local hour is target_hour.
+
+    Each distinct timezone is checked once, so a job run does one
+    local-time lookup per timezone rather than per user. Missing
+    timezones are treated as UTC.
+
+    Args:
+        users: Profile dicts with an optional "timezone" key
+        target_hour: Hour to match (0-23)
+        at_hour: Optional timezone -> match cache to share across calls,
+            e.g. for every page of one job run
+
+    Returns:
+        Profiles currently at target_hour
+    """
+    if at_hour is None:
+        at_hour = {}
+    matching = []
+    for user in users:
+        tz_name = user.get("timezone") or "UTC"
+        matches = at_hour.get(tz_name)
+        if matches is None:
+            matches = at_hour[tz_name] = is_users_local_hour(tz_name, target_hour)
+        if matches:
+            matching.append(user)
+    return matching
+
+
 def utc_to_user_local(
     utc_dt: datetime,
     user_timezone: str
@@ -88,10 +166,13 @@ def utc_to_user_local(
         Datetime converted to user's timezone
     """
     try:
-        tz = ZoneInfo(user_timezone)
+        tz = _get_zoneinfo(user_timezone)
         # Ensure UTC timezone if not set
         if utc_dt.tzinfo is None:
-            utc_dt = utc_dt.replace(tzinfo=ZoneInfo("UTC"))
+            utc_dt = utc_dt.replace(tzinfo=_UTC)
+        # Already in the target zone: skip the conversion
+        if utc_dt.tzinfo is tz or (tz is _UTC and utc_dt.tzinfo in _UTC_TZINFOS):
+            return utc_dt
         return utc_dt.astimezone(tz)
     except KeyError:
         logger.warning(
@@ -115,17 +196,20 @@ def user_local_to_utc(
         Datetime converted to UTC
     """
     try:
-        tz = ZoneInfo(user_timezone)
+        tz = _get_zoneinfo(user_timezone)
         # Localize the datetime if not already
         if local_dt.tzinfo is None:
             local_dt = local_dt.replace(tzinfo=tz)
-        return local_dt.astimezone(ZoneInfo("UTC"))
+        # Already UTC: skip the conversion
+        if local_dt.tzinfo in _UTC_TZINFOS:
+            return local_dt
+        return local_dt.astimezone(_UTC)
     except KeyError:
         logger.warning(
             "Invalid timezone, assuming UTC",
             timezone=user_timezone
         )
-        return local_dt.replace(tzinfo=ZoneInfo("UTC"))
+        return local_dt.replace(tzinfo=_UTC)
 
 
 def get_user_today_start(user_timezone: str) -> datetime:
@@ -139,9 +223,9 @@ def get_user_today_start(user_timezone: str) -> datetime:
     Returns:
         Start of user's today in UTC
     """
-    local_today = get_user_local_date(user_timezone)
-    local_midnight = datetime.combine(local_today, datetime.min.time())
-    return user_local_to_utc(local_midnight, user_timezone)
+    tz = _get_zoneinfo_or_utc(user_timezone)
+    today = datetime.now(tz).date()
+    return datetime(today.year, today.month, today.day, tzinfo=tz).astimezone(_UTC)
 
 
 def get_user_today_end(user_timezone: str) -> datetime:
@@ -153,9 +237,11 @@ def get_user_today_end(user_timezone: str) -> datetime:
     Returns:
         End of user's today in UTC
     """
-    local_today = get_user_local_date(user_timezone)
-    local_end = datetime.combine(local_today, datetime.max.time())
-    return user_local_to_utc(local_end, user_timezone)
+    tz = _get_zoneinfo_or_utc(user_timezone)
+    today = datetime.now(tz).date()
+    return datetime(
+        today.year, today.month, today.day, 23, 59, 59, 999999, tzinfo=tz
+    ).astimezone(_UTC)
 
 
 def format_user_date(
@@ -215,6 +301,8 @@ COMMON_TIMEZONES = [
     "UTC",
 ]
 
+_COMMON_TIMEZONE_SET = frozenset(COMMON_TIMEZONES)
+
 
 def is_valid_timezone(timezone: str) -> bool:
     """Check if a timezone string is valid.
@@ -225,8 +313,11 @@ def is_valid_timezone(timezone: str) -> bool:
     Returns:
         True if valid timezone
     """
+    # Zones offered in the UI skip the zoneinfo lookup entirely
+    if timezone in _COMMON_TIMEZONE_SET:
+        return True
     try:
-        ZoneInfo(timezone)
+        _get_zoneinfo(timezone)
         return True
     except KeyError:
         return False
@@ -0,0 +1,48 @@
+"""Profile lookup shared by the hourly local-time jobs."""
+
+from typing import Any
+
+from app.clients.supabase import RangeableQuery, get_client, iter_pages
+from app.utils.timezone import (
+    filter_users_at_local_hour,
+    get_timezones_at_local_hour,
+)
+
+
+async def get_profiles_at_local_hour(
+    target_hour: int,
+    filters: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Get profiles whose local time is currently at target_hour.
+
+    Args:
+        target_hour: Hour (0-23) to match.
+        filters: Optional column -> value equality filters, e.g.
+            {"notification_enabled": True}.
+
+    Returns:
+        Profile dicts with id and timezone.
+    """
+    supabase = get_client()
+    zones = get_timezones_at_local_hour(target_hour)
+
+    # Missing or unknown timezones fall back to UTC, so only while UTC is
+    # at target_hour do all profiles need checking in Python; otherwise
+    # fetch just the profiles in matching timezones
+    filter_locally = "UTC" in zones
+
+    def profiles_query() -> RangeableQuery:
+        query = supabase.table("profiles").select("id, timezone")
+        for column, value in (filters or {}).items():
+            query = query.eq(column, value)
+        query = query.order("id")
+        return query if filter_locally else query.in_("timezone", zones)
+
+    profiles: list[dict[str, Any]] = []
+    at_hour: dict[str, bool] = {}
+    async for page in iter_pages(profiles_query):
+        if filter_locally:
+            page = filter_users_at_local_hour(page, target_hour, at_hour)
+        profiles.extend(page)
+
+    return profiles
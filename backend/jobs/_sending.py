@@ -0,0 +1,50 @@
+"""Bounded per-user notification sending shared by the jobs."""
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Notifications sent at once
+SEND_CONCURRENCY = 32
+
+
+async def send_to_users(
+    job: str,
+    users: list[dict[str, Any]],
+    send: Callable[[str], Awaitable[bool | None]],
+    concurrency: int = SEND_CONCURRENCY,
+) -> tuple[int, int]:
+    """Run a job's per-user send for every user, a bounded number at once.
+
+    Args:
+        job: Job name, for error logs.
+        users: Profile dicts with an "id".
+        send: Handles one user ID; returns True if sent, False if the
+            send failed, or None if the user was skipped. Exceptions are
+            logged and counted as failures so other users still get theirs.
+        concurrency: Maximum sends in flight.
+
+    Returns:
+        Tuple of (sent count, failed count).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send_one(user_id: str) -> bool | None:
+        try:
+            async with semaphore:
+                return await send(user_id)
+        except Exception as e:
+            logger.error(
+                "Error processing user",
+                job=job,
+                user_id=user_id,
+                error=str(e),
+            )
+            return False
+
+    # Send concurrently, bounded so the gateway isn't flooded
+    results = await asyncio.gather(*(send_one(user["id"]) for user in users))
+    return results.count(True), results.count(False)
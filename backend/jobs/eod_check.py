@@ -12,26 +12,32 @@ Cron (Railway):
 """
 
 import asyncio
-import sys
-from datetime import date, datetime
-from pathlib import Path
-
-# Add project root to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from app.clients.supabase import get_client
+from collections import defaultdict
+from datetime import date, datetime, UTC
+from operator import itemgetter
+from typing import Any, cast
+
+from app.clients.supabase import (
+    execute_async,
+    get_client,
+    iter_pages,
+)
 from app.logging_config import configure_logging, get_logger
-from app.utils.timezone import is_users_local_hour
 from app.services.notifications.base import (
     NotificationPayload,
     NotificationType,
 )
-from app.services.notifications.gateway import get_notification_gateway
+from app.services.notifications.gateway import (
+    NotificationGateway,
+    get_notification_gateway,
+)
 from app.services.notifications.content.eod import (
     EODSummaryContent,
     EODSummaryData,
     CompletedTask,
 )
+from jobs._profiles import get_profiles_at_local_hour
+from jobs._sending import send_to_users
 
 # Configure logging for job
 configure_logging()
@@ -43,8 +49,14 @@ EOD_HOUR = 21
 # Avoidance weight threshold for "high avoidance wins"
 HIGH_AVOIDANCE_THRESHOLD = 4
 
+# Users per bulk actions query
+USER_BATCH_SIZE = 200
 
-async def get_users_at_eod_hour() -> list[dict]:
+# Stateless content formatter shared by every notification
+_FORMATTER = EODSummaryContent()
+
+
+async def get_users_at_eod_hour() -> list[dict[str, Any]]:
     """Get users whose local time is currently EOD hour.
 
     Also checks that notifications are enabled for the user.
@@ -52,36 +64,30 @@ async def get_users_at_eod_hour() -> list[dict]:
     Returns:
         List of user profile dicts for users at EOD hour.
     """
-    supabase = get_client()
+    return await get_profiles_at_local_hour(EOD_HOUR, {"notification_enabled": True})
 
-    # Fetch all profiles with notifications enabled
-    result = supabase.table("profiles").select(
-        "id, timezone, notification_enabled"
-    ).eq(
-        "notification_enabled", True
-    ).execute()
 
-    if not result.data:
-        return []
-
-    # Filter to users at EOD hour
-    matching_users = [
-        user for user in result.data
-        if is_users_local_hour(user.get("timezone", "UTC"), EOD_HOUR)
+def _batches(user_ids: list[str]) -> list[list[str]]:
+    """Split user IDs into chunks that keep the in_() filter URL short."""
+    return [
+        user_ids[i:i + USER_BATCH_SIZE]
+        for i in range(0, len(user_ids), USER_BATCH_SIZE)
     ]
 
-    return matching_users
-
 
-async def get_user_completed_tasks(user_id: str, completed_date: date) -> list[dict]:
-    """Get user's completed tasks for a specific date.
+async def get_completed_tasks_by_user(
+    user_ids: list[str],
+    completed_date: date,
+) -> dict[str, list[dict[str, Any]]]:
+    """Get completed tasks for a specific date, for many users at once.
 
     Args:
-        user_id: UUID of user.
+        user_ids: UUIDs of users.
         completed_date: Date to fetch completed tasks for.
 
     Returns:
-        List of completed action dicts.
+        Completed action dicts keyed by user ID (oldest first). Users with
+        no completed tasks are absent.
     """
     supabase = get_client()
 
@@ -90,56 +96,74 @@ async def get_user_completed_tasks(user_id: str, completed_date: date) -> list[d
     start_of_day = datetime.combine(completed_date, datetime.min.time()).isoformat()
     end_of_day = datetime.combine(completed_date, datetime.max.time()).isoformat()
 
-    result = supabase.table("actions").select(
-        "id, title, avoidance_weight, updated_at"
-    ).eq(
-        "user_id", user_id
-    ).eq(
-        "status", "completed"
-    ).gte(
-        "updated_at", start_of_day
-    ).lte(
-        "updated_at", end_of_day
-    ).order(
-        "updated_at"
-    ).execute()
-
-    return result.data if result.data else []
-
-
-async def get_user_remaining_tasks(user_id: str, plan_date: date) -> int:
-    """Get count of remaining (not completed) tasks for today.
+    by_user: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for batch in _batches(user_ids):
+        async for page in iter_pages(
+            lambda: supabase.table("actions").select(
+                "id, user_id, title, avoidance_weight, updated_at"
+            ).in_(
+                "user_id", batch
+            ).eq(
+                "status", "done"
+            ).gte(
+                "updated_at", start_of_day
+            ).lte(
+                "updated_at", end_of_day
+            ).order(
+                "id"
+            )
+        ):
+            for task in page:
+                by_user[task["user_id"]].append(task)
+
+    # Order each user's (small) list here rather than sorting the whole
+    # batch server-side; ISO timestamps from Postgres sort as strings
+    for tasks in by_user.values():
+        tasks.sort(key=itemgetter("updated_at"))
+
+    return by_user
+
+
+async def get_remaining_counts_by_user(
+    user_ids: list[str],
+    plan_date: date,
+) -> dict[str, int]:
+    """Get counts of remaining (not completed) tasks for today, per user.
 
     Args:
-        user_id: UUID of user.
+        user_ids: UUIDs of users.
         plan_date: Date to check.
 
     Returns:
-        Count of remaining tasks.
+        Remaining task counts keyed by user ID. Users with none are absent.
     """
     supabase = get_client()
 
-    result = supabase.table("actions").select(
-        "id", count="exact"
-    ).eq(
-        "user_id", user_id
-    ).eq(
-        "planned_date", plan_date.isoformat()
-    ).in_(
-        "status", ["planned", "active"]
-    ).execute()
+    counts: dict[str, int] = {}
+    for batch in _batches(user_ids):
+        result = await execute_async(
+            supabase.rpc(
+                "remaining_counts_many",
+                {"p_users": batch, "p_plan_date": plan_date.isoformat()},
+            )
+        )
+
+        for row in cast(list[dict[str, Any]], result.data or []):
+            counts[row["user_id"]] = row["remaining_count"]
 
-    return result.count if result.count else 0
+    return counts
 
 
 async def send_eod_notification(
+    gateway: NotificationGateway,
     user_id: str,
-    completed_tasks: list[dict],
+    completed_tasks: list[dict[str, Any]],
     remaining_count: int,
 ) -> bool:
     """Send EOD summary notification to user.
 
     Args:
+        gateway: Notification gateway shared by the run.
         user_id: UUID of user.
         completed_tasks: List of completed tasks.
         remaining_count: Number of remaining tasks.
@@ -147,21 +171,17 @@ async def send_eod_notification(
     Returns:
         True if notification sent successfully.
     """
-    # Build completed task list
-    completed = [
-        CompletedTask(
-            title=task.get("title", "Untitled"),
-            avoidance_weight=task.get("avoidance_weight", 1),
+    # Build completed task list and pick out high-avoidance wins
+    completed: list[CompletedTask] = []
+    high_avoidance_wins: list[str] = []
+    for task in completed_tasks:
+        title = task.get("title", "Untitled")
+        avoidance_weight = task.get("avoidance_weight", 1)
+        completed.append(
+            CompletedTask(title=title, avoidance_weight=avoidance_weight)
         )
-        for task in completed_tasks
-    ]
-
-    # Identify high-avoidance wins
-    high_avoidance_wins = [
-        task.get("title", "Untitled")
-        for task in completed_tasks
-        if task.get("avoidance_weight", 1) >= HIGH_AVOIDANCE_THRESHOLD
-    ]
+        if avoidance_weight >= HIGH_AVOIDANCE_THRESHOLD:
+            high_avoidance_wins.append(title)
 
     summary_data = EODSummaryData(
         date=date.today(),
@@ -172,20 +192,18 @@ async def send_eod_notification(
     )
 
     # Format content
-    formatter = EODSummaryContent()
-    subject, _html_body = formatter.format_email(summary_data)
+    subject, _html_body = _FORMATTER.format_email(summary_data)
 
     # Create payload
     payload = NotificationPayload(
         user_id=user_id,
         notification_type=NotificationType.EOD_SUMMARY,
         subject=subject,
-        body=formatter.format_telegram(summary_data),
-        data=formatter.to_payload_data(summary_data),
+        body=_FORMATTER.format_telegram(summary_data),
+        data=_FORMATTER.to_payload_data(summary_data),
     )
 
     # Send via gateway
-    gateway = get_notification_gateway()
     result = await gateway.send(payload)
 
     return result.success
@@ -196,7 +214,7 @@ async def run_eod_check() -> None:
     logger.info(
         "Starting EOD check job",
         target_hour=EOD_HOUR,
-        utc_time=datetime.utcnow().isoformat(),
+        utc_time=datetime.now(UTC).isoformat(),
     )
 
     try:
@@ -209,56 +227,51 @@ async def run_eod_check() -> None:
             target_hour=EOD_HOUR,
         )
 
-        sent_count = 0
-        failed_count = 0
         today = date.today()
 
-        for user in users:
-            user_id = user["id"]
-
-            try:
-                # Get completed and remaining tasks
-                completed_tasks = await get_user_completed_tasks(user_id, today)
-                remaining_count = await get_user_remaining_tasks(user_id, today)
-
-                # Skip if no activity today (nothing completed, nothing planned)
-                if not completed_tasks and remaining_count == 0:
-                    logger.debug(
-                        "Skipping user with no activity",
-                        user_id=user_id,
-                    )
-                    continue
-
-                # Send notification
-                success = await send_eod_notification(
-                    user_id,
-                    completed_tasks,
-                    remaining_count,
-                )
+        # Completed and remaining tasks for every user, one query each
+        user_ids = [user["id"] for user in users]
+        completed_by_user = await get_completed_tasks_by_user(user_ids, today)
+        remaining_by_user = await get_remaining_counts_by_user(user_ids, today)
+
+        gateway = get_notification_gateway()
 
-                if success:
-                    sent_count += 1
-                    logger.info(
-                        "Sent EOD notification",
-                        user_id=user_id,
-                        completed_count=len(completed_tasks),
-                        remaining_count=remaining_count,
-                    )
-                else:
-                    failed_count += 1
-                    logger.warning(
-                        "Failed to send EOD notification",
-                        user_id=user_id,
-                    )
-
-            except Exception as e:
-                failed_count += 1
-                logger.error(
-                    "Error processing user for EOD check",
+        async def process_user(user_id: str) -> bool | None:
+            """Send one user's summary; None if skipped."""
+            completed_tasks = completed_by_user.get(user_id, [])
+            remaining_count = remaining_by_user.get(user_id, 0)
+
+            # Skip if no activity today (nothing completed, nothing planned)
+            if not completed_tasks and remaining_count == 0:
+                logger.debug(
+                    "Skipping user with no activity",
+                    user_id=user_id,
+                )
+                return None
+
+            # Send notification
+            success = await send_eod_notification(
+                gateway,
+                user_id,
+                completed_tasks,
+                remaining_count,
+            )
+
+            if success:
+                logger.info(
+                    "Sent EOD notification",
                     user_id=user_id,
-                    error=str(e),
+                    completed_count=len(completed_tasks),
+                    remaining_count=remaining_count,
                 )
-                # Continue with other users
+            else:
+                logger.warning(
+                    "Failed to send EOD notification",
+                    user_id=user_id,
+                )
+            return success
+
+        sent_count, failed_count = await send_to_users("eod_check", users, process_user)
 
         logger.info(
             "EOD check job complete",
@@ -13,20 +13,20 @@ Cron (Railway):
 """
 
 import asyncio
-import sys
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
+from typing import Any
 
-# Add project root to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from app.clients.supabase import get_client
+from app.clients.supabase import get_client, iter_pages
 from app.logging_config import configure_logging, get_logger
 from app.services.notifications.base import (
     NotificationPayload,
     NotificationType,
 )
-from app.services.notifications.gateway import get_notification_gateway
+from app.services.notifications.gateway import (
+    NotificationGateway,
+    get_notification_gateway,
+)
+from jobs._sending import send_to_users
 
 # Configure logging for job
 configure_logging()
@@ -44,8 +44,11 @@ NUDGE_MESSAGE = (
 
 NUDGE_SUBJECT = "Checking in"
 
+# Users per bulk activity query in the fallback path
+USER_BATCH_SIZE = 200
+
 
-async def get_inactive_users(since: datetime) -> list[dict]:
+async def get_inactive_users(since: datetime) -> list[dict[str, Any]]:
     """Get users who haven't been active since the given timestamp.
 
     Uses the get_inactive_users SQL function to find users with:
@@ -63,13 +66,20 @@ async def get_inactive_users(since: datetime) -> list[dict]:
     supabase = get_client()
 
     try:
-        # Call the RPC function
-        result = supabase.rpc(
-            "get_inactive_users",
-            {"since": since.isoformat()}
-        ).execute()
-
-        return result.data if result.data else []
+        # Call the RPC function, paged so results past the API row cap
+        # aren't silently dropped
+        users: list[dict[str, Any]] = []
+        async for page in iter_pages(
+            lambda: supabase.rpc(
+                "get_inactive_users",
+                {"since": since.isoformat()}
+            ).order(
+                "id"
+            )
+        ):
+            users.extend(page)
+
+        return users
     except Exception as e:
         # If the function doesn't exist, fall back to a direct query
         logger.warning(
@@ -79,10 +89,12 @@ async def get_inactive_users(since: datetime) -> list[dict]:
         return await get_inactive_users_fallback(since)
 
 
-async def get_inactive_users_fallback(since: datetime) -> list[dict]:
+async def get_inactive_users_fallback(since: datetime) -> list[dict[str, Any]]:
     """Fallback query if RPC function doesn't exist.
 
-    Performs direct queries to find inactive users.
+    Finds inactive users with a few bulk queries per batch of profiles
+    (recent actions, conversations, recent messages) rather than
+    per-profile lookups.
 
     Args:
         since: Timestamp to check activity from.
@@ -93,66 +105,89 @@ async def get_inactive_users_fallback(since: datetime) -> list[dict]:
     supabase = get_client()
 
     # Get all profiles with notifications enabled
-    profiles_result = supabase.table("profiles").select(
-        "id, timezone, notification_enabled, telegram_chat_id"
-    ).eq(
-        "notification_enabled", True
-    ).execute()
+    profiles: list[dict[str, Any]] = []
+    async for page in iter_pages(
+        lambda: supabase.table("profiles").select(
+            "id, timezone, telegram_chat_id"
+        ).eq(
+            "notification_enabled", True
+        ).order(
+            "id"
+        )
+    ):
+        profiles.extend(page)
 
-    if not profiles_result.data:
+    if not profiles:
         return []
 
-    inactive_users = []
     since_iso = since.isoformat()
+    user_ids = [profile["id"] for profile in profiles]
+    active: set[str] = set()
 
-    for profile in profiles_result.data:
-        user_id = profile["id"]
-
-        # Check for recent actions
-        actions_result = supabase.table("actions").select(
-            "id", count="exact"
-        ).eq(
-            "user_id", user_id
-        ).gt(
-            "updated_at", since_iso
-        ).limit(1).execute()
-
-        if actions_result.count and actions_result.count > 0:
-            continue  # User has recent activity
+    for i in range(0, len(user_ids), USER_BATCH_SIZE):
+        batch = user_ids[i:i + USER_BATCH_SIZE]
 
-        # Check for recent messages
-        # First get user's conversations
-        convos_result = supabase.table("conversations").select(
-            "id"
-        ).eq(
-            "user_id", user_id
-        ).execute()
-
-        if convos_result.data:
-            convo_ids = [c["id"] for c in convos_result.data]
-            messages_result = supabase.table("messages").select(
-                "id", count="exact"
+        # Users with recent actions
+        async for page in iter_pages(
+            lambda: supabase.table("actions").select(
+                "user_id"
+            ).in_(
+                "user_id", batch
+            ).gt(
+                "updated_at", since_iso
+            ).order(
+                "id"
+            )
+        ):
+            active.update(row["user_id"] for row in page)
+
+        # Users with recent messages, via their conversations
+        remaining = [user_id for user_id in batch if user_id not in active]
+        if not remaining:
+            continue
+
+        convo_owners: dict[str, str] = {}
+        async for page in iter_pages(
+            lambda: supabase.table("conversations").select(
+                "id, user_id"
+            ).in_(
+                "user_id", remaining
+            ).order(
+                "id"
+            )
+        ):
+            convo_owners.update((c["id"], c["user_id"]) for c in page)
+
+        if not convo_owners:
+            continue
+
+        convo_ids = list(convo_owners)
+        async for page in iter_pages(
+            lambda: supabase.table("messages").select(
+                "conversation_id"
             ).in_(
                 "conversation_id", convo_ids
             ).eq(
                 "role", "user"
             ).gt(
                 "created_at", since_iso
-            ).limit(1).execute()
-
-            if messages_result.count and messages_result.count > 0:
-                continue  # User has recent activity
-
-        # User is inactive
-        inactive_users.append(profile)
+            ).order(
+                "id"
+            )
+        ):
+            active.update(convo_owners[row["conversation_id"]] for row in page)
 
-    return inactive_users
+    return [
+        profile for profile in profiles
+        if profile["id"] not in active
+    ]
 
 
-async def send_nudge_notification(user_id: str) -> bool:
+async def send_nudge_notification(gateway: NotificationGateway, user_id: str) -> bool:
     """Send gentle check-in notification to user.
 
     Args:
+        gateway: Notification gateway shared by the run.
         user_id: UUID of user.
 
     Returns:
@@ -166,7 +201,6 @@ async def send_nudge_notification(user_id: str) -> bool:
         data={"type": "idle_nudge"},
     )
 
-    gateway = get_notification_gateway()
     result = await gateway.send(payload)
 
     return result.success
@@ -193,36 +227,25 @@ async def run_idle_nudge() -> None:
             inactivity_threshold=since.isoformat(),
         )
 
-        sent_count = 0
-        failed_count = 0
-
-        for user in users:
-            user_id = user["id"]
-
-            try:
-                success = await send_nudge_notification(user_id)
-
-                if success:
-                    sent_count += 1
-                    logger.info(
-                        "Sent idle nudge",
-                        user_id=user_id,
-                    )
-                else:
-                    failed_count += 1
-                    logger.warning(
-                        "Failed to send idle nudge",
-                        user_id=user_id,
-                    )
-
-            except Exception as e:
-                failed_count += 1
-                logger.error(
-                    "Error sending idle nudge",
+        gateway = get_notification_gateway()
+
+        async def process_user(user_id: str) -> bool:
+            """Send one user's check-in."""
+            success = await send_nudge_notification(gateway, user_id)
+
+            if success:
+                logger.info(
+                    "Sent idle nudge",
                     user_id=user_id,
-                    error=str(e),
                 )
-                # Continue with other users
+            else:
+                logger.warning(
+                    "Failed to send idle nudge",
+                    user_id=user_id,
+                )
+            return success
+
+        sent_count, failed_count = await send_to_users("idle_nudge", users, process_user)
 
         logger.info(
             "Idle nudge job complete",
@@ -12,26 +12,25 @@ Cron (Railway):
 """
 
 import asyncio
-import sys
-from datetime import date, datetime
-from pathlib import Path
+from datetime import date, datetime, UTC
 
-# Add project root to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from app.clients.supabase import get_client
+from app.clients.supabase import execute_async, get_client
 from app.logging_config import configure_logging, get_logger
-from app.utils.timezone import is_users_local_hour
 from app.services.notifications.base import (
     NotificationPayload,
     NotificationType,
 )
-from app.services.notifications.gateway import get_notification_gateway
+from app.services.notifications.gateway import (
+    NotificationGateway,
+    get_notification_gateway,
+)
 from app.services.notifications.content.morning import (
     MorningPlanContent,
     MorningPlanData,
     PlanTask,
 )
+from jobs._profiles import get_profiles_at_local_hour
+from jobs._sending import send_to_users
 
 # Configure logging for job
 configure_logging()
@@ -40,6 +39,9 @@ logger = get_logger(__name__)
 # Target hour for morning notifications (8am local time)
 MORNING_HOUR = 8
 
+# Stateless content formatter shared by every notification
+_FORMATTER = MorningPlanContent()
+
 
 async def get_users_at_morning_hour() -> list[dict]:
     """Get users whose local time is currently morning hour.
@@ -49,25 +51,7 @@ async def get_users_at_morning_hour() -> list[dict]:
     Returns:
         List of user profile dicts for users at morning hour.
     """
-    supabase = get_client()
-
-    # Fetch all profiles with notifications enabled
-    result = supabase.table("profiles").select(
-        "id, timezone, notification_enabled"
-    ).eq(
-        "notification_enabled", True
-    ).execute()
-
-    if not result.data:
-        return []
-
-    # Filter to users at morning hour
-    matching_users = [
-        user for user in result.data
-        if is_users_local_hour(user.get("timezone", "UTC"), MORNING_HOUR)
-    ]
-
-    return matching_users
+    return await get_profiles_at_local_hour(MORNING_HOUR, {"notification_enabled": True})
 
 
 async def get_user_planned_tasks(user_id: str, plan_date: date) -> list[dict]:
@@ -82,25 +66,32 @@ async def get_user_planned_tasks(user_id: str, plan_date: date) -> list[dict]:
     """
     supabase = get_client()
 
-    result = supabase.table("actions").select(
-        "id, title, estimated_minutes, avoidance_weight"
-    ).eq(
-        "user_id", user_id
-    ).eq(
-        "planned_date", plan_date.isoformat()
-    ).in_(
-        "status", ["planned", "active"]
-    ).order(
-        "created_at"
-    ).execute()
+    result = await execute_async(
+        supabase.table("actions").select(
+            "id, title, estimated_minutes, avoidance_weight"
+        ).eq(
+            "user_id", user_id
+        ).eq(
+            "planned_date", plan_date.isoformat()
+        ).in_(
+            "status", ["planned", "active"]
+        ).order(
+            "created_at"
+        )
+    )
 
     return result.data if result.data else []
 
 
-async def send_morning_notification(user_id: str, tasks: list[dict]) -> bool:
+async def send_morning_notification(
+    gateway: NotificationGateway,
+    user_id: str,
+    tasks: list[dict],
+) -> bool:
     """Send morning plan notification to user.
 
     Args:
+        gateway: Notification gateway shared by the run.
         user_id: UUID of user.
         tasks: List of planned tasks.
 
@@ -126,20 +117,18 @@ async def send_morning_notification(user_id: str, tasks: list[dict]) -> bool:
     )
 
     # Format content
-    formatter = MorningPlanContent()
-    subject, _html_body = formatter.format_email(plan_data)
+    subject, _html_body = _FORMATTER.format_email(plan_data)
 
     # Create payload
     payload = NotificationPayload(
         user_id=user_id,
         notification_type=NotificationType.MORNING_PLAN,
         subject=subject,
-        body=formatter.format_telegram(plan_data),
-        data=formatter.to_payload_data(plan_data),
+        body=_FORMATTER.format_telegram(plan_data),
+        data=_FORMATTER.to_payload_data(plan_data),
     )
 
     # Send via gateway
-    gateway = get_notification_gateway()
     result = await gateway.send(payload)
 
     return result.success
@@ -150,7 +139,7 @@ async def run_morning_check() -> None:
     logger.info(
         "Starting morning check job",
         target_hour=MORNING_HOUR,
-        utc_time=datetime.utcnow().isoformat(),
+        utc_time=datetime.now(UTC).isoformat(),
     )
 
     try:
@@ -163,42 +152,32 @@ async def run_morning_check() -> None:
             target_hour=MORNING_HOUR,
         )
 
-        sent_count = 0
-        failed_count = 0
         today = date.today()
 
-        for user in users:
-            user_id = user["id"]
-
-            try:
-                # Get planned tasks
-                tasks = await get_user_planned_tasks(user_id, today)
-
-                # Send notification
-                success = await send_morning_notification(user_id, tasks)
-
-                if success:
-                    sent_count += 1
-                    logger.info(
-                        "Sent morning notification",
-                        user_id=user_id,
-                        task_count=len(tasks),
-                    )
-                else:
-                    failed_count += 1
-                    logger.warning(
-                        "Failed to send morning notification",
-                        user_id=user_id,
-                    )
-
-            except Exception as e:
-                failed_count += 1
-                logger.error(
-                    "Error processing user for morning check",
+        gateway = get_notification_gateway()
+
+        async def process_user(user_id: str) -> bool:
+            """Send one user's morning plan."""
+            # Get planned tasks
+            tasks = await get_user_planned_tasks(user_id, today)
+
+            # Send notification
+            success = await send_morning_notification(gateway, user_id, tasks)
+
+            if success:
+                logger.info(
+                    "Sent morning notification",
+                    user_id=user_id,
+                    task_count=len(tasks),
+                )
+            else:
+                logger.warning(
+                    "Failed to send morning notification",
                     user_id=user_id,
-                    error=str(e),
                 )
-                # Continue with other users
+            return success
+
+        sent_count, failed_count = await send_to_users("morning_check", users, process_user)
 
         logger.info(
             "Morning check job complete",
@@ -13,16 +13,13 @@ Cron (Railway):
 """
 
 import asyncio
-import sys
-from datetime import datetime
-from pathlib import Path
+from datetime import datetime, UTC
+from itertools import islice
+from typing import Any, cast
 
-# Add project root to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from app.clients.supabase import get_client
+from app.clients.supabase import execute_async, get_client
 from app.logging_config import configure_logging, get_logger
-from app.utils.timezone import is_users_local_hour
+from jobs._profiles import get_profiles_at_local_hour
 
 # Configure logging for job
 configure_logging()
@@ -31,8 +28,17 @@ logger = get_logger(__name__)
 # Target hour for state transitions (4am local time)
 TRANSITION_HOUR = 4
 
+# Users per bulk update (keeps the in_() filter URL short)
+USER_BATCH_SIZE = 200
+
+# Bulk updates in flight at once
+UPDATE_CONCURRENCY = 4
+
+# Most per-user roll counts included in the summary log event
+ROLLED_LOG_LIMIT = 500
+
 
-async def get_users_at_local_hour(target_hour: int) -> list[dict[str, str]]:
+async def get_users_at_local_hour(target_hour: int) -> list[dict[str, Any]]:
     """Get users whose local time is currently at target_hour.
 
     Args:
@@ -41,49 +47,57 @@ async def get_users_at_local_hour(target_hour: int) -> list[dict[str, str]]:
     Returns:
         List of user profile dicts for users at target hour
     """
-    supabase = get_client()
-
-    # Fetch all profiles with their timezones
-    result = supabase.table("profiles").select("id, timezone").execute()
-
-    if not result.data:
-        return []
-
-    # Filter to users at target hour
-    matching_users = [
-        user for user in result.data
-        if is_users_local_hour(user.get("timezone", "UTC"), target_hour)
-    ]
-
-    return matching_users
+    return await get_profiles_at_local_hour(target_hour)
 
 
-async def roll_user_actions(user_id: str) -> int:
-    """Roll over user's unfinished actions from previous day.
+async def roll_actions_for_users(user_ids: list[str]) -> dict[str, int]:
+    """Roll over unfinished actions from the previous day for many users.
 
     Transitions actions with status 'planned' or 'active' to 'rolled'
-    and clears their planned_date.
+    and clears their planned_date, with one roll_actions_many call per
+    batch of users (batches run concurrently). A failed batch is logged and skipped so
+    other users still roll.
 
     Args:
-        user_id: UUID of user
+        user_ids: UUIDs of users
 
     Returns:
-        Number of actions rolled
+        Number of actions rolled, keyed by user ID. Users with none
+        rolled are absent.
     """
     supabase = get_client()
+    semaphore = asyncio.Semaphore(UPDATE_CONCURRENCY)
+
+    async def roll_batch(batch: list[str]) -> list[dict[str, Any]]:
+        """Roll one batch of users; empty if the update failed."""
+        try:
+            async with semaphore:
+                # Update planned/active actions to rolled
+                result = await execute_async(
+                    supabase.rpc("roll_actions_many", {"p_users": batch})
+                )
+        except Exception as e:
+            logger.error(
+                "Failed to roll actions for users",
+                user_count=len(batch),
+                error=str(e),
+            )
+            return []
+
+        return cast(list[dict[str, Any]], result.data or [])
+
+    batches = [
+        user_ids[i:i + USER_BATCH_SIZE]
+        for i in range(0, len(user_ids), USER_BATCH_SIZE)
+    ]
+    results = await asyncio.gather(*(roll_batch(batch) for batch in batches))
 
-    # Update planned/active actions to rolled
-    result = supabase.table("actions").update({
-        "status": "rolled",
-        "planned_date": None,
-        "updated_at": datetime.utcnow().isoformat(),
-    }).eq(
-        "user_id", user_id
-    ).in_(
-        "status", ["planned", "active"]
-    ).execute()
+    rolled: dict[str, int] = {}
+    for rows in results:
+        for row in rows:
+            rolled[row["user_id"]] = row["rolled_count"]
 
-    return len(result.data) if result.data else 0
+    return rolled
 
 
 async def run_state_transitions() -> None:
@@ -91,7 +105,7 @@ async def run_state_transitions() -> None:
     logger.info(
         "Starting state transitions job",
         target_hour=TRANSITION_HOUR,
-        utc_time=datetime.utcnow().isoformat(),
+        utc_time=datetime.now(UTC).isoformat(),
     )
 
     try:
@@ -104,34 +118,20 @@ async def run_state_transitions() -> None:
             target_hour=TRANSITION_HOUR,
         )
 
-        total_rolled = 0
+        rolled = await roll_actions_for_users([user["id"] for user in users])
 
-        for user in users:
-            user_id = user["id"]
-
-            try:
-                rolled_count = await roll_user_actions(user_id)
-                total_rolled += rolled_count
-
-                if rolled_count > 0:
-                    logger.info(
-                        "Rolled user actions",
-                        user_id=user_id,
-                        rolled_count=rolled_count,
-                    )
-
-            except Exception as e:
-                logger.error(
-                    "Failed to roll actions for user",
-                    user_id=user_id,
-                    error=str(e),
-                )
-                # Continue with other users
+        # One event for the run instead of a log line per user
+        if rolled:
+            logger.info(
+                "Rolled user actions",
+                user_count=len(rolled),
+                rolled_by_user=dict(islice(rolled.items(), ROLLED_LOG_LIMIT)),
+            )
 
         logger.info(
             "State transitions job complete",
             users_processed=len(users),
-            total_actions_rolled=total_rolled,
+            total_actions_rolled=sum(rolled.values()),
         )
 
     except Exception as e:
@@ -0,0 +1,25 @@
+-- Telegram /status aggregation
+-- Returns today's progress and inbox size for a user in a single round trip
+
+CREATE OR REPLACE FUNCTION get_user_daily_status(p_user UUID, p_date DATE)
+RETURNS TABLE (
+  planned INT,
+  completed INT,
+  minutes_spent INT,
+  inbox_count INT
+) AS $$
+  SELECT
+    COUNT(*) FILTER (WHERE a.planned_date = p_date)::INT AS planned,
+    COUNT(*) FILTER (WHERE a.planned_date = p_date AND a.status = 'done')::INT AS completed,
+    COALESCE(
+      SUM(a.actual_minutes) FILTER (WHERE a.planned_date = p_date AND a.status = 'done'),
+      0
+    )::INT AS minutes_spent,
+    COUNT(*) FILTER (WHERE a.status = 'inbox')::INT AS inbox_count
+  FROM actions a
+  WHERE a.user_id = p_user
+    AND (a.planned_date = p_date OR a.status = 'inbox')
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION get_user_daily_status(UUID, DATE) IS
+  'Aggregated daily progress (planned, completed, minutes spent) plus inbox count for a user. Used by the Telegram /status command.';
@@ -0,0 +1,23 @@
+-- Telegram /today lookup
+-- Resolves the chat's user and fetches today's plan in a single round trip
+
+-- Returns no rows when the chat isn't linked to a profile, and a single
+-- all-NULL row when the user is linked but has nothing planned.
+CREATE OR REPLACE FUNCTION get_todays_actions_by_chat_id(p_chat_id TEXT, p_date DATE)
+RETURNS TABLE (
+  id UUID,
+  title TEXT,
+  status action_status,
+  estimated_minutes INT
+) AS $$
+  SELECT a.id, a.title, a.status, a.estimated_minutes
+  FROM profiles p
+  LEFT JOIN actions a
+    ON a.user_id = p.id
+   AND a.planned_date = p_date
+  WHERE p.telegram_chat_id = p_chat_id
+  ORDER BY a.position
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION get_todays_actions_by_chat_id(TEXT, DATE) IS
+  'Today''s planned actions for the profile linked to a Telegram chat. No rows means the chat is not connected; a single NULL row means nothing is planned. Used by the Telegram /today command.';
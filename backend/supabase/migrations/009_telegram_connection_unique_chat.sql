@@ -0,0 +1,12 @@
+-- One pending connection token per Telegram chat
+-- Lets create_token replace a chat's token with a single UPSERT
+
+-- Keep only the newest pending token per chat before adding the constraint
+-- (ties on created_at are broken by the unique token, so exactly one survives)
+DELETE FROM pending_telegram_connections p
+USING pending_telegram_connections newer
+WHERE p.telegram_chat_id = newer.telegram_chat_id
+  AND (p.created_at, p.token) < (newer.created_at, newer.token);
+
+CREATE UNIQUE INDEX idx_telegram_connections_chat_id
+  ON pending_telegram_connections(telegram_chat_id);
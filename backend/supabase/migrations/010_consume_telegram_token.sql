@@ -0,0 +1,14 @@
+-- Atomic single-use Telegram connection tokens
+-- Validates and consumes a token in one statement, so concurrent link
+-- attempts can't both succeed and expiry is checked at delete time
+
+CREATE OR REPLACE FUNCTION consume_telegram_token(p_token TEXT)
+RETURNS TEXT AS $$
+  DELETE FROM pending_telegram_connections
+  WHERE token = p_token
+    AND expires_at > NOW()
+  RETURNING telegram_chat_id
+$$ LANGUAGE sql VOLATILE;
+
+COMMENT ON FUNCTION consume_telegram_token(TEXT) IS
+  'Deletes an unexpired connection token and returns its Telegram chat ID, or NULL if the token is missing or expired. Used when linking a Telegram account.';
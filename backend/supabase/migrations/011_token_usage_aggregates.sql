@@ -0,0 +1,41 @@
+-- Token budget aggregation
+-- Sums token usage in Postgres so budget checks return one value instead
+-- of every usage row since midnight
+
+-- Covering index: the aggregates below are answered from the index alone
+CREATE INDEX idx_token_usage_user_date_covering
+  ON token_usage(user_id, created_at)
+  INCLUDE (input_tokens, output_tokens, endpoint);
+
+DROP INDEX IF EXISTS idx_token_usage_user_date;
+
+-- Total tokens (input + output) used by a user since UTC midnight
+CREATE OR REPLACE FUNCTION token_usage_today(p_user UUID)
+RETURNS BIGINT AS $$
+  SELECT COALESCE(SUM(input_tokens + output_tokens), 0)::BIGINT
+  FROM token_usage
+  WHERE user_id = p_user
+    AND created_at >= date_trunc('day', NOW() AT TIME ZONE 'utc') AT TIME ZONE 'utc'
+$$ LANGUAGE sql STABLE;
+
+-- Per-endpoint token totals and request counts since a timestamp
+CREATE OR REPLACE FUNCTION token_usage_by_endpoint(p_user UUID, p_since TIMESTAMPTZ)
+RETURNS TABLE (
+  endpoint TEXT,
+  total_tokens BIGINT,
+  requests BIGINT
+) AS $$
+  SELECT
+    COALESCE(t.endpoint, 'unknown') AS endpoint,
+    SUM(t.input_tokens + t.output_tokens)::BIGINT AS total_tokens,
+    COUNT(*)::BIGINT AS requests
+  FROM token_usage t
+  WHERE t.user_id = p_user
+    AND t.created_at >= p_since
+  GROUP BY COALESCE(t.endpoint, 'unknown')
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION token_usage_today(UUID) IS
+  'Total input + output tokens used by a user since midnight UTC. Used by TokenBudgetService budget checks.';
+COMMENT ON FUNCTION token_usage_by_endpoint(UUID, TIMESTAMPTZ) IS
+  'Token totals and request counts per endpoint for a user since a timestamp. Used by TokenBudgetService usage stats.';
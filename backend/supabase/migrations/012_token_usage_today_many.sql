@@ -0,0 +1,22 @@
+-- Batched budget lookups
+-- Returns today's token totals for several users in one call so
+-- concurrent budget checks can share a single round trip
+
+-- Total tokens (input + output) used since UTC midnight, per user.
+-- Users with no usage today are omitted.
+CREATE OR REPLACE FUNCTION token_usage_today_many(p_users UUID[])
+RETURNS TABLE (
+  user_id UUID,
+  total_tokens BIGINT
+) AS $$
+  SELECT
+    t.user_id,
+    SUM(t.input_tokens + t.output_tokens)::BIGINT AS total_tokens
+  FROM token_usage t
+  WHERE t.user_id = ANY(p_users)
+    AND t.created_at >= date_trunc('day', NOW() AT TIME ZONE 'utc') AT TIME ZONE 'utc'
+  GROUP BY t.user_id
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION token_usage_today_many(UUID[]) IS
+  'Total input + output tokens used since midnight UTC for each of several users. Used by TokenBudgetService batched budget checks.';
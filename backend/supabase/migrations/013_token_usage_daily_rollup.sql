@@ -0,0 +1,87 @@
+-- Daily token usage rollup
+-- Usage stats read per-day totals for completed days instead of scanning
+-- every usage row in the window; only rows newer than the last refresh
+-- are read from token_usage directly
+
+-- One row per user, UTC day and endpoint for completed days only, so a
+-- refreshed day never changes afterwards
+CREATE MATERIALIZED VIEW token_usage_daily AS
+  SELECT
+    user_id,
+    date_trunc('day', created_at AT TIME ZONE 'utc') AT TIME ZONE 'utc' AS day,
+    COALESCE(endpoint, 'unknown') AS endpoint,
+    SUM(input_tokens + output_tokens)::BIGINT AS tokens,
+    COUNT(*)::BIGINT AS requests
+  FROM token_usage
+  WHERE created_at < date_trunc('day', NOW() AT TIME ZONE 'utc') AT TIME ZONE 'utc'
+  GROUP BY 1, 2, 3;
+
+-- Required for REFRESH ... CONCURRENTLY; also serves per-user lookups
+CREATE UNIQUE INDEX idx_token_usage_daily_user_day_endpoint
+  ON token_usage_daily(user_id, day, endpoint);
+
+-- Finds the refresh watermark (latest rolled-up day)
+CREATE INDEX idx_token_usage_daily_day ON token_usage_daily(day);
+
+-- Materialized views bypass RLS; only the service role reads this
+REVOKE ALL ON token_usage_daily FROM anon, authenticated;
+
+-- Refresh hourly without blocking readers
+CREATE EXTENSION IF NOT EXISTS pg_cron;
+
+SELECT cron.schedule(
+  'refresh-token-usage-daily',
+  '5 * * * *',
+  $$REFRESH MATERIALIZED VIEW CONCURRENTLY token_usage_daily$$
+);
+
+-- Per-endpoint token totals and request counts since a timestamp.
+-- Full days between p_since and the last refresh come from the rollup;
+-- the partial first day and everything after the rollup come from
+-- token_usage (answered from its covering index).
+CREATE OR REPLACE FUNCTION token_usage_by_endpoint(p_user UUID, p_since TIMESTAMPTZ)
+RETURNS TABLE (
+  endpoint TEXT,
+  total_tokens BIGINT,
+  requests BIGINT
+) AS $$
+  WITH bounds AS (
+    SELECT
+      (date_trunc('day', p_since AT TIME ZONE 'utc') AT TIME ZONE 'utc')
+        + INTERVAL '1 day' AS rollup_from,
+      COALESCE(
+        (SELECT MAX(day) FROM token_usage_daily) + INTERVAL '1 day',
+        '-infinity'::TIMESTAMPTZ
+      ) AS rollup_to
+  ),
+  combined AS (
+    SELECT d.endpoint, d.tokens, d.requests
+    FROM token_usage_daily d, bounds b
+    WHERE d.user_id = p_user
+      AND d.day >= b.rollup_from
+      AND d.day < b.rollup_to
+    UNION ALL
+    SELECT
+      COALESCE(t.endpoint, 'unknown'),
+      (t.input_tokens + t.output_tokens)::BIGINT,
+      1::BIGINT
+    FROM token_usage t, bounds b
+    WHERE t.user_id = p_user
+      AND t.created_at >= p_since
+      AND (
+        t.created_at < b.rollup_from
+        OR t.created_at >= GREATEST(b.rollup_to, b.rollup_from)
+      )
+  )
+  SELECT
+    c.endpoint,
+    SUM(c.tokens)::BIGINT AS total_tokens,
+    SUM(c.requests)::BIGINT AS requests
+  FROM combined c
+  GROUP BY c.endpoint
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON MATERIALIZED VIEW token_usage_daily IS
+  'Token totals and request counts per user, UTC day and endpoint for completed days. Refreshed hourly by pg_cron.';
+COMMENT ON FUNCTION token_usage_by_endpoint(UUID, TIMESTAMPTZ) IS
+  'Token totals and request counts per endpoint for a user since a timestamp, using token_usage_daily for completed days. Used by TokenBudgetService usage stats.';
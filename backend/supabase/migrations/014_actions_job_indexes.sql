@@ -0,0 +1,15 @@
+-- Partial indexes for the scheduled notification jobs
+-- The EOD and morning jobs look up a batch of users' completed tasks by
+-- updated_at range and their open tasks by planned_date; the existing
+-- (user_id, status) and (user_id, planned_date) indexes leave the range
+-- or status filter to be applied row by row
+
+-- Tasks completed within a day, per user (EOD summary)
+CREATE INDEX idx_actions_user_completed_updated
+  ON actions(user_id, updated_at DESC)
+  WHERE status = 'done';
+
+-- Open tasks planned for a date, per user (EOD remaining count, morning plan)
+CREATE INDEX idx_actions_user_open_planned
+  ON actions(user_id, planned_date, status)
+  WHERE status IN ('planned', 'active');
@@ -0,0 +1,23 @@
+-- Batched remaining-task counts
+-- Returns open task counts for several users in one call so the EOD job
+-- gets per-user totals instead of one row per open task
+
+-- Number of planned or active tasks on p_plan_date, per user.
+-- Users with no open tasks are omitted.
+CREATE OR REPLACE FUNCTION remaining_counts_many(p_users UUID[], p_plan_date DATE)
+RETURNS TABLE (
+  user_id UUID,
+  remaining_count BIGINT
+) AS $$
+  SELECT
+    a.user_id,
+    COUNT(*)::BIGINT AS remaining_count
+  FROM actions a
+  WHERE a.user_id = ANY(p_users)
+    AND a.planned_date = p_plan_date
+    AND a.status IN ('planned', 'active')
+  GROUP BY a.user_id
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION remaining_counts_many(UUID[], DATE) IS
+  'Count of planned or active tasks on a date for each of several users. Used by the EOD check job.';
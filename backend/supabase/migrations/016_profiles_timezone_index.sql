@@ -0,0 +1,4 @@
+-- Index for the scheduled jobs' timezone filter
+-- Hourly jobs select only profiles whose timezone is currently at the
+-- job's local hour (timezone IN (...)) instead of scanning every profile
+CREATE INDEX idx_profiles_timezone ON profiles(timezone);
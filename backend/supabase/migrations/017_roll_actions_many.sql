@@ -0,0 +1,31 @@
+-- Server-side daily roll-over
+-- Rolls several users' unfinished actions in one statement and returns
+-- per-user counts, so the state-transition job gets totals instead of
+-- every updated row
+
+-- Marks planned/active actions as rolled and clears planned_date
+-- (updated_at is set by the actions trigger). Users with nothing to
+-- roll are omitted.
+CREATE OR REPLACE FUNCTION roll_actions_many(p_users UUID[])
+RETURNS TABLE (
+  user_id UUID,
+  rolled_count BIGINT
+) AS $$
+  WITH rolled AS (
+    UPDATE actions a
+    SET status = 'rolled',
+        planned_date = NULL
+    WHERE a.user_id = ANY(p_users)
+      AND a.status IN ('planned', 'active')
+    RETURNING a.user_id
+  )
+  SELECT r.user_id, COUNT(*)::BIGINT AS rolled_count
+  FROM rolled r
+  GROUP BY r.user_id
+$$ LANGUAGE sql VOLATILE;
+
+-- Only the service role (scheduled jobs) may roll other users' actions
+REVOKE EXECUTE ON FUNCTION roll_actions_many(UUID[]) FROM PUBLIC, anon, authenticated;
+
+COMMENT ON FUNCTION roll_actions_many(UUID[]) IS
+  'Rolls planned and active actions for several users and returns the number rolled per user. Used by the state transitions job.';
@@ -0,0 +1,141 @@
+"""Tests for the micro-batching utility."""
+
+import asyncio
+
+import pytest
+
+from app.utils.batching import MicroBatcher
+
+
+class TestMicroBatcher:
+    """Tests for MicroBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submissions_share_one_flush(self):
+        """Items submitted within the window are flushed together, in order."""
+        batches: list[list[int]] = []
+
+        async def flush(items: list[int]) -> list[int]:
+            batches.append(items)
+            return [item * 10 for item in items]
+
+        batcher: MicroBatcher[int, int] = MicroBatcher(flush, window=0.01, max_batch=10)
+
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+
+        assert results == [0, 10, 20]
+        assert batches == [[0, 1, 2]]
+
+    @pytest.mark.asyncio
+    async def test_max_batch_splits_batches(self):
+        """A burst larger than max_batch is flushed in several batches."""
+        batches: list[list[int]] = []
+
+        async def flush(items: list[int]) -> list[None]:
+            batches.append(items)
+            return [None] * len(items)
+
+        batcher: MicroBatcher[int, None] = MicroBatcher(flush, window=0, max_batch=2)
+
+        await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+        assert batches == [[0, 1], [2, 3], [4]]
+
+    @pytest.mark.asyncio
+    async def test_size_counts_toward_max_batch(self):
+        """Item sizes count toward max_batch without overshooting it."""
+        batches: list[list[list[str]]] = []
+
+        async def flush(items: list[list[str]]) -> list[None]:
+            batches.append(items)
+            return [None] * len(items)
+
+        batcher: MicroBatcher[list[str], None] = MicroBatcher(
+            flush, window=0, max_batch=3, size=len
+        )
+
+        await asyncio.gather(
+            batcher.submit(["a", "b"]),
+            batcher.submit(["c", "d"]),
+            batcher.submit(["e"]),
+        )
+
+        assert batches == [[["a", "b"]], [["c", "d"], ["e"]]]
+
+    @pytest.mark.asyncio
+    async def test_oversized_item_is_flushed_alone(self):
+        """An item larger than max_batch still goes out, in its own batch."""
+        batches: list[list[list[str]]] = []
+
+        async def flush(items: list[list[str]]) -> list[None]:
+            batches.append(items)
+            return [None] * len(items)
+
+        batcher: MicroBatcher[list[str], None] = MicroBatcher(
+            flush, window=0, max_batch=2, size=len
+        )
+
+        await asyncio.gather(
+            batcher.submit(["a"]),
+            batcher.submit(["b", "c", "d"]),
+        )
+
+        assert batches == [[["a"]], [["b", "c", "d"]]]
+
+    @pytest.mark.asyncio
+    async def test_same_key_collapses_to_latest(self):
+        """Pending items with the same key collapse and share the result."""
+        batches: list[list[str]] = []
+
+        async def flush(items: list[str]) -> list[str]:
+            batches.append(items)
+            return [item.upper() for item in items]
+
+        batcher: MicroBatcher[str, str] = MicroBatcher(flush, window=0.01, max_batch=10)
+
+        results = await asyncio.gather(
+            batcher.submit("old", key="k"),
+            batcher.submit("other"),
+            batcher.submit("new", key="k"),
+        )
+
+        assert results == ["NEW", "OTHER", "NEW"]
+        assert batches == [["new", "other"]]
+
+    @pytest.mark.asyncio
+    async def test_flush_error_reaches_every_caller_in_batch(self):
+        """A failed flush raises for its batch; later batches still run."""
+        calls = 0
+
+        async def flush(items: list[int]) -> list[int]:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("DB error")
+            return items
+
+        batcher: MicroBatcher[int, int] = MicroBatcher(flush, window=0, max_batch=10)
+
+        results = await asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        assert await batcher.submit(3) == 3
+
+    @pytest.mark.asyncio
+    async def test_wait_idle(self):
+        """wait_idle returns once unawaited submissions are flushed."""
+        flushed: list[int] = []
+
+        async def flush(items: list[int]) -> list[None]:
+            flushed.extend(items)
+            return [None] * len(items)
+
+        batcher: MicroBatcher[int, None] = MicroBatcher(flush, window=0.01, max_batch=10)
+        batcher.submit(1)
+        batcher.submit(2)
+
+        assert await batcher.wait_idle(timeout=1.0) is True
+        assert flushed == [1, 2]
+        assert len(batcher) == 0
@@ -0,0 +1,168 @@
+"""Tests for the in-process TTL cache utility."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.utils.cache import (
+    TTLCache,
+    begin_request_cache,
+    end_request_cache,
+    request_cached,
+)
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_get_set(self):
+        """Stored values are returned until invalidated."""
+        cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+
+        cache.invalidate("a")
+        assert cache.get("a") is None
+
+    def test_expiry(self):
+        """Entries expire after their TTL."""
+        cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+        with patch("app.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("app.utils.cache.time.monotonic", return_value=159.0):
+            assert cache.get("a") == 1
+        with patch("app.utils.cache.time.monotonic", return_value=161.0):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_replace_keeps_expiry(self):
+        """replace() updates live entries without extending their TTL."""
+        cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+        assert cache.replace("a", 1) is False
+
+        with patch("app.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("app.utils.cache.time.monotonic", return_value=150.0):
+            assert cache.replace("a", 2) is True
+            assert cache.get("a") == 2
+        with patch("app.utils.cache.time.monotonic", return_value=161.0):
+            assert cache.get("a") is None
+
+    def test_lru_eviction(self):
+        """Least recently used entry is evicted when full."""
+        cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_single_flight(self):
+        """Concurrent misses for the same key trigger one load."""
+        cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+        calls = 0
+
+        async def loader() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            return 42
+
+        results = await asyncio.gather(
+            *(cache.get_or_load("k", loader) for _ in range(5))
+        )
+
+        assert results == [42] * 5
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_does_not_cache_none(self):
+        """None results are retried on the next call."""
+        cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+        calls = 0
+
+        async def loader() -> int | None:
+            nonlocal calls
+            calls += 1
+            return None
+
+        assert await cache.get_or_load("k", loader) is None
+        assert await cache.get_or_load("k", loader) is None
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_negative_ttl(self):
+        """None results are cached when none_ttl is given."""
+        cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+        calls = 0
+
+        async def loader() -> int | None:
+            nonlocal calls
+            calls += 1
+            return None
+
+        with patch("app.utils.cache.time.monotonic", return_value=100.0):
+            assert await cache.get_or_load("k", loader, none_ttl=5) is None
+            assert await cache.get_or_load("k", loader, none_ttl=5) is None
+        assert calls == 1
+
+        with patch("app.utils.cache.time.monotonic", return_value=106.0):
+            await cache.get_or_load("k", loader, none_ttl=5)
+        assert calls == 2
+
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_ttl_for(self):
+        """ttl_for picks each loaded value's TTL."""
+        cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+
+        async def loader() -> int:
+            return 7
+
+        with patch("app.utils.cache.time.monotonic", return_value=100.0):
+            await cache.get_or_load("k", loader, ttl_for=lambda value: value)
+        with patch("app.utils.cache.time.monotonic", return_value=106.0):
+            assert cache.get("k") == 7
+        with patch("app.utils.cache.time.monotonic", return_value=108.0):
+            assert cache.get("k") is None
+
+
+class TestRequestCached:
+    """Tests for the request-scoped memo."""
+
+    class _Service:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        @request_cached
+        async def load(self, key: str) -> str:
+            self.calls += 1
+            return key.upper()
+
+    @pytest.mark.asyncio
+    async def test_memoizes_within_request(self):
+        """Repeated calls in one request hit the loader once."""
+        service = self._Service()
+        token = begin_request_cache()
+        try:
+            assert await service.load("a") == "A"
+            assert await service.load("a") == "A"
+            assert await service.load("b") == "B"
+        finally:
+            end_request_cache(token)
+
+        assert service.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_passthrough_outside_request(self):
+        """Without an active request the loader runs every time."""
+        service = self._Service()
+        await service.load("a")
+        await service.load("a")
+
+        assert service.calls == 2
@@ -3,7 +3,6 @@
 Tests contract models, mapping functions, and schema validation.
 """
 
-import json
 from datetime import datetime, UTC
 from pathlib import Path
 from uuid import uuid4
@@ -373,15 +372,9 @@ class TestSchemaValidation:
         if not example_path.exists():
             pytest.skip("Example file not found")
 
-        with open(example_path) as f:
-            data = json.load(f)
-
-        # Remove non-schema fields
-        data.pop("$schema", None)
-        data.pop("_description", None)
-
-        # Parse as contract (validates structure)
-        contract = AgentOutputContract(**data)
+        # Parse as contract (validates structure); non-schema fields such
+        # as $schema and _description are ignored
+        contract = AgentOutputContract.model_validate_json(example_path.read_bytes())
         assert contract.contract_version == "0.1.0"
         assert contract.intent.type == IntentType.CAPTURE
         assert len(contract.output.captures) == 3
@@ -392,13 +385,7 @@ class TestSchemaValidation:
         if not example_path.exists():
             pytest.skip("Example file not found")
 
-        with open(example_path) as f:
-            data = json.load(f)
-
-        data.pop("$schema", None)
-        data.pop("_description", None)
-
-        contract = AgentOutputContract(**data)
+        contract = AgentOutputContract.model_validate_json(example_path.read_bytes())
         assert contract.contract_version == "0.1.0"
         assert contract.intent.type == IntentType.COACHING
         assert contract.output.coaching_message is not None
@@ -409,13 +396,7 @@ class TestSchemaValidation:
         if not example_path.exists():
             pytest.skip("Example file not found")
 
-        with open(example_path) as f:
-            data = json.load(f)
-
-        data.pop("$schema", None)
-        data.pop("_description", None)
-
-        contract = AgentOutputContract(**data)
+        contract = AgentOutputContract.model_validate_json(example_path.read_bytes())
         assert contract.contract_version == "0.1.0"
         assert contract.intent.type == IntentType.CLARIFY
         assert len(contract.output.questions) > 0
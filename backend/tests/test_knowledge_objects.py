@@ -3,6 +3,7 @@
 Tests knowledge object models, service operations, and writeback integration.
 """
 
+import asyncio
 from datetime import datetime, UTC, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
@@ -288,6 +289,53 @@ class TestKnowledgeObjectService:
         assert result is not None
         mock_client.table.return_value.upsert.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_upsert_many_single_request(self, service, mock_client):
+        """Upsert many sends all rows in one upsert, collapsing duplicate keys."""
+        mock_client.table.return_value.upsert.return_value.execute.return_value = MagicMock(
+            data=[]
+        )
+
+        objs = [
+            KnowledgeObjectCreate(
+                type=KnowledgeObjectType.INSIGHT,
+                payload={"pattern_name": name},
+                natural_key=f"insight:{name}",
+            )
+            for name in ("a", "b", "a")
+        ]
+
+        await service.upsert_many("user-123", objs)
+
+        mock_client.table.return_value.upsert.assert_called_once()
+        rows = mock_client.table.return_value.upsert.call_args.args[0]
+        assert [row["natural_key"] for row in rows] == ["insight:a", "insight:b"]
+
+    @pytest.mark.asyncio
+    async def test_upsert_many_coalesces_concurrent_calls(self, service, mock_client):
+        """Concurrent upsert_many calls share one bulk upsert."""
+        mock_client.table.return_value.upsert.return_value.execute.return_value = MagicMock(
+            data=[]
+        )
+
+        def objs(name: str) -> list[KnowledgeObjectCreate]:
+            return [
+                KnowledgeObjectCreate(
+                    type=KnowledgeObjectType.INSIGHT,
+                    payload={"pattern_name": name},
+                    natural_key=f"insight:{name}",
+                )
+            ]
+
+        await asyncio.gather(
+            service.upsert_many("user-123", objs("a")),
+            service.upsert_many("user-456", objs("a")),
+        )
+
+        mock_client.table.return_value.upsert.assert_called_once()
+        rows = mock_client.table.return_value.upsert.call_args.args[0]
+        assert [row["user_id"] for row in rows] == ["user-123", "user-456"]
+
     @pytest.mark.asyncio
     async def test_query_with_type_filter(self, service, mock_client):
         """Query filters by type."""
@@ -327,7 +375,9 @@ class TestKnowledgeWritebackService:
     def mock_knowledge_service(self):
         """Create a mock knowledge service."""
         service = MagicMock(spec=KnowledgeObjectService)
-        service.upsert = AsyncMock(return_value=MagicMock())
+        service.upsert_many = AsyncMock(
+            side_effect=lambda user_id, objects: [MagicMock(type=obj.type) for obj in objects]
+        )
         return service
 
     @pytest.fixture
@@ -374,7 +424,7 @@ class TestKnowledgeWritebackService:
 
         assert result.total_written == 0
         assert result.success is True
-        mock_knowledge_service.upsert.assert_not_called()
+        mock_knowledge_service.upsert_many.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_process_capture_with_labels(self, writeback_service, mock_knowledge_service):
@@ -409,7 +459,8 @@ class TestKnowledgeWritebackService:
         # Should write taxonomy label and state snapshot
         assert result.taxonomy_labels_written == 1
         assert result.state_snapshots_written == 1
-        assert mock_knowledge_service.upsert.call_count == 2
+        mock_knowledge_service.upsert_many.assert_called_once()
+        assert len(mock_knowledge_service.upsert_many.call_args.args[1]) == 2
 
     @pytest.mark.asyncio
     async def test_process_capture_without_labels(self, writeback_service, mock_knowledge_service):
@@ -434,7 +485,7 @@ class TestKnowledgeWritebackService:
 
         assert result.taxonomy_labels_written == 0
         assert result.state_snapshots_written == 0
-        mock_knowledge_service.upsert.assert_not_called()
+        mock_knowledge_service.upsert_many.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_process_atomic_tasks(self, writeback_service, mock_knowledge_service):
@@ -465,7 +516,7 @@ class TestKnowledgeWritebackService:
         )
 
         assert result.breakdowns_written == 1
-        mock_knowledge_service.upsert.assert_called_once()
+        mock_knowledge_service.upsert_many.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_process_insights(self, writeback_service, mock_knowledge_service):
@@ -487,7 +538,7 @@ class TestKnowledgeWritebackService:
         )
 
         assert result.insights_written == 1
-        mock_knowledge_service.upsert.assert_called_once()
+        mock_knowledge_service.upsert_many.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_process_coaching_message(self, writeback_service, mock_knowledge_service):
@@ -502,12 +553,12 @@ class TestKnowledgeWritebackService:
         )
 
         assert result.coaching_notes_written == 1
-        mock_knowledge_service.upsert.assert_called_once()
+        mock_knowledge_service.upsert_many.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_process_handles_errors_gracefully(self, writeback_service, mock_knowledge_service):
         """Errors don't stop processing other items."""
-        mock_knowledge_service.upsert = AsyncMock(side_effect=Exception("DB error"))
+        mock_knowledge_service.upsert_many = AsyncMock(side_effect=Exception("DB error"))
 
         capture = Capture(
             id="cap_test",
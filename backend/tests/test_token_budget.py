@@ -0,0 +1,32 @@
+"""Tests for the token budget service."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.token_budget import TokenBudgetService, _usage_cache
+
+
+class TestTodayUsageCache:
+    """Tests for caching of today's usage totals."""
+
+    @pytest.fixture(autouse=True)
+    def clear_usage_cache(self):
+        """Keep cached totals from leaking between tests."""
+        _usage_cache.clear()
+        yield
+        _usage_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_not_cached(self):
+        """A failed lookup reads as zero but is retried on the next check."""
+        service = TokenBudgetService(daily_limit=1000)
+        service._usage_loader.load = AsyncMock(
+            side_effect=[Exception("DB error"), 900]
+        )
+
+        assert await service._get_today_usage("user-123") == 0
+        assert _usage_cache.get("user-123") is None
+
+        assert await service._get_today_usage("user-123") == 900
+        assert service._usage_loader.load.await_count == 2